@@ -13,12 +13,15 @@ class CustomUser(AbstractUser):
         TYPE_CHOICES (list): Choices for the type of user (customer or business).
         username (str): Unique username for the user.
         file (FileField): Optional file upload field for user-related files.
+        file_variants (JSONField): Storage names of the resized WebP/JPEG variants of the file,
+            if it is an image, keyed by format and width, plus the source they were rendered from.
         location (str): Location of the user.
         tel (str): Contact telephone number of the user.
         description (str): A short description about the user.
         working_hours (str): User's working hours.
         email (str): Unique email address for the user.
         created_at (date): Date when the user was created.
+        updated_at (datetime): Timestamp of the last change to the user, used as profile validator.
         type (str): Type of user (e.g., customer or business).
         is_active (bool): Whether the user's account is active.
     """
@@ -29,12 +32,14 @@ class CustomUser(AbstractUser):
     ]
     username = models.CharField(max_length=50, unique=True)
     file = models.FileField(blank=True, null=True)
+    file_variants = models.JSONField(default=dict, blank=True, editable=False)
     location = models.CharField(max_length=50, blank=True, null=True, default="")
     tel = models.CharField(max_length=50, blank=True, null=True, default="")
     description = models.CharField(max_length=500, blank=True, null=True, default="")
     working_hours = models.CharField(max_length=50, blank=True, null=True, default="")
     email = models.EmailField(unique=True)
     created_at = models.DateField(default=now)
+    updated_at = models.DateTimeField(auto_now=True)
     type = models.CharField(
         max_length=20,
         choices=TYPE_CHOICES,
@@ -15,12 +15,18 @@ from django.contrib.auth.tokens import default_token_generator as token_generato
 
 from rest_framework.authtoken.models import Token
 
+from coderr_app.images import register_variant_field
+from coderr_app.storage import track_file_references
+
 
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 User = get_user_model() 
 
+register_variant_field(User, 'file')
+track_file_references(User, 'file')
+
 @receiver(post_save, sender=User)
 def create_auth_token(sender, instance=None, created=False, **kwargs):
     """
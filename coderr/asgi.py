@@ -9,8 +9,13 @@ https://docs.djangoproject.com/en/5.1/howto/deployment/asgi/
 
 import os
 
-from django.core.asgi import get_asgi_application
+import django
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'coderr.settings')
+django.setup(set_prefix=False)
 
-application = get_asgi_application()
+from coderr_app.asgi import DisconnectAwareASGIHandler  # noqa: E402
+
+# Django 4.2 does not notice disconnected clients of streaming responses, such as the
+# order event stream; this handler cancels their requests.
+application = DisconnectAwareASGIHandler()
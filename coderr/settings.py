@@ -61,6 +61,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'rest_framework',
     'rest_framework.authtoken',
     'debug_toolbar',
@@ -123,6 +124,27 @@ DATABASES = {
 }
 
 
+# Caches
+# The response cache is bounded by RESPONSE_CACHE_MAX_ENTRIES; entries are invalidated
+# through versions stored in the database (coderr_app.models.CacheVersion).
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'responses': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'responses',
+        'TIMEOUT': int(os.getenv('RESPONSE_CACHE_TIMEOUT', 300)),
+        'OPTIONS': {
+            'MAX_ENTRIES': int(os.getenv('RESPONSE_CACHE_MAX_ENTRIES', 1000)),
+        },
+    },
+}
+
+RESPONSE_CACHE_ALIAS = 'responses'
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -166,6 +188,34 @@ STATIC_ROOT = BASE_DIR / 'static'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Uploads are stored content-addressed (deduplicated, immutable URLs below MEDIA_URL/cas/).
+# With MEDIA_ACCEL_REDIRECT set (e.g. '/protected-media/'), blob responses only carry an
+# X-Accel-Redirect header and nginx sends the file from an internal location mapped to MEDIA_ROOT.
+STORAGES = {
+    'default': {
+        'BACKEND': 'coderr_app.storage.ContentAddressedStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage',
+    },
+}
+MEDIA_ACCEL_REDIRECT = os.getenv('MEDIA_ACCEL_REDIRECT', '')
+
+# Resized image variants are rendered in a process pool after upload.
+IMAGE_VARIANT_WORKERS = int(os.getenv('IMAGE_VARIANT_WORKERS', 2))
+IMAGE_VARIANTS_EAGER = False
+
+# Completed and cancelled orders not updated for this many days are moved to the archive
+# table by the archive_orders command.
+ORDER_ARCHIVE_AFTER_DAYS = int(os.getenv('ORDER_ARCHIVE_AFTER_DAYS', 365))
+
+# Order events are pushed to SSE clients through this broker. The default only reaches
+# clients of the same process; use 'orders_app.broker.PostgresBroker' with several workers.
+ORDER_EVENT_BROKER = os.getenv('ORDER_EVENT_BROKER', 'orders_app.broker.LocalBroker')
+
+# Responses to requests with an Idempotency-Key header are replayed for this many seconds.
+IDEMPOTENCY_KEY_TTL = int(os.getenv('IDEMPOTENCY_KEY_TTL', 86400))
+
 
 
 REST_FRAMEWORK = {
@@ -18,11 +18,13 @@ from django.contrib import admin
 from django.urls import path, include
 from coderr import settings
 from django.conf.urls.static import static
+from coderr_app.views import MediaBlobView
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/', include('coderr_app.urls')),
     path('auth/', include('auth_app.urls')),
+    path(f"{settings.MEDIA_URL.strip('/')}/cas/<path:name>", MediaBlobView.as_view(), name='media-blob'),
 ]
 
 if settings.DEBUG:
@@ -1,4 +1,5 @@
 from django.contrib import admin
+from django.db import transaction
 from auth_app.models import CustomUser, PasswordReset
 from offers_app.models import Offer, OfferDetail
 from orders_app.models import Order
@@ -67,8 +68,10 @@ class OfferAdmin(admin.ModelAdmin):
     Admin panel configuration for the Offer model.
 
     Displays offers created by users with fields such as title and timestamps.
+    The price and delivery summary is maintained from the OfferDetails and therefore read-only.
     """
-    list_display = ('user', 'title', 'created_at', 'updated_at')
+    list_display = ('user', 'title', 'min_price', 'max_price', 'min_delivery_time', 'created_at', 'updated_at')
+    readonly_fields = Offer.SUMMARY_FIELDS
 
 
 @admin.register(OfferDetail)
@@ -77,10 +80,28 @@ class OfferDetailAdmin(admin.ModelAdmin):
     Admin panel configuration for the OfferDetail model.
 
     Provides detailed information about offers, such as price,
-    delivery time, and number of revisions.
+    delivery time, and number of revisions. Every write refreshes the price and
+    delivery summary of the affected offers.
     """
     list_display = ('title', 'offer_type', 'offer', 'price', 'delivery_time_in_days', 'revisions')
 
+    def save_model(self, request, obj, form, change):
+        with transaction.atomic():
+            previous_offer_id = OfferDetail.objects.filter(pk=obj.pk).values_list('offer_id', flat=True).first()
+            super().save_model(request, obj, form, change)
+            Offer.objects.filter(pk__in={obj.offer_id, previous_offer_id}).refresh_summaries()
+
+    def delete_model(self, request, obj):
+        with transaction.atomic():
+            super().delete_model(request, obj)
+            Offer.objects.filter(pk=obj.offer_id).refresh_summaries()
+
+    def delete_queryset(self, request, queryset):
+        with transaction.atomic():
+            offer_ids = set(queryset.values_list('offer_id', flat=True))
+            super().delete_queryset(request, queryset)
+            Offer.objects.filter(pk__in=offer_ids).refresh_summaries()
+
 
 @admin.register(Order)
 class OrderDetailAdmin(admin.ModelAdmin):
@@ -0,0 +1,51 @@
+import asyncio
+from django.core.handlers.asgi import ASGIHandler
+
+DISCONNECT_AWARE_SCOPE_KEY = 'coderr.disconnect_aware'
+
+
+class DisconnectAwareASGIHandler(ASGIHandler):
+    """
+    ASGI handler that stops serving a request as soon as its client disconnects.
+
+    Django 4.2 only reads `receive` while reading the request body, so the response to a
+    client that went away keeps running: a streaming response such as the order event
+    stream would produce heartbeats for a closed socket forever. This handler passes the
+    messages of `receive` on to Django through a queue and cancels the request when
+    `http.disconnect` arrives, which closes streaming responses and runs their cleanup.
+    Requests served by this handler carry `DISCONNECT_AWARE_SCOPE_KEY` in their scope.
+    """
+
+    async def handle(self, scope, receive, send):
+        """
+        Handles the request while listening for the disconnect of its client.
+        """
+        scope = {**scope, DISCONNECT_AWARE_SCOPE_KEY: True}
+        messages = asyncio.Queue()
+        disconnected = asyncio.Event()
+        request = asyncio.ensure_future(super().handle(scope, messages.get, send))
+        listener = asyncio.ensure_future(self._listen(receive, messages, request, disconnected))
+        try:
+            await request
+        except asyncio.CancelledError:
+            if not disconnected.is_set():
+                raise
+        finally:
+            listener.cancel()
+
+    @staticmethod
+    async def _listen(receive, messages, request, disconnected):
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                disconnected.set()
+                request.cancel()
+                return
+            messages.put_nowait(message)
+
+
+def is_disconnect_aware(request):
+    """
+    Returns whether a request is served by DisconnectAwareASGIHandler.
+    """
+    return getattr(request, 'scope', {}).get(DISCONNECT_AWARE_SCOPE_KEY, False)
@@ -0,0 +1,167 @@
+import hashlib
+import secrets
+from urllib.parse import urlencode
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from .models import CacheVersion
+
+
+def new_version():
+    """
+    Returns a random version number for a cache group.
+    """
+    return secrets.randbits(62)
+
+
+def get_cache_version(key):
+    """
+    Returns the current version of a cache group.
+
+    Reading never writes: a group that was never bumped has version 0 until its first bump
+    creates the row with a random version.
+
+    Args:
+        key (str): The name of the cache group.
+
+    Returns:
+        int: The current version.
+    """
+    return CacheVersion.objects.filter(key=key).values_list('version', flat=True).first() or 0
+
+
+def get_cache_versions(keys):
+    """
+    Returns the current versions of several cache groups with one query.
+
+    Args:
+        keys (iterable): The names of the cache groups.
+
+    Returns:
+        dict: Maps each group name to its current version, 0 for groups never bumped.
+    """
+    keys = list(dict.fromkeys(keys))
+    versions = dict(CacheVersion.objects.filter(key__in=keys).values_list('key', 'version'))
+    return {key: versions.get(key, 0) for key in keys}
+
+
+def bump_cache_version(*keys):
+    """
+    Replaces the version of the given cache groups, invalidating all their cached entries.
+
+    The version rows are written once the caller's transaction commits, in their own
+    short transaction, so concurrent writes do not hold the lock of a shared version row
+    until they commit. Entries cached from the old data in the meantime are stored under
+    the old version and are never read again.
+
+    Args:
+        *keys (str): The names of the cache groups.
+    """
+    keys = sorted(set(keys))
+    if keys:
+        transaction.on_commit(lambda: _write_cache_versions(keys))
+
+
+def _write_cache_versions(keys):
+    with transaction.atomic():
+        for key in keys:
+            if not CacheVersion.objects.filter(key=key).update(version=new_version()):
+                CacheVersion.objects.get_or_create(key=key, defaults={'version': new_version()})
+
+
+def canonical_query(params, defaults=None, keep_empty=()):
+    """
+    Builds a canonical query string: parameters sorted by name, defaults filled in
+    and empty values dropped, so equivalent requests share one cache key.
+
+    Args:
+        params (QueryDict): The request query parameters.
+        defaults (dict, optional): Values assumed by the view for missing parameters.
+        keep_empty (iterable, optional): Parameters whose empty value is meaningful.
+
+    Returns:
+        str: The canonical query string.
+    """
+    items = dict(defaults or {})
+    for name in params:
+        value = params.get(name)
+        if value or name in keep_empty:
+            items[name] = value
+    return urlencode(sorted(items.items()))
+
+
+class VersionedResponseCache:
+    """
+    Response cache for a group of read endpoints invalidated through a CacheVersion.
+
+    Entries live in the `RESPONSE_CACHE_ALIAS` cache, whose size is bounded by its
+    MAX_ENTRIES option. Hits and misses are counted per group in the default cache,
+    so culling of responses never resets them.
+
+    Attributes:
+        group (str): The name of the cache group and its CacheVersion key.
+    """
+
+    def __init__(self, group):
+        self.group = group
+        self.cache = caches[settings.RESPONSE_CACHE_ALIAS]
+        self.stats_cache = caches['default']
+
+    def make_key(self, *parts):
+        """
+        Returns the cache key for the given parts under the current group version.
+        """
+        digest = hashlib.sha1(':'.join(str(part) for part in parts).encode('utf-8')).hexdigest()
+        return f'{self.group}:{get_cache_version(self.group)}:{digest}'
+
+    def get(self, key):
+        """
+        Returns the cached value or None, counting the lookup as hit or miss.
+        """
+        value = self.cache.get(key)
+        self._count('hits' if value is not None else 'misses')
+        return value
+
+    def get_many(self, keys):
+        """
+        Returns the cached values found for the given keys, counting each lookup as hit or miss.
+
+        Returns:
+            dict: Maps the keys that were found to their values.
+        """
+        values = self.cache.get_many(keys)
+        for key in keys:
+            self._count('hits' if values.get(key) is not None else 'misses')
+        return values
+
+    def set(self, key, value):
+        """
+        Stores a value using the timeout configured for the cache alias.
+        """
+        self.cache.set(key, value)
+
+    def set_many(self, values):
+        """
+        Stores several values using the timeout configured for the cache alias.
+        """
+        self.cache.set_many(values)
+
+    def stats(self):
+        """
+        Returns the hit and miss counters of the group.
+
+        Returns:
+            dict: The number of hits, misses and the hit ratio.
+        """
+        hits = self.stats_cache.get(f'{self.group}:stats:hits', 0)
+        misses = self.stats_cache.get(f'{self.group}:stats:misses', 0)
+        total = hits + misses
+        return {'hits': hits, 'misses': misses, 'hit_ratio': round(hits / total, 3) if total else 0.0}
+
+    def _count(self, counter):
+        key = f'{self.group}:stats:{counter}'
+        if not self.stats_cache.add(key, 1, timeout=None):
+            try:
+                self.stats_cache.incr(key)
+            except ValueError:
+                self.stats_cache.set(key, 1, timeout=None)
@@ -0,0 +1,42 @@
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+
+def _timestamp(last_modified):
+    return int(last_modified.timestamp()) if last_modified is not None else None
+
+
+def not_modified_response(request, etag, last_modified=None):
+    """
+    Evaluates If-None-Match / If-Modified-Since against cheap validators computed
+    before the full query runs.
+
+    Args:
+        request (Request): The current request.
+        etag (str): The unquoted entity tag of the current representation.
+        last_modified (datetime, optional): The time of the last change.
+
+    Returns:
+        HttpResponse or None: A 304 (or 412) response if the client's copy is still
+        valid, otherwise None.
+    """
+    return get_conditional_response(request, etag=quote_etag(etag), last_modified=_timestamp(last_modified))
+
+
+def add_validators(response, etag, last_modified=None):
+    """
+    Sets the ETag and Last-Modified headers on a successful response.
+
+    Args:
+        response (Response): The response to annotate.
+        etag (str): The unquoted entity tag.
+        last_modified (datetime, optional): The time of the last change.
+
+    Returns:
+        Response: The same response.
+    """
+    if response.status_code == 200:
+        response['ETag'] = quote_etag(etag)
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(_timestamp(last_modified))
+    return response
@@ -0,0 +1,261 @@
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from io import BytesIO
+from pathlib import PurePosixPath
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import close_old_connections, connection, transaction
+from django.db.models import Q
+from django.db.models.signals import post_delete, post_save
+from django.utils import timezone
+from PIL import Image, ImageOps
+from .storage import release
+
+logger = logging.getLogger(__name__)
+
+VARIANT_WIDTHS = (160, 480, 960)
+VARIANT_FORMATS = {'webp': 'WEBP', 'jpeg': 'JPEG'}
+VARIANT_QUALITY = 80
+
+_registry = {}
+_process_pool = None
+_dispatcher = None
+
+
+def render_variants(data, widths=VARIANT_WIDTHS):
+    """
+    Renders the resized variants of an image.
+
+    Runs in a worker process. The image is rotated according to its EXIF orientation and
+    re-encoded without any metadata. Images are never upscaled: widths larger than the
+    original are skipped, and an image narrower than every width gets one variant at its
+    own width.
+
+    Args:
+        data (bytes): The encoded source image.
+        widths (tuple, optional): The target widths in pixels.
+
+    Returns:
+        dict: Maps each format name to a dict of width to encoded bytes.
+
+    Raises:
+        PIL.UnidentifiedImageError, OSError: If the data is not a readable image.
+    """
+    with Image.open(BytesIO(data)) as source:
+        image = ImageOps.exif_transpose(source).convert('RGB')
+
+    targets = [width for width in widths if width <= image.width] or [image.width]
+    variants = {name: {} for name in VARIANT_FORMATS}
+    for width in targets:
+        height = max(1, round(image.height * width / image.width))
+        resized = image.resize((width, height), Image.LANCZOS)
+        for name, pil_format in VARIANT_FORMATS.items():
+            buffer = BytesIO()
+            resized.save(buffer, pil_format, quality=VARIANT_QUALITY, optimize=True)
+            variants[name][width] = buffer.getvalue()
+    return variants
+
+
+def register_variant_field(model, field_name, on_change=None):
+    """
+    Enables the variant pipeline for a file field of a model.
+
+    The model must have a JSONField named `<field_name>_variants`. Whenever an instance
+    is saved with a source file that has no variants yet, the variants are rendered in
+    the background after the transaction commits.
+
+    Args:
+        model (type): The model class.
+        field_name (str): The name of the image or file field.
+        on_change (callable, optional): Called after new variants were recorded,
+            e.g. to invalidate cached responses.
+    """
+    _registry[model._meta.label] = (model, field_name, on_change)
+
+    def schedule(sender, instance, **kwargs):
+        if needs_variants(instance, field_name):
+            schedule_variants(instance, field_name)
+
+    def release_variants(sender, instance, **kwargs):
+        for name, widths in (getattr(instance, f'{field_name}_variants') or {}).items():
+            if name != 'source':
+                for path in widths.values():
+                    release(path)
+
+    post_save.connect(schedule, sender=model, weak=False, dispatch_uid=f'image_variants_{model._meta.label}')
+    post_delete.connect(release_variants, sender=model, weak=False, dispatch_uid=f'release_variants_{model._meta.label}')
+
+
+def registered_fields():
+    """
+    Returns (model, field_name) for every field registered for variants.
+    """
+    return [(model, field_name) for model, field_name, _ in _registry.values()]
+
+
+def needs_variants(instance, field_name):
+    """
+    Returns whether the variants stored on an instance are missing or belong to another file.
+    """
+    source = getattr(instance, field_name)
+    variants = getattr(instance, f'{field_name}_variants') or {}
+    return (source.name or None) != variants.get('source')
+
+
+def schedule_variants(instance, field_name):
+    """
+    Queues the variant rendering of an instance once the current transaction commits.
+
+    The request never waits for it: rendering runs in a process pool, coordinated by a
+    background thread. With `IMAGE_VARIANTS_EAGER` the job runs inline, which tests use.
+    """
+    label, pk = instance._meta.label, instance.pk
+
+    def submit():
+        if getattr(settings, 'IMAGE_VARIANTS_EAGER', False):
+            process_variants(label, pk, field_name, render=render_variants)
+        else:
+            _get_dispatcher().submit(_run_job, label, pk, field_name)
+
+    transaction.on_commit(submit)
+
+
+def process_variants(label, pk, field_name, render=None):
+    """
+    Renders and records the variants of one instance.
+
+    The result is only written if the instance still has the same source file, so a job
+    that raced with a newer upload is discarded. Variants of the previous source are
+    deleted once the new ones are recorded.
+
+    Args:
+        label (str): The model label, e.g. 'offers_app.Offer'.
+        pk (int): The primary key of the instance.
+        field_name (str): The name of the registered field.
+        render (callable, optional): Renders bytes into variants. Defaults to the process pool.
+    """
+    model = _registry[label][0]
+    instance = model.objects.filter(pk=pk).only('pk', field_name, f'{field_name}_variants').first()
+    if instance is None or not needs_variants(instance, field_name):
+        return
+
+    data = read_source(instance, field_name)
+    rendered = {}
+    if data is not None:
+        try:
+            rendered = (render or _render_in_pool)(data)
+        except Exception:
+            logger.warning('Keine Bildvarianten für %s %s erzeugt.', label, pk, exc_info=True)
+
+    record_variants(instance, field_name, rendered)
+
+
+def read_source(instance, field_name):
+    """
+    Returns the content of the source file of an instance, or None if there is none or it
+    cannot be read.
+    """
+    source = getattr(instance, field_name)
+    if not source.name:
+        return None
+    try:
+        with source.storage.open(source.name, 'rb') as handle:
+            return handle.read()
+    except Exception:
+        logger.warning('Quelldatei %s nicht lesbar.', source.name, exc_info=True)
+        return None
+
+
+def record_variants(instance, field_name, rendered):
+    """
+    Stores rendered variants and records their names on the instance.
+
+    Args:
+        instance (Model): The instance the variants belong to.
+        field_name (str): The name of the registered field.
+        rendered (dict): The output of `render_variants`, empty if rendering failed.
+    """
+    model, _, on_change = _registry[instance._meta.label]
+    source = getattr(instance, field_name)
+    previous = getattr(instance, f'{field_name}_variants') or {}
+
+    variants = {'source': source.name or None}
+    stem = PurePosixPath(source.name or '').with_suffix('')
+    for name, widths in rendered.items():
+        variants[name] = {
+            str(width): default_storage.save(f'variants/{stem}-{width}.{name}', ContentFile(data))
+            for width, data in widths.items()
+        }
+
+    changes = {f'{field_name}_variants': variants}
+    if any(field.name == 'updated_at' for field in model._meta.fields):
+        changes['updated_at'] = timezone.now()
+    unchanged = Q(**{field_name: source.name}) if source.name else Q(**{field_name: ''}) | Q(**{f'{field_name}__isnull': True})
+    if not model.objects.filter(unchanged, pk=instance.pk).update(**changes):
+        _delete_variants(variants)
+        return
+
+    _delete_variants(previous)
+    if on_change:
+        on_change()
+
+
+def variant_urls(variants):
+    """
+    Returns the URLs of recorded variants, grouped by format and width.
+
+    Args:
+        variants (dict): The value of a `<field>_variants` column.
+
+    Returns:
+        dict: e.g. {'webp': {'160': '/media/variants/...-160.webp'}, 'jpeg': {...}}.
+    """
+    return {
+        name: {width: default_storage.url(path) for width, path in widths.items()}
+        for name, widths in (variants or {}).items() if name != 'source'
+    }
+
+
+def get_process_pool():
+    """
+    Returns the process pool that renders variants, creating it on first use.
+    """
+    global _process_pool
+    if _process_pool is None:
+        _process_pool = ProcessPoolExecutor(max_workers=_worker_count())
+    return _process_pool
+
+
+def _worker_count():
+    return getattr(settings, 'IMAGE_VARIANT_WORKERS', None) or os.cpu_count()
+
+
+def _render_in_pool(data):
+    return get_process_pool().submit(render_variants, data).result()
+
+
+def _get_dispatcher():
+    global _dispatcher
+    if _dispatcher is None:
+        _dispatcher = ThreadPoolExecutor(max_workers=_worker_count(), thread_name_prefix='image-variants')
+    return _dispatcher
+
+
+def _run_job(label, pk, field_name):
+    close_old_connections()
+    try:
+        process_variants(label, pk, field_name)
+    except Exception:
+        logger.exception('Bildvarianten für %s %s fehlgeschlagen.', label, pk)
+    finally:
+        connection.close()
+
+
+def _delete_variants(variants):
+    for name, widths in variants.items():
+        if name == 'source':
+            continue
+        for path in widths.values():
+            default_storage.delete(path)
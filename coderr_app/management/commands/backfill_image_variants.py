@@ -0,0 +1,53 @@
+from django.core.management.base import BaseCommand
+from coderr_app.images import (
+    get_process_pool, needs_variants, read_source, record_variants, registered_fields, render_variants,
+)
+
+
+class Command(BaseCommand):
+    """
+    Management command to render the resized variants of existing offer images and profile files.
+
+    Sources are rendered in the process pool one batch at a time, so at most one batch of
+    source files is held in memory.
+    """
+    help = 'Renders missing image variants of offers and user profiles.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=50, help='Number of images rendered concurrently.')
+        parser.add_argument('--force', action='store_true', help='Re-render variants that already exist.')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        pool = get_process_pool()
+        rendered_count = failed = 0
+
+        for model, field_name in registered_fields():
+            queryset = (
+                model.objects.exclude(**{f'{field_name}__isnull': True}).exclude(**{field_name: ''})
+                .only('pk', field_name, f'{field_name}_variants').order_by('pk')
+            )
+            pending = [
+                instance for instance in queryset.iterator()
+                if options['force'] or needs_variants(instance, field_name)
+            ]
+
+            for start in range(0, len(pending), batch_size):
+                batch = pending[start:start + batch_size]
+                jobs = []
+                for instance in batch:
+                    data = read_source(instance, field_name)
+                    jobs.append((instance, pool.submit(render_variants, data) if data is not None else None))
+
+                for instance, future in jobs:
+                    try:
+                        rendered = future.result() if future else {}
+                    except Exception:
+                        rendered = {}
+                    if rendered:
+                        rendered_count += 1
+                    else:
+                        failed += 1
+                    record_variants(instance, field_name, rendered)
+
+        self.stdout.write(self.style.SUCCESS(f'{rendered_count} Bilder verarbeitet, {failed} ohne Varianten.'))
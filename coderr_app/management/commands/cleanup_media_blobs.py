@@ -0,0 +1,74 @@
+from datetime import timedelta
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from coderr_app.models import MediaBlob
+from coderr_app.storage import BLOB_PREFIX, blob_hash
+
+
+class Command(BaseCommand):
+    """
+    Management command to delete content-addressed media files that are no longer referenced.
+
+    Only blobs whose reference count has been zero for at least `--min-age-hours` are removed.
+    Each batch locks its rows, so an upload of the same content either waits for the batch
+    and stores the file again or adds its reference before the blob is picked up.
+
+    Files under `cas/` without a MediaBlob row, left by uploads whose transaction rolled
+    back, are first registered as unreferenced blobs and removed the same way.
+    """
+    help = 'Deletes unreferenced content-addressed media files.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--min-age-hours', type=int, default=24, help='Minimum time a blob must have been unreferenced.')
+        parser.add_argument('--batch-size', type=int, default=500, help='Number of blobs deleted per transaction.')
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(hours=options['min_age_hours'])
+        self.adopt_orphan_files(cutoff)
+        removed = 0
+        while True:
+            with transaction.atomic():
+                blobs = list(
+                    MediaBlob.objects.select_for_update(skip_locked=True)
+                    .filter(refcount=0, updated_at__lte=cutoff)
+                    .order_by('updated_at')[:options['batch_size']]
+                )
+                if not blobs:
+                    break
+                for blob in blobs:
+                    default_storage.purge(blob.name)
+                MediaBlob.objects.filter(pk__in=[blob.pk for blob in blobs]).delete()
+                removed += len(blobs)
+        self.stdout.write(self.style.SUCCESS(f'{removed} Mediendateien gelöscht.'))
+
+    def adopt_orphan_files(self, cutoff):
+        """
+        Creates unreferenced MediaBlob rows for blob files older than the cutoff that have none.
+
+        The row takes the modification time of the file as its last reference change. An
+        upload of the same content committing in the meantime adds its reference to that
+        row, so the file is kept.
+        """
+        if not default_storage.exists(BLOB_PREFIX):
+            return
+        for directory in default_storage.listdir(BLOB_PREFIX)[0]:
+            files = {}
+            for file_name in default_storage.listdir(f'{BLOB_PREFIX}/{directory}')[1]:
+                name = f'{BLOB_PREFIX}/{directory}/{file_name}'
+                digest = blob_hash(name)
+                if digest is not None:
+                    files[digest] = name
+            known = set(MediaBlob.objects.filter(pk__in=files).values_list('pk', flat=True))
+            for digest, name in files.items():
+                if digest in known:
+                    continue
+                modified_at = default_storage.get_modified_time(name)
+                if modified_at > cutoff:
+                    continue
+                _, created = MediaBlob.objects.get_or_create(
+                    hash=digest, defaults={'name': name, 'size': default_storage.size(name)}
+                )
+                if created:
+                    MediaBlob.objects.filter(pk=digest, refcount=0).update(updated_at=modified_at)
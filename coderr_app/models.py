@@ -1,3 +1,69 @@
 from django.db import models
 
-# Create your models here.
+
+class CacheVersion(models.Model):
+    """
+    Stores the current version of a group of cached responses.
+
+    Cache keys embed the version of their group, so replacing the version invalidates
+    every cached entry of that group at once. Versions are random numbers rather than
+    counters, so a rolled-back transaction can never make an outdated version current again.
+
+    Attributes:
+        key (str): The name of the cache group (e.g. "offers").
+        version (int): The current version of the group.
+    """
+    key = models.CharField(max_length=100, primary_key=True)
+    version = models.BigIntegerField()
+
+    def __str__(self):
+        """
+        Returns the string representation of the cache version.
+
+        Returns:
+            str: The group name and its version.
+        """
+        return f'{self.key}: {self.version}'
+
+
+class MediaBlob(models.Model):
+    """
+    Tracks a file of the content-addressed media storage.
+
+    Identical uploads are stored once under the hash of their content. The reference count
+    is the number of stored names pointing at the blob; blobs whose count dropped to zero
+    are removed by the `cleanup_media_blobs` command.
+
+    Attributes:
+        hash (str): The SHA-256 hex digest of the content.
+        name (str): The storage name of the file.
+        size (int): The size of the file in bytes.
+        refcount (int): The number of references to the file.
+        created_at (datetime): The timestamp when the blob was first stored.
+        updated_at (datetime): The timestamp of the last reference change.
+    """
+    hash = models.CharField(max_length=64, primary_key=True)
+    name = models.CharField(max_length=255, unique=True)
+    size = models.BigIntegerField()
+    refcount = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        """
+        Metadata for the MediaBlob model.
+
+        The partial index keeps the lookup of unreferenced blobs cheap.
+        """
+        indexes = [
+            models.Index(fields=['updated_at'], name='mediablob_unreferenced_idx', condition=models.Q(refcount=0)),
+        ]
+
+    def __str__(self):
+        """
+        Returns the string representation of the blob.
+
+        Returns:
+            str: The storage name and its reference count.
+        """
+        return f'{self.name} ({self.refcount})'
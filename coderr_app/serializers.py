@@ -0,0 +1,76 @@
+class SparseFieldsetMixin:
+    """
+    Mixin for model serializers that supports sparse fieldsets.
+
+    A serializer created with `fields` keeps only those fields. `model_columns` returns the
+    model columns the kept fields read, so the view can narrow its query with `only()`.
+    Fields that do not read a column of the same name (method fields, nested serializers)
+    declare the columns they need in `sparse_sources`.
+
+    Attributes:
+        sparse_sources (dict): Maps field names to the model columns they read.
+    """
+    sparse_sources = {}
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+    @classmethod
+    def field_names(cls):
+        """
+        Returns the names of all fields the serializer can render.
+        """
+        return list(cls().fields)
+
+    @classmethod
+    def model_columns(cls, fields):
+        """
+        Returns the model columns needed to render the given fields.
+
+        Args:
+            fields (iterable): The selected field names.
+
+        Returns:
+            list: Column names for `QuerySet.only()`, always including the primary key.
+        """
+        declared = cls().fields
+        columns = ['pk']
+        for name in fields:
+            if name in cls.sparse_sources:
+                columns.extend(cls.sparse_sources[name])
+            else:
+                columns.append(declared[name].source)
+        return list(dict.fromkeys(columns))
+
+
+def parse_fieldset(params, serializer_class):
+    """
+    Reads the `fields` and `exclude` query parameters for a sparse fieldset serializer.
+
+    Both take comma-separated field names; `exclude` is applied after `fields`.
+
+    Args:
+        params (QueryDict): The request query parameters.
+        serializer_class (type): A serializer using SparseFieldsetMixin.
+
+    Returns:
+        tuple: (fields, error). fields is None if no fieldset was requested, error is a
+            message string if unknown fields were named, else None.
+    """
+    requested = params.get('fields')
+    excluded = params.get('exclude')
+    if not requested and not excluded:
+        return None, None
+
+    available = serializer_class.field_names()
+    fields = [name for name in requested.split(',') if name] if requested else list(available)
+    excluded = [name for name in excluded.split(',') if name] if excluded else []
+
+    unknown = sorted(set(fields + excluded) - set(available))
+    if unknown:
+        return None, f"Unbekannte Felder: {', '.join(unknown)}"
+
+    return [name for name in fields if name not in excluded], None
@@ -0,0 +1,138 @@
+import hashlib
+import os
+import re
+from django.core.files.storage import FileSystemStorage, default_storage
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import post_delete, post_init, post_save
+from django.utils import timezone
+from .models import MediaBlob
+
+BLOB_PREFIX = 'cas'
+BLOB_EXTENSION = re.compile(r'^\.[a-z0-9]{1,10}$')
+BLOB_NAME = re.compile(rf'^{BLOB_PREFIX}/[0-9a-f]{{2}}/(?P<hash>[0-9a-f]{{64}})(\.[a-z0-9]{{1,10}})?$')
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    File system storage that stores uploads under the SHA-256 hash of their content.
+
+    Whatever name an upload is saved under, it is stored as `cas/<2 hex>/<hash><ext>`, so
+    identical uploads share one file and a name never changes its content, which makes
+    the URLs safe to cache forever. Every save adds a reference to the blob's MediaBlob
+    row and every delete removes one; files are only removed from disk by the
+    `cleanup_media_blobs` command once nothing references them. Names outside `cas/`
+    (files stored before this backend) behave as in FileSystemStorage.
+    """
+
+    def _save(self, name, content):
+        digest, size = self._hash(content)
+        extension = os.path.splitext(name)[1].lower()
+        if not BLOB_EXTENSION.match(extension):
+            extension = ''
+        blob_name = f'{BLOB_PREFIX}/{digest[:2]}/{digest}{extension}'
+
+        with transaction.atomic():
+            self._add_reference(digest, blob_name, size)
+            if not self.exists(blob_name):
+                content.seek(0)
+                stored_name = super()._save(blob_name, content)
+                if stored_name != blob_name:
+                    super().delete(stored_name)
+        return blob_name
+
+    def get_available_name(self, name, max_length=None):
+        """
+        Returns the name unchanged: the stored name is derived from the content in `_save`.
+        """
+        return name
+
+    def delete(self, name):
+        """
+        Removes one reference to a blob. The file itself is left for `cleanup_media_blobs`.
+        """
+        digest = blob_hash(name)
+        if digest is None:
+            return super().delete(name)
+        MediaBlob.objects.filter(pk=digest, refcount__gt=0).update(
+            refcount=F('refcount') - 1, updated_at=timezone.now()
+        )
+
+    def purge(self, name):
+        """
+        Removes a blob file from disk regardless of its references.
+        """
+        super().delete(name)
+
+    @staticmethod
+    def _hash(content):
+        sha256 = hashlib.sha256()
+        size = 0
+        content.seek(0)
+        for chunk in content.chunks():
+            sha256.update(chunk)
+            size += len(chunk)
+        return sha256.hexdigest(), size
+
+    @staticmethod
+    def _add_reference(digest, blob_name, size):
+        # The UPDATE locks the row, so a concurrent cleanup either finished deleting it
+        # (and we recreate it) or sees the new reference.
+        while not MediaBlob.objects.filter(pk=digest).update(refcount=F('refcount') + 1, updated_at=timezone.now()):
+            MediaBlob.objects.get_or_create(hash=digest, defaults={'name': blob_name, 'size': size})
+
+
+def blob_hash(name):
+    """
+    Returns the content hash of a content-addressed storage name, or None for other names.
+    """
+    match = BLOB_NAME.match(name or '')
+    return match.group('hash') if match else None
+
+
+def track_file_references(model, field_name):
+    """
+    Releases the blob reference of a file field when its file is replaced or its row is deleted.
+
+    The release happens after the transaction commits, so a rolled-back change keeps its
+    reference. Only content-addressed names are released; older files are left alone.
+
+    Args:
+        model (type): The model class.
+        field_name (str): The name of the file field.
+    """
+    attribute = f'_stored_{field_name}'
+    uid = f'{model._meta.label}.{field_name}'
+
+    def stored_name(instance):
+        value = instance.__dict__.get(field_name)
+        return getattr(value, 'name', value)
+
+    def remember(sender, instance, **kwargs):
+        instance.__dict__[attribute] = stored_name(instance)
+
+    def release_replaced(sender, instance, update_fields=None, **kwargs):
+        if update_fields is not None and field_name not in update_fields:
+            return
+        previous = instance.__dict__.get(attribute)
+        current = stored_name(instance)
+        instance.__dict__[attribute] = current
+        if previous and previous != current:
+            release(previous)
+
+    def release_deleted(sender, instance, **kwargs):
+        name = stored_name(instance)
+        if name:
+            release(name)
+
+    post_init.connect(remember, sender=model, weak=False, dispatch_uid=f'remember_{uid}')
+    post_save.connect(release_replaced, sender=model, weak=False, dispatch_uid=f'release_replaced_{uid}')
+    post_delete.connect(release_deleted, sender=model, weak=False, dispatch_uid=f'release_deleted_{uid}')
+
+
+def release(name):
+    """
+    Removes one reference to a content-addressed file once the current transaction commits.
+    """
+    if blob_hash(name) is not None:
+        transaction.on_commit(lambda: default_storage.delete(name))
@@ -0,0 +1,104 @@
+import json
+from asgiref.sync import sync_to_async
+from django.http import StreamingHttpResponse
+from rest_framework.utils.encoders import JSONEncoder
+
+STREAM_FORMATS = {
+    'json': 'application/json',
+    'ndjson': 'application/x-ndjson',
+}
+
+DEFAULT_CHUNK_SIZE = 500
+
+
+class ChunkedStreamingHttpResponse(StreamingHttpResponse):
+    """
+    StreamingHttpResponse over a synchronous iterator that also streams under ASGI.
+
+    Django 4.2 reads a synchronous iterator completely into memory before serving it
+    asynchronously. This response instead takes one part at a time from the iterator in the
+    thread of the sync views, where the database connection of the iterator lives. Under
+    WSGI it is served like a plain StreamingHttpResponse.
+    """
+
+    async def __aiter__(self):
+        parts = iter(self.streaming_content)
+        end = object()
+        while True:
+            part = await sync_to_async(next)(parts, end)
+            if part is end:
+                return
+            yield part
+
+
+def get_stream_format(params):
+    """
+    Reads the `stream` query parameter that opts a list view into a streamed response.
+
+    Args:
+        params (QueryDict): The request query parameters.
+
+    Returns:
+        tuple: (stream_format, error). stream_format is None if no stream was requested,
+            error is a message string if the format is unknown, else None.
+    """
+    stream_format = params.get('stream')
+    if not stream_format:
+        return None, None
+    if stream_format not in STREAM_FORMATS:
+        return None, f"Ungültiges Stream-Format. Gültige Werte sind: {', '.join(STREAM_FORMATS)}"
+    return stream_format, None
+
+
+def streaming_response(queryset, serialize, stream_format, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Streams a queryset as a JSON array or as NDJSON.
+
+    Rows are read through `iterator(chunk_size=...)`, which uses a server-side cursor where
+    the database supports it, and serialized and encoded one chunk at a time. Memory use is
+    bounded by the chunk size instead of the size of the result, and the output has the same
+    rows as the non-streamed list. The response is streamed under WSGI and ASGI alike.
+
+    Args:
+        queryset (QuerySet): The ordered rows to stream.
+        serialize (callable): Turns a list of model instances into a list of dicts,
+            e.g. `lambda rows: OrderSerializer(rows, many=True).data`.
+        stream_format (str): 'json' for a JSON array, 'ndjson' for one object per line.
+        chunk_size (int, optional): The number of rows fetched and serialized at once.
+
+    Returns:
+        ChunkedStreamingHttpResponse: The streamed list.
+    """
+    return ChunkedStreamingHttpResponse(
+        _encode_chunks(_chunks(queryset, chunk_size), serialize, stream_format),
+        content_type=STREAM_FORMATS[stream_format],
+    )
+
+
+def _chunks(queryset, chunk_size):
+    chunk = []
+    for row in queryset.iterator(chunk_size=chunk_size):
+        chunk.append(row)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _dumps(data):
+    return json.dumps(data, cls=JSONEncoder, ensure_ascii=False, separators=(',', ':'))
+
+
+def _encode_chunks(chunks, serialize, stream_format):
+    if stream_format == 'ndjson':
+        for chunk in chunks:
+            yield ''.join(_dumps(row) + '\n' for row in serialize(chunk)).encode('utf-8')
+        return
+
+    yield b'['
+    separator = ''
+    for chunk in chunks:
+        yield (separator + ','.join(_dumps(row) for row in serialize(chunk))).encode('utf-8')
+        separator = ','
+    yield b']'
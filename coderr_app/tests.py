@@ -1,8 +1,25 @@
+import asyncio
+import shutil
+import tempfile
+from datetime import timedelta
+from io import BytesIO, StringIO
+from unittest.mock import patch
+from PIL import Image
+from asgiref.sync import async_to_sync
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import transaction
+from django.http import StreamingHttpResponse
 from django.urls import reverse
-from django.test import TestCase
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
 from rest_framework.test import APIClient
 from rest_framework import status
 from auth_app.models import CustomUser
+from coderr_app.asgi import DisconnectAwareASGIHandler, is_disconnect_aware
+from coderr_app.models import MediaBlob
+from coderr_app.streaming import ChunkedStreamingHttpResponse
 from orders_app.models import Order
 from review_app.models import Review
 from offers_app.models import Offer, OfferDetail
@@ -131,3 +148,229 @@ class CoderrAppTests(TestCase):
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data["message"], "Demo data initialized successfully.")
+
+
+def make_image(width=600, height=400, fmt='JPEG'):
+    """
+    Returns an encoded test image carrying EXIF metadata.
+    """
+    exif = Image.Exif()
+    exif[0x010F] = "Test Camera"
+    buffer = BytesIO()
+    Image.new('RGB', (width, height), (200, 30, 30)).save(buffer, fmt, exif=exif)
+    return buffer.getvalue()
+
+
+class TemporaryMediaTestCase(TestCase):
+    def setUp(self):
+        """
+        Redirects uploads to a temporary media root and creates a business user.
+        """
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        media_override = override_settings(MEDIA_ROOT=self.media_root)
+        media_override.enable()
+        self.addCleanup(media_override.disable)
+
+        self.client = APIClient()
+        self.business_user = CustomUser.objects.create_user(
+            username="business_user",
+            email="business@example.com",
+            password="securepassword123",
+            type="business",
+            is_active=True,
+        )
+
+
+@override_settings(IMAGE_VARIANTS_EAGER=True)
+class ImageVariantTests(TemporaryMediaTestCase):
+    def test_offer_image_variants_are_rendered_after_commit(self):
+        """Test that an uploaded offer image gets stripped WebP/JPEG variants once the write commits."""
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            offer = Offer.objects.create(
+                user=self.business_user,
+                title="Image Offer",
+                description="Offer with an image",
+                image=SimpleUploadedFile('photo.jpg', make_image(), content_type='image/jpeg'),
+            )
+            offer.refresh_from_db()
+            self.assertEqual(offer.image_variants, {})
+        # The rendering, plus the catalog invalidations of the write and of the recorded variants.
+        self.assertEqual(len(callbacks), 3)
+
+        offer.refresh_from_db()
+        self.assertEqual(offer.image_variants['source'], offer.image.name)
+        self.assertEqual(set(offer.image_variants['webp']), {'160', '480'})
+        with default_storage.open(offer.image_variants['jpeg']['160']) as handle:
+            with Image.open(handle) as variant:
+                self.assertEqual(variant.size, (160, 107))
+                self.assertFalse(variant.getexif())
+
+        self.client.force_authenticate(user=self.business_user)
+        response = self.client.get(f'/api/offers/{offer.id}/')
+        self.assertTrue(response.data['image_variants']['webp']['480'].endswith('.webp'))
+
+    def test_backfill_image_variants(self):
+        """Test that the backfill command renders variants of existing profile images."""
+        self.business_user.file = SimpleUploadedFile('avatar.png', make_image(200, 200, 'PNG'))
+        self.business_user.save()
+        self.assertEqual(CustomUser.objects.get(pk=self.business_user.pk).file_variants, {})
+
+        call_command('backfill_image_variants', stdout=StringIO())
+        variants = CustomUser.objects.get(pk=self.business_user.pk).file_variants
+        self.assertEqual(set(variants['jpeg']), {'160'})
+        self.assertTrue(default_storage.exists(variants['webp']['160']))
+
+
+class MediaStorageTests(TemporaryMediaTestCase):
+    def create_offer(self, image):
+        """
+        Creates an offer with the given image upload.
+        """
+        return Offer.objects.create(
+            user=self.business_user,
+            title="Image Offer",
+            description="Offer with an image",
+            image=SimpleUploadedFile('photo.jpg', image, content_type='image/jpeg'),
+        )
+
+    def test_identical_uploads_share_one_blob(self):
+        """Test that identical uploads are stored once and removed after their last reference is gone."""
+        image = make_image()
+        first, second = self.create_offer(image), self.create_offer(image)
+        self.assertEqual(first.image.name, second.image.name)
+        self.assertTrue(first.image.name.startswith('cas/'))
+        blob = MediaBlob.objects.get()
+        self.assertEqual(blob.refcount, 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            first.delete()
+        blob.refresh_from_db()
+        self.assertEqual(blob.refcount, 1)
+
+        call_command('cleanup_media_blobs', '--min-age-hours=0', stdout=StringIO())
+        self.assertTrue(default_storage.exists(blob.name))
+
+        MediaBlob.objects.update(updated_at=timezone.now() - timedelta(days=2))
+        with self.captureOnCommitCallbacks(execute=True):
+            second.image = SimpleUploadedFile('other.jpg', make_image(300, 200), content_type='image/jpeg')
+            second.save()
+        blob.refresh_from_db()
+        self.assertEqual(blob.refcount, 0)
+
+        call_command('cleanup_media_blobs', '--min-age-hours', '1', stdout=StringIO())
+        self.assertTrue(default_storage.exists(blob.name))
+
+        call_command('cleanup_media_blobs', '--min-age-hours=0', stdout=StringIO())
+        self.assertFalse(default_storage.exists(blob.name))
+        self.assertEqual(list(MediaBlob.objects.values_list('name', flat=True)), [second.image.name])
+
+    def test_cleanup_removes_files_of_rolled_back_uploads(self):
+        """Test that a blob file whose upload was rolled back is removed once it is old enough."""
+        try:
+            with transaction.atomic():
+                name = self.create_offer(make_image()).image.name
+                raise RuntimeError
+        except RuntimeError:
+            pass
+        self.assertTrue(default_storage.exists(name))
+        self.assertFalse(MediaBlob.objects.exists())
+
+        call_command('cleanup_media_blobs', '--min-age-hours', '1', stdout=StringIO())
+        self.assertTrue(default_storage.exists(name))
+        self.assertFalse(MediaBlob.objects.exists())
+
+        call_command('cleanup_media_blobs', '--min-age-hours=0', stdout=StringIO())
+        self.assertFalse(default_storage.exists(name))
+        self.assertFalse(MediaBlob.objects.exists())
+
+    def test_blobs_are_served_immutable(self):
+        """Test that blob URLs are served with immutable caching, validators and X-Accel-Redirect."""
+        offer = self.create_offer(make_image())
+        url = default_storage.url(offer.image.name)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertIn('max-age=31536000', response['Cache-Control'])
+        self.assertEqual(b''.join(response.streaming_content), offer.image.open('rb').read())
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        with override_settings(MEDIA_ACCEL_REDIRECT='/protected-media/'):
+            response = self.client.get(url)
+        self.assertEqual(response['X-Accel-Redirect'], f'/protected-media/{offer.image.name}')
+        self.assertEqual(response.content, b'')
+
+        response = self.client.get(url.replace(offer.image.name[-8:], '0' * 8))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class DisconnectAwareASGIHandlerTests(SimpleTestCase):
+    def test_streaming_response_ends_when_client_disconnects(self):
+        """Test that a never-ending streaming response is cancelled and closed once the client disconnects."""
+        closed, requests_seen = [], []
+
+        async def ticks():
+            try:
+                while True:
+                    yield b'tick'
+                    await asyncio.sleep(0.01)
+            finally:
+                closed.append(True)
+
+        async def get_response_async(request):
+            requests_seen.append(request)
+            return StreamingHttpResponse(ticks())
+
+        async def serve():
+            disconnected = asyncio.Event()
+            requests = [{'type': 'http.request', 'body': b'', 'more_body': False}]
+            sent = []
+
+            async def receive():
+                if requests:
+                    return requests.pop(0)
+                await disconnected.wait()
+                return {'type': 'http.disconnect'}
+
+            async def send(message):
+                sent.append(message)
+                if message.get('body'):
+                    disconnected.set()
+
+            scope = {
+                'type': 'http', 'method': 'GET', 'path': '/stream/', 'query_string': b'',
+                'headers': [], 'server': ('testserver', 80), 'root_path': '',
+            }
+            handler = DisconnectAwareASGIHandler()
+            with patch.object(handler, 'get_response_async', get_response_async):
+                await asyncio.wait_for(handler(scope, receive, send), 5)
+            await asyncio.sleep(0.05)
+            return sent
+
+        sent = async_to_sync(serve)()
+        self.assertEqual(sent[0]['type'], 'http.response.start')
+        self.assertEqual(closed, [True])
+        self.assertTrue(is_disconnect_aware(requests_seen[0]))
+
+
+class ChunkedStreamingHttpResponseTests(SimpleTestCase):
+    def test_sync_iterator_is_streamed_part_by_part_under_asgi(self):
+        """Test that the async iteration of the ASGI handler reads one part at a time."""
+        produced = []
+
+        def parts():
+            for index in range(3):
+                produced.append(index)
+                yield f'part {index}'.encode()
+
+        async def consume(response):
+            received = []
+            async for part in response:
+                received.append((part, len(produced)))
+            return received
+
+        received = async_to_sync(consume)(ChunkedStreamingHttpResponse(parts()))
+        self.assertEqual(received, [(b'part 0', 1), (b'part 1', 2), (b'part 2', 3)])
+        self.assertEqual(b''.join(ChunkedStreamingHttpResponse(parts())), b'part 0part 1part 2')
@@ -6,6 +6,7 @@ from auth_app.views import LoginView, RegisterView, RequestPasswordReset, Passwo
 
 urlpatterns = [ 
     path('offers/', include('offers_app.urls')), 
+    path('offerdetails/', OfferDetailView.as_view(), name='offer-detail-list'),
     path('offerdetails/<int:pk>/', OfferDetailView.as_view(), name='offer-detail-view'),
     path('orders/', include('orders_app.urls')),
     path('base-info/', BaseInfoView.as_view(), name='base-info'),
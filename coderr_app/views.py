@@ -3,20 +3,32 @@ from rest_framework.response import Response
 from rest_framework import status
 from review_app.models import Review
 from offers_app.models import Offer, OfferDetail
-from orders_app.models import Order
+from orders_app.models import Order, OrderStatusCount
 from auth_app.models import CustomUser
 from django.db.models import Avg
 import random
 import json
 from datetime import datetime, timedelta
 from django.shortcuts import get_object_or_404
+import mimetypes
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils.cache import patch_cache_control
+from django.utils.http import quote_etag
+from django.views import View
+from .conditional import not_modified_response
+from .storage import BLOB_PREFIX, blob_hash
 
+BLOB_MAX_AGE = 60 * 60 * 24 * 365
 
 
 class OrderCountAPIView(APIView):
     """
     Returns the count of orders for a specific business user.
     Supports general filtering or counting only completed orders.
+
+    Counts are read from the OrderStatusCount counters, one row per status.
     """
 
     def get(self, request, business_user_id):
@@ -24,14 +36,10 @@ class OrderCountAPIView(APIView):
         business_user = get_object_or_404(User, pk=business_user_id)
 
         if 'completed-order-count' in request.resolver_match.url_name:
-            order_count = Order.objects.filter(
-                business_user=business_user,
-                status='completed'
-            ).count()
+            order_count = OrderStatusCount.objects.count_for(business_user.pk, 'completed')
             return Response({"completed_order_count": order_count}, status=status.HTTP_200_OK)
         else:
             status_filter = request.query_params.get('status')
-            orders = Order.objects.filter(business_user=business_user)
 
             if status_filter:
                 valid_statuses = dict(Order.STATUS_CHOICES).keys()
@@ -40,9 +48,8 @@ class OrderCountAPIView(APIView):
                         {"error": f"Ungültiger Status. Gültige Werte sind: {', '.join(valid_statuses)}"},
                         status=status.HTTP_400_BAD_REQUEST
                     )
-                orders = orders.filter(status=status_filter)
 
-            order_count = orders.count()
+            order_count = OrderStatusCount.objects.count_for(business_user.pk, status_filter or None)
             return Response({"order_count": order_count}, status=status.HTTP_200_OK)
 
     
@@ -224,6 +231,7 @@ class InitDBService(APIView):
                         offer_type=offer_type
                     )
 
+                offer.update_summary(save=False)
                 random_date = self.random_past_date()
                 offer.created_at = random_date
                 offer.updated_at = random_date
@@ -287,4 +295,37 @@ class InitDBService(APIView):
                 review.updated_at = random_date
                 review.save()
 
-        return Response({'message': 'Demo data initialized successfully.'}, status=status.HTTP_200_OK)
\ No newline at end of file
+        return Response({'message': 'Demo data initialized successfully.'}, status=status.HTTP_200_OK)
+
+
+class MediaBlobView(View):
+    """
+    Serves files of the content-addressed media storage.
+
+    A blob URL contains the hash of its content, so it never changes and is served with a
+    one-year, immutable Cache-Control. With `MEDIA_ACCEL_REDIRECT` set, the response only
+    carries an X-Accel-Redirect header and nginx sends the file; otherwise a FileResponse
+    is returned, which gunicorn sends with sendfile().
+    """
+
+    def get(self, request, name):
+        """
+        GET /media/cas/<name>
+
+        Returns the blob, 304 if the client's copy matches, or 404 if it does not exist.
+        """
+        name = f'{BLOB_PREFIX}/{name}'
+        digest = blob_hash(name)
+        if digest is None or not default_storage.exists(name):
+            raise Http404
+
+        response = not_modified_response(request, digest)
+        if response is None:
+            if settings.MEDIA_ACCEL_REDIRECT:
+                response = HttpResponse(content_type=mimetypes.guess_type(name)[0] or 'application/octet-stream')
+                response['X-Accel-Redirect'] = f"{settings.MEDIA_ACCEL_REDIRECT.rstrip('/')}/{name}"
+            else:
+                response = FileResponse(default_storage.open(name, 'rb'))
+            response['ETag'] = quote_etag(digest)
+        patch_cache_control(response, public=True, max_age=BLOB_MAX_AGE, immutable=True)
+        return response
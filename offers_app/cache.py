@@ -0,0 +1,13 @@
+from coderr_app.cache import VersionedResponseCache, bump_cache_version
+
+
+OFFER_CATALOG = 'offers'
+
+offer_list_cache = VersionedResponseCache(OFFER_CATALOG)
+
+
+def bump_catalog_version():
+    """
+    Invalidates all cached offer responses. Called on every Offer and OfferDetail write.
+    """
+    bump_cache_version(OFFER_CATALOG)
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from offers_app.cache import bump_catalog_version
+from offers_app.models import Offer
+
+
+class Command(BaseCommand):
+    """
+    Management command to fill the denormalized price and delivery summary of existing offers.
+
+    Recomputes min_price, max_price and min_delivery_time from the OfferDetails in batches
+    of offer ids, each batch as a single UPDATE statement.
+    """
+    help = 'Recomputes min_price, max_price and min_delivery_time of all offers from their details.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Number of offers updated per statement.')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        offer_ids = list(Offer.objects.order_by('pk').values_list('pk', flat=True))
+        updated = 0
+        for start in range(0, len(offer_ids), batch_size):
+            with transaction.atomic():
+                updated += Offer.objects.filter(pk__in=offer_ids[start:start + batch_size]).refresh_summaries()
+        bump_catalog_version()
+        self.stdout.write(self.style.SUCCESS(f'{updated} Angebote aktualisiert.'))
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from offers_app.models import Offer
+from offers_app.search import get_offer_search
+
+
+class Command(BaseCommand):
+    """
+    Management command to recompute the stored full-text search vectors of all offers.
+    """
+    help = 'Recomputes the full-text search vector of all offers.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Number of offers updated per statement.')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        search = get_offer_search()
+        offer_ids = list(Offer.objects.order_by('pk').values_list('pk', flat=True))
+        updated = 0
+        for start in range(0, len(offer_ids), batch_size):
+            with transaction.atomic():
+                updated += search.refresh(Offer.objects.filter(pk__in=offer_ids[start:start + batch_size]))
+        self.stdout.write(self.style.SUCCESS(f'{updated} Angebote indexiert.'))
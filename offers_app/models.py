@@ -1,8 +1,31 @@
 from datetime import datetime
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from django.db.models import Max, Min, OuterRef, Subquery
 from auth_app.models import CustomUser
 
 
+class OfferQuerySet(models.QuerySet):
+    """
+    QuerySet for offers with helpers to maintain the denormalized price and delivery summary.
+    """
+
+    def refresh_summaries(self):
+        """
+        Recomputes min_price, max_price and min_delivery_time for all offers in the queryset
+        from their OfferDetails in a single UPDATE statement.
+
+        Returns:
+            int: The number of updated offers.
+        """
+        details = OfferDetail.objects.filter(offer=OuterRef('pk')).order_by().values('offer')
+        return self.update(
+            min_price=Subquery(details.annotate(value=Min('price')).values('value')),
+            max_price=Subquery(details.annotate(value=Max('price')).values('value')),
+            min_delivery_time=Subquery(details.annotate(value=Min('delivery_time_in_days')).values('value')),
+        )
+
+
 class Offer(models.Model):
     """
     Represents an offer created by a user.
@@ -11,43 +34,75 @@ class Offer(models.Model):
         user (ForeignKey): The user who created the offer.
         title (str): The title of the offer.
         image (ImageField): An optional image associated with the offer.
+        image_variants (JSONField): Storage names of the resized WebP/JPEG variants of the image,
+            keyed by format and width, plus the source they were rendered from.
         description (str): A detailed description of the offer.
         created_at (datetime): The timestamp when the offer was created.
         updated_at (datetime): The timestamp when the offer was last updated.
+        min_price (Decimal): The lowest price among the related OfferDetails (denormalized).
+        max_price (Decimal): The highest price among the related OfferDetails (denormalized).
+        min_delivery_time (int): The shortest delivery time in days among the related OfferDetails (denormalized).
+        search_vector (SearchVectorField): The full-text search document built from title and description.
     """
+    SUMMARY_FIELDS = ['min_price', 'max_price', 'min_delivery_time']
+
     user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='offers')
     title = models.CharField(max_length=255)
     image = models.ImageField(upload_to='offers/', null=True, blank=True)
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
     description = models.TextField()
     created_at = models.DateTimeField(default=datetime.now)
     updated_at = models.DateTimeField(default=datetime.now)
+    min_price = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    max_price = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    min_delivery_time = models.PositiveIntegerField(null=True, blank=True)
+    search_vector = SearchVectorField(null=True, editable=False)
 
-    def __str__(self):
+    objects = OfferQuerySet.as_manager()
+
+    class Meta:
         """
-        Returns the string representation of the offer, which is its title.
+        Metadata for the Offer model.
 
-        Returns:
-            str: The title of the offer.
+        Composite indexes on each orderable column plus the id tie-breaker back the
+        filters and the keyset pagination of the offer list. The PostgreSQL-only indexes
+        for the full-text search and the title suggestions are not declared here, so the
+        schema stays portable; see `offers_app.signals.create_postgres_indexes`.
         """
-        return self.title
+        indexes = [
+            models.Index(fields=['min_price', 'id'], name='offer_min_price_idx'),
+            models.Index(fields=['max_price', 'id'], name='offer_max_price_idx'),
+            models.Index(fields=['min_delivery_time', 'id'], name='offer_min_delivery_idx'),
+            models.Index(fields=['updated_at', 'id'], name='offer_updated_at_idx'),
+        ]
 
-    def get_min_price(self):
+    def __str__(self):
         """
-        Calculates the minimum price among all related OfferDetails.
+        Returns the string representation of the offer, which is its title.
 
         Returns:
-            float or None: The minimum price, or None if there are no related OfferDetails.
+            str: The title of the offer.
         """
-        return self.details.aggregate(models.Min('price'))['price__min']
+        return self.title
 
-    def get_min_delivery_time(self):
+    def update_summary(self, save=True):
         """
-        Calculates the minimum delivery time among all related OfferDetails.
+        Recalculates the denormalized min_price, max_price and min_delivery_time from the
+        related OfferDetails. Must be called after every OfferDetail write, inside the same
+        transaction as the write.
 
-        Returns:
-            int or None: The minimum delivery time in days, or None if there are no related OfferDetails.
+        Args:
+            save (bool): Whether to persist the summary fields immediately.
         """
-        return self.details.aggregate(models.Min('delivery_time_in_days'))['delivery_time_in_days__min']
+        summary = self.details.aggregate(
+            min_price=Min('price'),
+            max_price=Max('price'),
+            min_delivery_time=Min('delivery_time_in_days'),
+        )
+        for field, value in summary.items():
+            setattr(self, field, value)
+        if save:
+            self.save(update_fields=self.SUMMARY_FIELDS)
 
 
 class OfferDetail(models.Model):
@@ -1,6 +1,13 @@
+import base64
+import binascii
+import json
+from django.core.exceptions import ValidationError
+from django.db.models import F, Q
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
 from rest_framework.exceptions import NotFound
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
 
 class CustomPageNumberPagination(PageNumberPagination):
     """
@@ -20,4 +27,156 @@ class CustomPageNumberPagination(PageNumberPagination):
                 'invalid_page': True,
             }, status=200)
 
-        return super().get_paginated_response(data)
\ No newline at end of file
+        return super().get_paginated_response(data)
+
+class OfferCursorPagination:
+    """
+    Keyset paginator for the offer list.
+
+    Pages are addressed by an opaque cursor holding the ordering value and id of the
+    boundary row, so every page is fetched with an indexed range scan on
+    (ordering field, id) instead of COUNT(*) plus OFFSET. NULL values (offers without
+    details) are always sorted last.
+
+    Attributes:
+        page_size (int): The number of offers per page.
+        cursor_query_param (str): Query parameter that carries the cursor.
+    """
+    page_size = api_settings.PAGE_SIZE
+    cursor_query_param = 'cursor'
+
+    def paginate_queryset(self, queryset, request, ordering):
+        """
+        Returns one page of the queryset, positioned by the cursor in the request.
+
+        Args:
+            queryset (QuerySet): The filtered offer queryset.
+            request (Request): The current request.
+            ordering (str): A single model field name, optionally prefixed with '-'.
+
+        Raises:
+            NotFound: If the cursor is malformed or belongs to a different ordering.
+
+        Returns:
+            list: The offers of the requested page.
+        """
+        self.request = request
+        self.ordering = ordering
+        self.field = ordering.lstrip('-')
+        self.descending = ordering.startswith('-')
+        self.model_field = self.get_model(queryset)._meta.get_field(self.field)
+
+        cursor = self.decode_cursor(request)
+        self.has_cursor = cursor is not None
+        self.reverse = bool(cursor and cursor['r'])
+
+        rows = self.fetch_rows(queryset, cursor)
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+
+        if self.reverse:
+            rows.reverse()
+            self.has_next = True
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = self.has_cursor
+
+        self.page = rows
+        return rows
+
+    def get_model(self, queryset):
+        """
+        Returns the model of the paginated rows.
+        """
+        return queryset.model
+
+    def fetch_rows(self, queryset, cursor):
+        """
+        Fetches up to one row more than a page, starting after the cursor row.
+        """
+        if cursor is not None:
+            queryset = queryset.filter(self._position_filter(cursor['v'], cursor['i']))
+        return list(queryset.order_by(*self._order_by())[:self.page_size + 1])
+
+    def get_paginated_response(self, data):
+        """
+        Returns the page with opaque links to the neighbouring pages.
+        """
+        next_link = previous_link = None
+        if self.page and self.has_next:
+            next_link = self.encode_cursor(self.page[-1], reverse=False)
+        if self.page and self.has_previous:
+            previous_link = self.encode_cursor(self.page[0], reverse=True)
+        return Response({
+            'next': next_link,
+            'previous': previous_link,
+            'results': data,
+        })
+
+    def decode_cursor(self, request):
+        """
+        Decodes the cursor query parameter. An empty cursor requests the first page.
+
+        The boundary value is parsed for the ordering field, so a tampered cursor is rejected
+        here instead of failing in the query.
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            cursor = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')).decode('utf-8'))
+            if (
+                not isinstance(cursor, dict)
+                or cursor['o'] != self.ordering
+                or type(cursor['i']) is not int
+                or not isinstance(cursor['r'], bool)
+            ):
+                raise ValueError
+            if cursor['v'] is not None:
+                if not isinstance(cursor['v'], str):
+                    raise ValueError
+                cursor['v'] = self.model_field.to_python(cursor['v'])
+                if cursor['v'] is None or not getattr(cursor['v'], 'is_finite', lambda: True)():
+                    raise ValueError
+            return cursor
+        except (TypeError, ValueError, KeyError, UnicodeError, binascii.Error, ValidationError):
+            raise NotFound('Ungültiger Cursor.')
+
+    def encode_cursor(self, offer, reverse):
+        """
+        Builds the absolute URL pointing before (reverse) or after the given offer.
+        """
+        value = getattr(offer, self.field)
+        if value is not None:
+            value = value.isoformat() if hasattr(value, 'isoformat') else str(value)
+        payload = json.dumps({'o': self.ordering, 'v': value, 'i': offer.pk, 'r': reverse}, separators=(',', ':'))
+        encoded = base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+        return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, encoded)
+
+    def _order_by(self):
+        """
+        Returns the ordering expressions for the current traversal direction.
+        """
+        descending = self.descending != self.reverse
+        if descending:
+            return [F(self.field).desc(nulls_last=not self.reverse, nulls_first=self.reverse), F('pk').desc()]
+        return [F(self.field).asc(nulls_last=not self.reverse, nulls_first=self.reverse), F('pk').asc()]
+
+    def _position_filter(self, value, pk):
+        """
+        Returns the keyset condition selecting the rows after (or, in reverse, before) the cursor row.
+        """
+        after, before = ('lt', 'gt') if self.descending else ('gt', 'lt')
+        field = self.field
+        if not self.reverse:
+            if value is None:
+                return Q(**{f'{field}__isnull': True, f'pk__{after}': pk})
+            return (
+                Q(**{f'{field}__{after}': value})
+                | Q(**{field: value, f'pk__{after}': pk})
+                | Q(**{f'{field}__isnull': True})
+            )
+        if value is None:
+            return Q(**{f'{field}__isnull': False}) | Q(**{f'{field}__isnull': True, f'pk__{before}': pk})
+        return Q(**{f'{field}__{before}': value}) | Q(**{field: value, f'pk__{before}': pk})
@@ -0,0 +1,94 @@
+import re
+from django.db import connection
+from django.db.models import Case, F, IntegerField, Q, Value, When
+
+
+SEARCH_CONFIG = 'german'
+
+
+def search_terms(text):
+    """
+    Splits a search string into lowercase word terms. Operators and punctuation are dropped,
+    so the terms are safe to embed in a raw tsquery.
+
+    Args:
+        text (str): The raw search input.
+
+    Returns:
+        list: The search terms.
+    """
+    return re.findall(r'\w+', text.lower())
+
+
+class PostgresOfferSearch:
+    """
+    Full-text search over the stored, GIN-indexed `search_vector` of offers.
+
+    The vector weights the title (A) above the description (B) and uses the German
+    text search configuration. Every term is matched as a prefix.
+    """
+
+    def search(self, queryset, text):
+        """
+        Filters the queryset to offers matching all terms and annotates a `search_rank`.
+        """
+        from django.contrib.postgres.search import SearchQuery, SearchRank
+
+        terms = search_terms(text)
+        if not terms:
+            return queryset.none()
+        query = SearchQuery(' & '.join(f'{term}:*' for term in terms), search_type='raw', config=SEARCH_CONFIG)
+        return queryset.filter(search_vector=query).annotate(search_rank=SearchRank(F('search_vector'), query))
+
+    def refresh(self, queryset):
+        """
+        Recomputes the stored search vector of all offers in the queryset.
+        """
+        from django.contrib.postgres.search import SearchVector
+
+        return queryset.update(
+            search_vector=SearchVector('title', weight='A', config=SEARCH_CONFIG)
+            + SearchVector('description', weight='B', config=SEARCH_CONFIG)
+        )
+
+
+class FallbackOfferSearch:
+    """
+    Search for databases without PostgreSQL full-text support (e.g. SQLite in tests).
+
+    Matches every term as a case-insensitive substring of title or description and ranks
+    title hits above description hits, mirroring the weights of the PostgreSQL search.
+    No index is maintained.
+    """
+
+    def search(self, queryset, text):
+        """
+        Filters the queryset to offers matching all terms and annotates a `search_rank`.
+        """
+        terms = search_terms(text)
+        if not terms:
+            return queryset.none()
+        rank = Value(0)
+        for term in terms:
+            queryset = queryset.filter(Q(title__icontains=term) | Q(description__icontains=term))
+            rank = rank + Case(
+                When(title__icontains=term, then=Value(2)),
+                default=Value(1),
+                output_field=IntegerField(),
+            )
+        return queryset.annotate(search_rank=rank)
+
+    def refresh(self, queryset):
+        """
+        Nothing to maintain for the fallback search.
+        """
+        return 0
+
+
+def get_offer_search():
+    """
+    Returns the search implementation matching the configured database.
+    """
+    if connection.vendor == 'postgresql':
+        return PostgresOfferSearch()
+    return FallbackOfferSearch()
@@ -1,4 +1,8 @@
+from django.db import transaction
+from django.utils import timezone
 from rest_framework import serializers
+from coderr_app.images import variant_urls
+from coderr_app.serializers import SparseFieldsetMixin
 from .models import Offer, OfferDetail
 from decimal import Decimal
 
@@ -43,17 +47,28 @@ class OfferDetailSerializer(serializers.ModelSerializer):
             return "0.00"
 
 
-class OfferSerializer(serializers.ModelSerializer):
+class OfferSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """
     Serializer for the Offer model.
 
     Serializes offers along with their details, including minimum price,
     minimum delivery time, and associated user.
+
+    The minimums are read from the denormalized summary columns of the offer, so
+    serializing a list of offers with prefetched details runs no per-row queries.
+    Supports sparse fieldsets; `details` needs no column of the offer itself.
     """
+    sparse_sources = {
+        'details': (),
+        'min_price': ('min_price',),
+        'min_delivery_time': ('min_delivery_time',),
+        'image_variants': ('image_variants',),
+    }
     details = OfferDetailSerializer(many=True)
     min_price = serializers.SerializerMethodField()
     min_delivery_time = serializers.SerializerMethodField()
     user = serializers.PrimaryKeyRelatedField(read_only=True)
+    image_variants = serializers.SerializerMethodField()
 
     class Meta:
         model = Offer
@@ -61,6 +76,7 @@ class OfferSerializer(serializers.ModelSerializer):
             'id',
             'title',
             'image',
+            'image_variants',
             'description',
             'created_at',
             'updated_at',
@@ -82,7 +98,7 @@ class OfferSerializer(serializers.ModelSerializer):
             str: The minimum price as a string with two decimal places (e.g., "123.45").
                 Returns "0.00" if no OfferDetails are associated.
         """
-        min_price = obj.get_min_price()
+        min_price = obj.min_price
         if min_price is not None:
             return "{:.2f}".format(min_price)
         return "0.00"
@@ -97,9 +113,21 @@ class OfferSerializer(serializers.ModelSerializer):
         Returns:
             int: The minimum delivery time in days. Returns 0 if no OfferDetails are associated.
         """
-        min_delivery_time = obj.get_min_delivery_time()
+        min_delivery_time = obj.min_delivery_time
         return min_delivery_time if min_delivery_time is not None else 0
 
+    def get_image_variants(self, obj):
+        """
+        Get the URLs of the resized variants of the offer image.
+
+        Args:
+            obj (Offer): The Offer instance.
+
+        Returns:
+            dict: URLs keyed by format and width. Empty until the variants are rendered.
+        """
+        return variant_urls(obj.image_variants)
+
     def create(self, validated_data):
         """
         Create a new Offer instance and its related OfferDetails.
@@ -118,9 +146,11 @@ class OfferSerializer(serializers.ModelSerializer):
         if len(details_data) != 3:
             raise serializers.ValidationError("Es müssen genau drei Angebotsdetails angegeben werden.")
 
-        offer = Offer.objects.create(**validated_data)
-        for detail_data in details_data:
-            OfferDetail.objects.create(offer=offer, **detail_data)
+        with transaction.atomic():
+            offer = Offer.objects.create(**validated_data)
+            for detail_data in details_data:
+                OfferDetail.objects.create(offer=offer, **detail_data)
+            offer.update_summary()
         return offer
 
     def update(self, instance, validated_data):
@@ -139,12 +169,15 @@ class OfferSerializer(serializers.ModelSerializer):
             Offer: The updated Offer instance.
         """
         details_data = validated_data.pop('details', None)
-        for attr, value in validated_data.items():
-            setattr(instance, attr, value)
-        instance.save()
-
-        if details_data is not None:
-            instance.details.all().delete()
-            for detail_data in details_data:
-                OfferDetail.objects.create(offer=instance, **detail_data)
+        with transaction.atomic():
+            for attr, value in validated_data.items():
+                setattr(instance, attr, value)
+            instance.updated_at = timezone.now()
+            instance.save()
+
+            if details_data is not None:
+                instance.details.all().delete()
+                for detail_data in details_data:
+                    OfferDetail.objects.create(offer=instance, **detail_data)
+                instance.update_summary()
         return instance
@@ -0,0 +1,88 @@
+from django.db import connections
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+from coderr_app.images import register_variant_field
+from coderr_app.storage import track_file_references
+from .cache import bump_catalog_version
+from .models import Offer, OfferDetail
+from .search import get_offer_search
+
+
+SEARCH_SOURCE_FIELDS = {'title', 'description'}
+
+POSTGRES_INDEXES = {
+    'offer_search_vector_idx': 'USING gin ({search_vector})',
+    'offer_title_prefix_idx': '(UPPER({title}) text_pattern_ops)',
+}
+
+register_variant_field(Offer, 'image', on_change=bump_catalog_version)
+track_file_references(Offer, 'image')
+
+
+@receiver(post_save, sender=Offer)
+def refresh_search_vector(sender, instance, update_fields=None, **kwargs):
+    """
+    Signal receiver to keep the stored search vector of an offer in sync with its
+    title and description.
+
+    Args:
+        sender (Offer): The Offer model class.
+        instance (Offer): The Offer instance being saved.
+        update_fields (frozenset): The fields passed to save(), if any. Saves that do not
+            touch the title or description are skipped.
+    """
+    if update_fields is not None and not SEARCH_SOURCE_FIELDS.intersection(update_fields):
+        return
+    get_offer_search().refresh(Offer.objects.filter(pk=instance.pk))
+
+
+@receiver(post_save, sender=OfferDetail)
+@receiver(post_delete, sender=OfferDetail)
+def touch_offer(sender, instance, **kwargs):
+    """
+    Signal receiver to bump the updated_at of the parent offer whenever one of its
+    details changes, so it stays a valid validator for conditional requests.
+
+    Args:
+        sender (OfferDetail): The OfferDetail model class.
+        instance (OfferDetail): The OfferDetail instance being saved or deleted.
+    """
+    Offer.objects.filter(pk=instance.offer_id).update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=Offer)
+@receiver(post_delete, sender=Offer)
+@receiver(post_save, sender=OfferDetail)
+@receiver(post_delete, sender=OfferDetail)
+def invalidate_offer_cache(sender, **kwargs):
+    """
+    Signal receiver to invalidate the cached offer responses whenever an offer or
+    one of its details is written or deleted.
+    """
+    bump_catalog_version()
+
+
+def create_postgres_indexes(sender, using='default', **kwargs):
+    """
+    Post-migrate receiver that creates the PostgreSQL-only indexes of the offer table.
+
+    The GIN index backs the full-text search, the text_pattern_ops index on the upper-cased
+    title backs the case-insensitive prefix lookups of the title suggestions. Other
+    databases use the fallback search and get neither index.
+
+    Args:
+        sender (AppConfig): The config of the offers app.
+        using (str): The alias of the migrated database.
+    """
+    connection = connections[using]
+    if connection.vendor != 'postgresql':
+        return
+    quote = connection.ops.quote_name
+    table = quote(Offer._meta.db_table)
+    columns = {name: quote(Offer._meta.get_field(name).column) for name in ('search_vector', 'title')}
+    with connection.cursor() as cursor:
+        for name, definition in POSTGRES_INDEXES.items():
+            cursor.execute(
+                f'CREATE INDEX IF NOT EXISTS {quote(name)} ON {table} {definition.format(**columns)}'
+            )
@@ -1,8 +1,19 @@
+import base64
+import json
+from io import StringIO
+from unittest.mock import patch
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import F
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import APIClient
 from rest_framework import status
 from auth_app.models import CustomUser
 from offers_app.models import Offer, OfferDetail
+from offers_app.views import OfferDetailView
 
 class OfferAPITests(TestCase):
     def setUp(self):
@@ -10,6 +21,7 @@ class OfferAPITests(TestCase):
         Sets up the test client, creates test users, and initializes offers and details.
         """
         self.client = APIClient()
+        caches[settings.RESPONSE_CACHE_ALIAS].clear()
 
         self.business_user = CustomUser.objects.create_user(
             username="business_user",
@@ -59,6 +71,7 @@ class OfferAPITests(TestCase):
             features=["Feature 1", "Feature 2", "Feature 3", "Feature 4"],
             offer_type="premium"
         )
+        self.offer.update_summary()
 
     def authenticate_user(self, user):
         """
@@ -155,3 +168,488 @@ class OfferAPITests(TestCase):
         response = self.client.post('/api/offers/', data, format='json')
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertIn('error', response.data)
+
+    def test_create_offer_stores_summary(self):
+        """
+        Tests that creating an offer stores the price and delivery summary of its details.
+        """
+        self.authenticate_user(self.business_user)
+        data = {
+            "title": "Summary Offer",
+            "description": "Summary offer description",
+            "details": [
+                {"title": "Basic", "revisions": 1, "delivery_time_in_days": 4, "price": 80, "features": ["A"], "offer_type": "basic"},
+                {"title": "Standard", "revisions": 2, "delivery_time_in_days": 6, "price": 150, "features": ["B"], "offer_type": "standard"},
+                {"title": "Premium", "revisions": -1, "delivery_time_in_days": 9, "price": 420, "features": ["C"], "offer_type": "premium"}
+            ]
+        }
+        response = self.client.post('/api/offers/', data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        offer = Offer.objects.get(pk=response.data['id'])
+        self.assertEqual(offer.min_price, 80)
+        self.assertEqual(offer.max_price, 420)
+        self.assertEqual(offer.min_delivery_time, 4)
+
+    def test_invalid_offer_creation_rolls_back(self):
+        """
+        Tests that an invalid detail does not leave a half-created offer behind.
+        """
+        self.authenticate_user(self.business_user)
+        data = {
+            "title": "Broken Offer",
+            "description": "Broken offer description",
+            "details": [
+                {"title": "Basic", "revisions": 1, "delivery_time_in_days": 3, "price": 100, "features": ["A"], "offer_type": "basic"},
+                {"title": "Standard", "revisions": 2, "delivery_time_in_days": 5, "price": 200, "features": ["B"], "offer_type": "standard"},
+                {"title": "Premium", "revisions": -1, "delivery_time_in_days": 0, "price": 300, "features": ["C"], "offer_type": "premium"}
+            ]
+        }
+        response = self.client.post('/api/offers/', data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Offer.objects.count(), 1)
+
+    def test_update_offer_details_refreshes_summary(self):
+        """
+        Tests that patching a detail price updates the stored summary and the price filters.
+        """
+        self.authenticate_user(self.business_user)
+        basic = self.offer.details.get(offer_type="basic")
+        data = {"details": [{"id": basic.id, "price": 50}]}
+        response = self.client.patch(f'/api/offers/{self.offer.id}/', data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.offer.refresh_from_db()
+        self.assertEqual(self.offer.min_price, 50)
+
+        response = self.client.get('/api/offers/?max_price=60')
+        self.assertEqual(response.data['count'], 1)
+        response = self.client.get('/api/offers/?min_price=60')
+        self.assertEqual(response.data['count'], 0)
+
+    def test_patch_details_runs_constant_queries(self):
+        """
+        Tests that patching three details runs as many queries as patching one.
+        """
+        self.authenticate_user(self.business_user)
+        details = list(self.offer.details.order_by('id'))
+        one = {"details": [{"id": details[0].id, "price": 90}]}
+        three = {"details": [{"id": detail.id, "revisions": 4} for detail in details]}
+
+        with CaptureQueriesContext(connection) as single:
+            self.client.patch(f'/api/offers/{self.offer.id}/', one, format='json')
+        with CaptureQueriesContext(connection) as batch:
+            response = self.client.patch(f'/api/offers/{self.offer.id}/', three, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(single), len(batch))
+        self.assertEqual(set(self.offer.details.values_list('revisions', flat=True)), {4})
+
+    def test_patch_without_changes_writes_nothing(self):
+        """
+        Tests that a patch repeating the stored values leaves updated_at untouched.
+        """
+        self.authenticate_user(self.business_user)
+        basic = self.offer.details.get(offer_type="basic")
+        self.offer.refresh_from_db()
+        updated_at = self.offer.updated_at
+        data = {"title": "Test Offer", "details": [{"id": basic.id, "price": "100.00", "revisions": 1}]}
+        response = self.client.patch(f'/api/offers/{self.offer.id}/', data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.offer.refresh_from_db()
+        self.assertEqual(self.offer.updated_at, updated_at)
+
+    def test_patch_with_unknown_detail_changes_nothing(self):
+        """
+        Tests that a patch referencing a foreign detail is rejected without partial writes.
+        """
+        self.authenticate_user(self.business_user)
+        basic = self.offer.details.get(offer_type="basic")
+        data = {"details": [{"id": basic.id, "price": 10}, {"id": 999999, "price": 10}]}
+        response = self.client.patch(f'/api/offers/{self.offer.id}/', data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        basic.refresh_from_db()
+        self.assertEqual(basic.price, 100)
+
+    def test_patch_with_invalid_detail_values_is_rejected(self):
+        """
+        Tests that a patch validates detail values like the offer creation and answers 400.
+        """
+        self.authenticate_user(self.business_user)
+        basic = self.offer.details.get(offer_type="basic")
+        for values in ({"price": "NaN"}, {"price": -5}, {"revisions": -2}, {"delivery_time_in_days": 0}):
+            data = {"details": [{"id": basic.id, **values}]}
+            response = self.client.patch(f'/api/offers/{self.offer.id}/', data, format='json')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        basic.refresh_from_db()
+        self.assertEqual((basic.price, basic.revisions, basic.delivery_time_in_days), (100, 1, 3))
+
+    def test_patch_with_incomplete_or_duplicate_new_detail_is_rejected(self):
+        """
+        Tests that a new detail must be complete and must not repeat an offer type.
+        """
+        self.authenticate_user(self.business_user)
+        self.offer.details.filter(offer_type="premium").delete()
+        new_detail = {"title": "Premium", "revisions": 1, "delivery_time_in_days": 9, "price": 400, "features": ["D"], "offer_type": "premium"}
+        basic = self.offer.details.get(offer_type="basic")
+        for details in (
+            [{key: value for key, value in new_detail.items() if key != "price"}],
+            [{**new_detail, "offer_type": "basic"}],
+            [{"id": basic.id, "offer_type": "standard"}],
+            [new_detail, dict(new_detail)],
+        ):
+            response = self.client.patch(f'/api/offers/{self.offer.id}/', {"details": details}, format='json')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.offer.details.count(), 2)
+
+        response = self.client.patch(f'/api/offers/{self.offer.id}/', {"details": [new_detail]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.offer.details.count(), 3)
+
+    def test_backfill_offer_summaries(self):
+        """
+        Tests that the backfill command fills the summary columns of existing offers.
+        """
+        Offer.objects.update(min_price=None, max_price=None, min_delivery_time=None)
+        call_command('backfill_offer_summaries', stdout=StringIO())
+        self.offer.refresh_from_db()
+        self.assertEqual(self.offer.min_price, 100)
+        self.assertEqual(self.offer.max_price, 300)
+        self.assertEqual(self.offer.min_delivery_time, 3)
+
+    def test_offer_list_query_count_is_constant(self):
+        """
+        Tests that a page of offers costs the same number of queries regardless of its size.
+        """
+        for i in range(10):
+            offer = Offer.objects.create(user=self.business_user, title=f"Offer {i}", description="Bulk")
+            for offer_type, days in (("basic", 2), ("standard", 4), ("premium", 6)):
+                OfferDetail.objects.create(
+                    offer=offer, title=offer_type, revisions=1, delivery_time_in_days=days,
+                    price=10 * days, features=["A"], offer_type=offer_type
+                )
+            offer.update_summary()
+
+        self.authenticate_user(self.business_user)
+        with self.assertNumQueries(4):
+            response = self.client.get('/api/offers/?page=2')
+        self.assertEqual(len(response.data['results']), 5)
+        with self.assertNumQueries(4):
+            response = self.client.get('/api/offers/')
+        self.assertEqual(len(response.data['results']), 6)
+        self.assertEqual(len(response.data['results'][0]['details']), 3)
+
+        with self.assertNumQueries(3):
+            response = self.client.get(f'/api/offers/{self.offer.id}/')
+        self.assertEqual(response.data['min_price'], "100.00")
+
+    def test_cursor_pagination_walks_all_offers(self):
+        """
+        Tests that cursor mode pages through ties and offers without details in both directions.
+        """
+        for i, price in enumerate([50, 100, 100, 100, 250, None, 75, 100]):
+            offer = Offer.objects.create(user=self.business_user, title=f"Cursor {i}", description="Cursor")
+            if price is not None:
+                OfferDetail.objects.create(
+                    offer=offer, title="Basic", revisions=1, delivery_time_in_days=3,
+                    price=price, features=["A"], offer_type="basic"
+                )
+            offer.update_summary()
+        expected = list(
+            Offer.objects.order_by(F('min_price').desc(nulls_last=True), '-id').values_list('id', flat=True)
+        )
+
+        self.authenticate_user(self.business_user)
+        url = '/api/offers/?ordering=-min_price&cursor='
+        seen, pages = [], []
+        while url:
+            with self.assertNumQueries(3):
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn('count', response.data)
+            pages.append(response.data)
+            seen.extend(offer['id'] for offer in response.data['results'])
+            url = response.data['next']
+        self.assertEqual(seen, expected)
+        self.assertIsNone(pages[0]['previous'])
+
+        response = self.client.get(pages[-1]['previous'])
+        self.assertEqual([offer['id'] for offer in response.data['results']],
+                         [offer['id'] for offer in pages[-2]['results']])
+
+        url, seen = '/api/offers/?ordering=updated_at&cursor=', []
+        while url:
+            response = self.client.get(url)
+            seen.extend(offer['id'] for offer in response.data['results'])
+            url = response.data['next']
+        self.assertEqual(seen, list(Offer.objects.order_by('updated_at', 'id').values_list('id', flat=True)))
+
+    def test_cursor_pagination_rejects_invalid_cursor(self):
+        """
+        Tests that a tampered cursor is rejected.
+        """
+        self.authenticate_user(self.business_user)
+        response = self.client.get('/api/offers/?cursor=not-a-cursor')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        for payload in (
+            {'o': 'updated_at', 'v': '2024-01-01T00:00:00+00:00', 'i': 1},
+            {'o': 'updated_at', 'v': 'gestern', 'i': 1, 'r': False},
+            {'o': 'min_price', 'v': 'NaN', 'i': 1, 'r': False},
+        ):
+            cursor = base64.urlsafe_b64encode(json.dumps(payload).encode('utf-8')).decode('ascii')
+            response = self.client.get('/api/offers/', {'cursor': cursor, 'ordering': payload['o']})
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_postgres_indexes_created_after_migrate(self):
+        """
+        Tests that the PostgreSQL-only search and title indexes are created by the post-migrate hook.
+        """
+        if connection.vendor != 'postgresql':
+            self.skipTest('PostgreSQL-only indexes.')
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(cursor, Offer._meta.db_table)
+        self.assertIn('offer_search_vector_idx', constraints)
+        self.assertIn('offer_title_prefix_idx', constraints)
+
+    def test_search_ranks_title_matches_first(self):
+        """
+        Tests that the search matches word prefixes and ranks title hits above description hits.
+        """
+        in_description = Offer.objects.create(
+            user=self.business_user, title="Cloud-Dienste", description="Individuelle Softwareentwicklung"
+        )
+        in_title = Offer.objects.create(
+            user=self.business_user, title="Agile Softwareentwicklung", description="Moderne Methoden"
+        )
+        Offer.objects.create(user=self.business_user, title="Design", description="Logos und Grafiken")
+
+        self.authenticate_user(self.business_user)
+        response = self.client.get('/api/offers/?search=softwareentw')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([offer['id'] for offer in response.data['results']], [in_title.id, in_description.id])
+
+        in_title.title = "Grafikdesign"
+        with self.captureOnCommitCallbacks(execute=True):
+            in_title.save()
+        response = self.client.get('/api/offers/?search=softwareentw')
+        self.assertEqual([offer['id'] for offer in response.data['results']], [in_description.id])
+
+    def test_suggest_offer_titles(self):
+        """
+        Tests that the suggest endpoint returns ids and titles of offers starting with the query.
+        """
+        match = Offer.objects.create(user=self.business_user, title="Testautomatisierung", description="Tests")
+        Offer.objects.create(user=self.business_user, title="Mobile Apps", description="Test offer")
+
+        self.authenticate_user(self.customer_user)
+        response = self.client.get('/api/offers/suggest/?q=test')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, [
+            {'id': self.offer.id, 'title': "Test Offer"},
+            {'id': match.id, 'title': "Testautomatisierung"},
+        ])
+
+        response = self.client.get('/api/offers/suggest/?q=test&limit=1')
+        self.assertEqual(len(response.data), 1)
+        response = self.client.get('/api/offers/suggest/?q=')
+        self.assertEqual(response.data, [])
+
+    def test_offer_list_sparse_fieldset(self):
+        """
+        Tests that a sparse fieldset narrows the response and skips the details query.
+        """
+        self.authenticate_user(self.business_user)
+        with self.assertNumQueries(3):
+            response = self.client.get('/api/offers/?fields=id,title,min_price')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'], [{'id': self.offer.id, 'title': "Test Offer", 'min_price': "100.00"}])
+
+        response = self.client.get('/api/offers/?exclude=details,description')
+        self.assertNotIn('details', response.data['results'][0])
+        self.assertIn('min_delivery_time', response.data['results'][0])
+
+        response = self.client.get('/api/offers/?fields=title,details&cursor=')
+        self.assertEqual(len(response.data['results'][0]['details']), 3)
+
+        response = self.client.get('/api/offers/?fields=title,secret')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_offer_detail_list_is_paginated(self):
+        """
+        Tests that the offer detail list is paginated and ordered by id.
+        """
+        self.authenticate_user(self.business_user)
+        response = self.client.get('/api/offerdetails/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 3)
+        self.assertEqual([row['offer_type'] for row in response.data['results']], ["basic", "standard", "premium"])
+
+        response = self.client.get('/api/offerdetails/?page=5')
+        self.assertTrue(response.data['invalid_page'])
+
+    def test_offer_detail_list_streams_ndjson(self):
+        """
+        Tests that the NDJSON export streams every offer detail in chunks.
+        """
+        self.authenticate_user(self.business_user)
+        with patch.object(OfferDetailView, 'stream_chunk_size', 2):
+            response = self.client.get('/api/offerdetails/?stream=ndjson')
+            chunks = list(response.streaming_content)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        self.assertEqual(len(chunks), 2)
+        rows = [json.loads(line) for line in b''.join(chunks).decode().splitlines()]
+        self.assertEqual([row['offer_type'] for row in rows], ["basic", "standard", "premium"])
+        self.assertEqual(rows[0]['price'], "100.00")
+
+    def test_offer_facets(self):
+        """
+        Tests that the facets endpoint counts filtered offers per bucket and lists the top creators.
+        """
+        self.authenticate_user(self.business_user)
+        other = Offer.objects.create(user=self.customer_user, title="Other Offer", description="Another offer")
+        OfferDetail.objects.create(
+            offer=other, title="Basic", revisions=1, delivery_time_in_days=14,
+            price=600, features=["Feature"], offer_type="basic"
+        )
+        other.update_summary()
+
+        with self.assertNumQueries(3):
+            response = self.client.get('/api/offers/facets/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['count'], 2)
+        price_counts = {bucket['from']: bucket['count'] for bucket in response.data['min_price']}
+        self.assertEqual(price_counts[100], 1)
+        self.assertEqual(price_counts[500], 1)
+        delivery_counts = {bucket['from']: bucket['count'] for bucket in response.data['min_delivery_time']}
+        self.assertEqual(delivery_counts[3], 1)
+        self.assertEqual(delivery_counts[14], 1)
+        self.assertEqual(response.data['creator_count'], 2)
+        self.assertEqual(len(response.data['creators']), 2)
+        self.assertEqual(response.data['range']['min_price'], "100.00")
+        self.assertEqual(response.data['range']['max_price'], "600.00")
+
+        response = self.client.get(f'/api/offers/facets/?creator_id={self.business_user.id}&page=3')
+        self.assertEqual(response.data['count'], 1)
+        self.assertEqual(response.data['creators'], [{'creator_id': self.business_user.id, 'count': 1}])
+        response = self.client.get('/api/offers/facets/?search=another')
+        self.assertEqual(response.data['count'], 1)
+        response = self.client.get('/api/offers/facets/?limit=1')
+        self.assertEqual(response.data['creator_count'], 2)
+        self.assertEqual(len(response.data['creators']), 1)
+        response = self.client.get('/api/offers/facets/?limit=0')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/offers/facets/')
+        self.assertEqual(response['X-Cache'], 'HIT')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            other.delete()
+        response = self.client.get('/api/offers/facets/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['count'], 1)
+
+        response = self.client.get('/api/offers/facets/?max_price=abc')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_offer_list_cache_is_invalidated_by_writes(self):
+        """
+        Tests that equivalent list requests share a cache entry until an offer is written.
+        """
+        self.authenticate_user(self.business_user)
+        response = self.client.get('/api/offers/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/offers/?ordering=min_delivery_time&page=1&min_price=')
+        self.assertEqual(response['X-Cache'], 'HIT')
+        self.assertEqual(response.data['results'][0]['title'], "Test Offer")
+
+        response = self.client.get('/api/offers/', secure=True)
+        self.assertEqual(response['X-Cache'], 'MISS')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(f'/api/offers/{self.offer.id}/', {"title": "Renamed Offer"}, format='json')
+        response = self.client.get('/api/offers/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['results'][0]['title'], "Renamed Offer")
+
+    def test_conditional_get_returns_not_modified(self):
+        """
+        Tests that offers, offer details and the offer list answer matching validators with 304.
+        """
+        self.authenticate_user(self.business_user)
+        detail = self.offer.details.first()
+        for url in (f'/api/offers/{self.offer.id}/', f'/api/offerdetails/{detail.id}/', '/api/offers/'):
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            with self.assertNumQueries(1):
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+            self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+            self.assertEqual(response.content, b'')
+
+        etag = self.client.get(f'/api/offerdetails/{detail.id}/')['ETag']
+        self.client.patch(f'/api/offers/{self.offer.id}/', {"details": [{"id": detail.id, "price": 120}]}, format='json')
+        response = self.client.get(f'/api/offerdetails/{detail.id}/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['price'], "120.00")
+
+    def bulk_payload(self, count):
+        """
+        Builds a bulk creation payload with the given number of valid offers.
+        """
+        return [
+            {
+                "title": f"Bulk Offer {i}",
+                "description": "Migrated offer",
+                "details": [
+                    {"title": "Basic", "revisions": 1, "delivery_time_in_days": 3, "price": 100 + i, "features": ["A"], "offer_type": "basic"},
+                    {"title": "Standard", "revisions": 2, "delivery_time_in_days": 5, "price": 200, "features": ["B"], "offer_type": "standard"},
+                    {"title": "Premium", "revisions": -1, "delivery_time_in_days": 7, "price": 300, "features": ["C"], "offer_type": "premium"}
+                ]
+            }
+            for i in range(count)
+        ]
+
+    def test_bulk_create_offers(self):
+        """
+        Tests that a batch of offers is created with its details and summaries in constant queries.
+        """
+        self.authenticate_user(self.business_user)
+        with self.captureOnCommitCallbacks(execute=True), self.assertNumQueries(5):
+            response = self.client.post('/api/offers/bulk/', self.bulk_payload(50), format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['created'], 50)
+        self.assertEqual(OfferDetail.objects.filter(offer_id__in=response.data['ids']).count(), 150)
+        offer = Offer.objects.get(pk=response.data['ids'][7])
+        self.assertEqual((offer.min_price, offer.max_price, offer.min_delivery_time), (107, 300, 3))
+
+        response = self.client.get('/api/offers/?search=migrated')
+        self.assertEqual(response.data['count'], 50)
+
+    def test_bulk_create_reports_item_errors(self):
+        """
+        Tests that an invalid item rejects the whole batch and is reported by index.
+        """
+        self.authenticate_user(self.business_user)
+        payload = self.bulk_payload(3)
+        payload[1]['details'][2]['price'] = "abc"
+        response = self.client.post('/api/offers/bulk/', {"offers": payload}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual([error['index'] for error in response.data['errors']], [1])
+        self.assertEqual(Offer.objects.count(), 1)
+
+    def test_bulk_create_reports_values_beyond_column_limits(self):
+        """
+        Tests that titles and delivery times beyond their column limits are reported per item
+        instead of failing the batch in the database.
+        """
+        self.authenticate_user(self.business_user)
+        payload = self.bulk_payload(4)
+        payload[0]['title'] = "x" * 256
+        payload[1]['details'][0]['delivery_time_in_days'] = 2 ** 31
+        payload[2]['details'][1]['title'] = "y" * 256
+        payload[3]['description'] = ""
+        response = self.client.post('/api/offers/bulk/', payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual([error['index'] for error in response.data['errors']], [0, 1, 2, 3])
+        self.assertEqual(Offer.objects.count(), 1)
@@ -1,6 +1,9 @@
 from django.urls import path
-from .views import OfferAPIView, OfferDetailView
+from .views import OfferAPIView, OfferBulkCreateView, OfferDetailView, OfferFacetView, OfferSuggestView
 urlpatterns = [
     path('', OfferAPIView.as_view(), name='offer-list'),
+    path('bulk/', OfferBulkCreateView.as_view(), name='offer-bulk-create'),
+    path('facets/', OfferFacetView.as_view(), name='offer-facets'),
+    path('suggest/', OfferSuggestView.as_view(), name='offer-suggest'),
     path('<int:pk>/', OfferAPIView.as_view(), name='offer-detail'),
 ]
\ No newline at end of file
@@ -1,3 +1,4 @@
+from decimal import Decimal, InvalidOperation
 from django.http import JsonResponse
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_exempt
@@ -7,11 +8,18 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.authentication import TokenAuthentication
 from rest_framework.pagination import PageNumberPagination
 from rest_framework import status
-from django.db.models import Q
+from django.db import transaction
+from django.db.models import Count, Max, Min, Q
+from django.utils import timezone
 from .models import Offer, OfferDetail
+from .search import get_offer_search
 from .serializers import OfferSerializer, OfferDetailSerializer
-from django.db.models import Min
-from .paginators import CustomPageNumberPagination
+from .paginators import CustomPageNumberPagination, OfferCursorPagination
+from .cache import bump_catalog_version, offer_list_cache
+from coderr_app.cache import canonical_query
+from coderr_app.conditional import add_validators, not_modified_response
+from coderr_app.serializers import parse_fieldset
+from coderr_app.streaming import get_stream_format, streaming_response
 
 class OfferPagination(PageNumberPagination):
     """
@@ -27,6 +35,162 @@ class OfferPagination(PageNumberPagination):
     max_page_size = 100
 
 
+MAX_INTEGER = 2147483647
+MAX_TITLE_LENGTH = 255
+
+
+def clean_detail_data(detail_data, partial=False):
+    """
+    Validates the fields of a single offer detail payload.
+
+    Integers and titles are checked against the limits of their columns, so an invalid value
+    is reported here instead of failing in the database.
+
+    Args:
+        detail_data (dict): The detail payload.
+        partial (bool): Whether only the fields present in the payload are validated,
+            as for a PATCH of an existing detail.
+
+    Returns:
+        tuple: (cleaned, error). cleaned maps the validated fields to their converted
+            values; error is a message string if a value is invalid, else None.
+    """
+    cleaned = {}
+
+    if not partial or 'revisions' in detail_data:
+        try:
+            cleaned['revisions'] = int(detail_data.get('revisions', 0))
+        except (TypeError, ValueError):
+            return None, 'Revisions muss eine Ganzzahl sein.'
+        if cleaned['revisions'] < -1:
+            return None, 'Revisions müssen -1 (unbegrenzt) oder größer sein.'
+        if cleaned['revisions'] > MAX_INTEGER:
+            return None, f'Revisions dürfen höchstens {MAX_INTEGER} sein.'
+
+    if not partial or 'delivery_time_in_days' in detail_data:
+        try:
+            cleaned['delivery_time_in_days'] = int(detail_data.get('delivery_time_in_days', 0))
+        except (TypeError, ValueError):
+            return None, 'Die Lieferzeit muss eine Ganzzahl sein.'
+        if cleaned['delivery_time_in_days'] <= 0:
+            return None, 'Die Lieferzeit muss ein positiver Wert sein.'
+        if cleaned['delivery_time_in_days'] > MAX_INTEGER:
+            return None, f'Die Lieferzeit darf höchstens {MAX_INTEGER} Tage betragen.'
+
+    if not partial or 'features' in detail_data:
+        if not detail_data.get('features', []):
+            return None, 'Jedes Detail muss mindestens ein Feature enthalten.'
+        cleaned['features'] = detail_data.get('features')
+
+    if not partial or 'price' in detail_data:
+        try:
+            price = Decimal(str(detail_data.get('price'))).quantize(Decimal('0.01'))
+        except InvalidOperation:
+            return None, 'Der Preis muss eine gültige Zahl sein.'
+        if not price.is_finite() or price < 0 or price >= Decimal('100000000'):
+            return None, 'Der Preis muss eine gültige, nicht negative Zahl sein.'
+        cleaned['price'] = price
+
+    if not partial or 'title' in detail_data:
+        if detail_data.get('title') is None:
+            return None, 'Jedes Detail muss einen Titel haben.'
+        cleaned['title'] = str(detail_data.get('title'))
+        if len(cleaned['title']) > MAX_TITLE_LENGTH:
+            return None, f'Der Titel eines Details darf höchstens {MAX_TITLE_LENGTH} Zeichen lang sein.'
+
+    if not partial or 'offer_type' in detail_data:
+        if detail_data.get('offer_type') not in dict(OfferDetail.OFFER_TYPES):
+            return None, 'Der Typ muss basic, standard oder premium sein.'
+        cleaned['offer_type'] = detail_data.get('offer_type')
+
+    return cleaned, None
+
+
+def clean_offer_data(data):
+    """
+    Validates the payload of a single offer with its three details without touching the database.
+
+    Missing values and values beyond the column limits are rejected, as they would fail in
+    the database; an empty title or description is accepted as by the single offer creation.
+
+    Args:
+        data (dict): The offer payload with title, description and details.
+
+    Returns:
+        tuple: The offer fields, the list of cleaned detail fields and an error message
+            (None if the payload is valid).
+    """
+    details = data.get('details', [])
+    if not isinstance(details, list) or len(details) != 3:
+        return None, None, 'Es müssen genau drei Details angegeben werden (basic, standard, premium).'
+
+    if not all(isinstance(detail, dict) for detail in details):
+        return None, None, 'Jedes Detail muss ein Objekt sein.'
+
+    offer_types = [detail.get('offer_type') for detail in details]
+    if sorted(offer_types, key=str) != ['basic', 'premium', 'standard']:
+        return None, None, 'Die Details müssen genau die Typen basic, standard und premium enthalten.'
+
+    if data.get('title') is None or data.get('description') is None:
+        return None, None, 'Titel und Beschreibung müssen angegeben werden.'
+    if len(str(data.get('title'))) > MAX_TITLE_LENGTH:
+        return None, None, f'Der Titel darf höchstens {MAX_TITLE_LENGTH} Zeichen lang sein.'
+
+    cleaned_details = []
+    for detail_data in details:
+        cleaned, error = clean_detail_data(detail_data)
+        if error:
+            return None, None, error
+        cleaned_details.append(cleaned)
+
+    offer_data = {'title': str(data.get('title')), 'description': str(data.get('description'))}
+    return offer_data, cleaned_details, None
+
+
+def filter_offers(offers, params):
+    """
+    Applies the offer list filters and the full-text search of the query parameters.
+
+    Price and delivery time filters use the denormalized summary columns on Offer.
+
+    Args:
+        offers (QuerySet): The offers to filter.
+        params (QueryDict): The request query parameters.
+
+    Returns:
+        tuple: (offers, error). error is a message string if a parameter is invalid, else None.
+    """
+    creator_id = params.get('creator_id')
+    if creator_id:
+        offers = offers.filter(user_id=creator_id)
+
+    min_price = params.get('min_price')
+    if min_price:
+        try:
+            offers = offers.filter(min_price__gte=float(min_price))
+        except ValueError:
+            return offers, 'min_price muss eine gültige Zahl sein.'
+
+    max_price = params.get('max_price')
+    if max_price:
+        try:
+            offers = offers.filter(min_price__lte=float(max_price))
+        except ValueError:
+            return offers, 'max_price muss eine gültige Zahl sein.'
+
+    max_delivery_time = params.get('max_delivery_time')
+    if max_delivery_time:
+        try:
+            offers = offers.filter(min_delivery_time__lte=int(max_delivery_time))
+        except ValueError:
+            return offers, 'max_delivery_time muss eine ganze Zahl sein.'
+
+    search = params.get('search')
+    if search:
+        offers = get_offer_search().search(offers, search)
+
+    return offers, None
+
 
 class OfferAPIView(APIView):
     """
@@ -43,102 +207,165 @@ class OfferAPIView(APIView):
         """
         Handles GET requests to retrieve a single offer or a list of offers with optional filtering, searching, and ordering.
 
-        If a primary key (pk) is provided, it attempts to retrieve the corresponding offer
-        annotated with minimum price and delivery time. If not found, returns a 404 response.
+        If a primary key (pk) is provided, it attempts to retrieve the corresponding offer.
+        If not found, returns a 404 response.
 
         If no pk is provided, it retrieves all offers with optional filters and search, such as:
         - Filtering by creator_id, min_price, max_price, and max_delivery_time.
-        - Searching by title or description.
+        - Full-text searching by title and description (ranked, prefix matching).
         - Ordering by specified fields like min_price, max_price, min_delivery_time, and updated_at.
 
+        Passing a `cursor` query parameter (empty for the first page) switches to keyset pagination.
+        `fields` / `exclude` (comma-separated) select a sparse fieldset; only the columns it
+        needs are loaded and the details are only fetched if `details` is selected.
+
+        Price and delivery time filters and orderings use the denormalized summary columns
+        on Offer, so no join over OfferDetail is needed.
+
         Applies pagination to the results and returns a paginated response of serialized offer data.
+        List responses are cached per canonical query string until the next offer write.
+
+        Both forms answer If-None-Match / If-Modified-Since with 304 before running the full
+        query: a single offer is validated by its updated_at, the list by its cache key,
+        which embeds the catalog version.
         """
         if pk:
+            updated_at = Offer.objects.filter(pk=pk).values_list('updated_at', flat=True).first()
+            if updated_at is None:
+                return Response({'error': 'Angebot nicht gefunden'}, status=status.HTTP_404_NOT_FOUND)
+            etag = f'offer-{pk}-{updated_at.timestamp()}'
+            not_modified = not_modified_response(request, etag, updated_at)
+            if not_modified is not None:
+                return not_modified
+
             try:
-                offer = Offer.objects.annotate(
-                    min_price=Min('details__price'),
-                    min_delivery_time=Min('details__delivery_time_in_days')
-                ).get(pk=pk)
+                offer = Offer.objects.defer('search_vector').prefetch_related('details').get(pk=pk)
                 serializer = OfferSerializer(offer)
-                return Response(serializer.data, status=status.HTTP_200_OK)
+                return add_validators(Response(serializer.data, status=status.HTTP_200_OK), etag, updated_at)
             except Offer.DoesNotExist:
                 return Response({'error': 'Angebot nicht gefunden'}, status=status.HTTP_404_NOT_FOUND)
-        else:
-            offers = Offer.objects.annotate(
-                min_price=Min('details__price'),
-                min_delivery_time=Min('details__delivery_time_in_days')
-            )
 
-            creator_id = request.query_params.get('creator_id')
-            if creator_id:
-                offers = offers.filter(user_id=creator_id)
-
-            min_price = request.query_params.get('min_price')
-            if min_price:
-                try:
-                    min_price = float(min_price)
-                    offers = offers.filter(min_price__gte=min_price)
-                except ValueError:
-                    return Response({'error': 'min_price muss eine gültige Zahl sein.'}, status=status.HTTP_400_BAD_REQUEST)
-
-            max_price = request.query_params.get('max_price')
-            if max_price:
-                try:
-                    max_price = float(max_price)
-                    offers = offers.filter(details__price__lte=max_price)
-                except ValueError:
-                    return Response({'error': 'max_price muss eine gültige Zahl sein.'}, status=status.HTTP_400_BAD_REQUEST)
-
-            max_delivery_time = request.query_params.get('max_delivery_time')
-            if max_delivery_time:
-                try:
-                    max_delivery_time = int(max_delivery_time)
-                    offers = offers.filter(min_delivery_time__lte=max_delivery_time)
-                except ValueError:
-                    return Response({'error': 'max_delivery_time muss eine ganze Zahl sein.'}, status=status.HTTP_400_BAD_REQUEST)
-
-            search = request.query_params.get('search')
-            if search:
-                offers = offers.filter(
-                    Q(title__icontains=search) | Q(description__icontains=search)
+        cache_key = self._list_cache_key(request)
+        not_modified = not_modified_response(request, cache_key)
+        if not_modified is not None:
+            return not_modified
+
+        cached = offer_list_cache.get(cache_key)
+        if cached is not None:
+            response = Response(cached, status=status.HTTP_200_OK, headers={'X-Cache': 'HIT'})
+            return add_validators(response, cache_key)
+
+        response = self._get_list(request)
+        if response.status_code == status.HTTP_200_OK:
+            offer_list_cache.set(cache_key, response.data)
+            response['X-Cache'] = 'MISS'
+        return add_validators(response, cache_key)
+
+    def _list_cache_key(self, request):
+        """
+        Returns the cache key of an offer list request. Parameters are canonicalized with
+        the defaults the list applies, so equivalent requests share one entry. The cached
+        pagination links are absolute, so the scheme and host are part of the key.
+        """
+        defaults = {'page': '1'}
+        if not request.query_params.get('search'):
+            defaults['ordering'] = 'min_delivery_time'
+        query = canonical_query(request.query_params, defaults, keep_empty=('cursor',))
+        return offer_list_cache.make_key(request.scheme, request.get_host(), query)
+
+    def _get_list(self, request):
+        """
+        Builds the filtered, ordered and paginated offer list response.
+        """
+        fields, error = parse_fieldset(request.query_params, OfferSerializer)
+        if error:
+            return Response({'error': error}, status=status.HTTP_400_BAD_REQUEST)
+
+        offers, error = filter_offers(Offer.objects.all(), request.query_params)
+        if error:
+            return Response({'error': error}, status=status.HTTP_400_BAD_REQUEST)
+
+        search = request.query_params.get('search')
+
+        ordering = request.query_params.get('ordering')
+        if ordering:
+            ordering_fields = ordering.split(',')
+            valid_fields = {
+                'min_price': 'min_price',
+                '-min_price': '-min_price',
+                'max_price': '-max_price',
+                'min_delivery_time': 'min_delivery_time',
+                '-min_delivery_time': '-min_delivery_time',
+                'updated_at': 'updated_at',
+                '-updated_at': '-updated_at',
+            }
+
+            resolved_ordering = [
+                valid_fields[field] for field in ordering_fields if field in valid_fields
+            ]
+
+            if not resolved_ordering:
+                return Response(
+                    {'error': f'Ungültige Sortierfelder: {ordering_fields}'},
+                    status=status.HTTP_400_BAD_REQUEST
                 )
+        else:
+            resolved_ordering = ['min_delivery_time']
 
-            ordering = request.query_params.get('ordering')
-            if ordering:
-                ordering_fields = ordering.split(',')
-                valid_fields = {
-                    'min_price': 'min_price',
-                    '-min_price': '-min_price',
-                    'max_price': '-details__price',
-                    'min_delivery_time': 'min_delivery_time',
-                    '-min_delivery_time': '-min_delivery_time',
-                    'updated_at': 'updated_at',
-                    '-updated_at': '-updated_at',
-                }
-
-                resolved_ordering = [
-                    valid_fields[field] for field in ordering_fields if field in valid_fields
-                ]
-
-                if resolved_ordering:
-                    offers = offers.order_by(*resolved_ordering)
-                else:
-                    return Response(
-                        {'error': f'Ungültige Sortierfelder: {ordering_fields}'},
-                        status=status.HTTP_400_BAD_REQUEST
-                    )
-            else:
-                offers = offers.order_by('min_delivery_time')
+        offers = self._select_columns(offers, fields, resolved_ordering)
 
-            paginator = self.pagination_class()
-            result_page = paginator.paginate_queryset(offers, request)
+        if 'cursor' in request.query_params:
+            return self._get_cursor_page(request, offers, resolved_ordering, fields)
 
-            if paginator.page is None:
-                return paginator.get_paginated_response([])
+        if search and not ordering:
+            resolved_ordering = ['-search_rank', *resolved_ordering]
 
-            serializer = OfferSerializer(result_page, many=True)
-            return paginator.get_paginated_response(serializer.data)
+        offers = offers.order_by(*resolved_ordering)
+
+        paginator = self.pagination_class()
+        result_page = paginator.paginate_queryset(offers, request)
+
+        if paginator.page is None:
+            return paginator.get_paginated_response([])
+
+        serializer = OfferSerializer(result_page, many=True, fields=fields)
+        return paginator.get_paginated_response(serializer.data)
 
+    @staticmethod
+    def _select_columns(offers, fields, resolved_ordering):
+        """
+        Narrows the offer query to a sparse fieldset.
+
+        Without a fieldset every column but the search vector is loaded and the details are
+        prefetched. With one, only the columns the selected fields and the ordering read are
+        loaded, and the details query is skipped unless `details` is selected.
+        """
+        if fields is None:
+            return offers.defer('search_vector').prefetch_related('details')
+
+        ordering_columns = [field.lstrip('-') for field in resolved_ordering]
+        offers = offers.only(*OfferSerializer.model_columns(fields), *ordering_columns)
+        if 'details' in fields:
+            offers = offers.prefetch_related('details')
+        return offers
+
+    def _get_cursor_page(self, request, offers, resolved_ordering, fields=None):
+        """
+        Returns one keyset-paginated page of offers (opt-in via the `cursor` query parameter).
+
+        Unlike page numbers, this runs no COUNT query and no OFFSET scan, so every page
+        costs the same regardless of its depth. Exactly one ordering field is supported.
+        """
+        if len(resolved_ordering) != 1:
+            return Response(
+                {'error': 'Im Cursor-Modus ist genau ein Sortierfeld erlaubt.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        paginator = OfferCursorPagination()
+        result_page = paginator.paginate_queryset(offers, request, resolved_ordering[0])
+        serializer = OfferSerializer(result_page, many=True, fields=fields)
+        return paginator.get_paginated_response(serializer.data)
 
     def post(self, request):
         """
@@ -154,73 +381,16 @@ class OfferAPIView(APIView):
             )
 
         data = request.data
-        details = data.get('details', [])
-        if len(details) != 3:
-            return Response(
-                {'error': 'Es müssen genau drei Details angegeben werden (basic, standard, premium).'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
+        offer_data, details_data, error = clean_offer_data(data)
+        if error:
+            return Response({'error': error}, status=status.HTTP_400_BAD_REQUEST)
 
-        offer_types = [detail.get('offer_type') for detail in details]
-        if sorted(offer_types) != ['basic', 'premium', 'standard']:
-            return Response(
-                {'error': 'Die Details müssen genau die Typen basic, standard und premium enthalten.'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-
-        offer = Offer.objects.create(
-            user=request.user,
-            title=data.get('title'),
-            description=data.get('description'),
-            image=data.get('image'),
-        )
-
-        created_details = []
-        for detail_data in details:
-            try:
-                revisions = int(detail_data.get('revisions', 0))
-            except ValueError:
-                return Response(
-                    {'error': 'Revisions muss eine Ganzzahl sein.'},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-
-            if revisions < -1:
-                return Response(
-                    {'error': 'Revisions müssen -1 (unbegrenzt) oder größer sein.'},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-
-            try:
-                delivery_time_in_days = int(detail_data.get('delivery_time_in_days', 0))
-            except ValueError:
-                return Response(
-                    {'error': 'Die Lieferzeit muss eine Ganzzahl sein.'},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-
-            if delivery_time_in_days <= 0:
-                return Response(
-                    {'error': 'Die Lieferzeit muss ein positiver Wert sein.'},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-
-            if not detail_data.get('features', []):
-                return Response(
-                    {'error': 'Jedes Detail muss mindestens ein Feature enthalten.'},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-
-            offer_detail = OfferDetail.objects.create(
-                offer=offer,
-                title=detail_data.get('title'),
-                revisions=revisions,
-                delivery_time_in_days=delivery_time_in_days,
-                price=detail_data.get('price'),
-                features=detail_data.get('features'),
-                offer_type=detail_data.get('offer_type'),
-            )
-            created_details.append(offer_detail)
+        with transaction.atomic():
+            offer = Offer.objects.create(user=request.user, image=data.get('image'), **offer_data)
+            created_details = [
+                OfferDetail.objects.create(offer=offer, **detail_data) for detail_data in details_data
+            ]
+            offer.update_summary()
 
         details_serializer = OfferDetailSerializer(created_details, many=True)
 
@@ -277,9 +447,16 @@ class OfferAPIView(APIView):
         Validates that a primary key (pk) is provided and that the offer exists.
         Ensures that the request user is authorized to update the offer.
 
+        The details of the offer are loaded with one query and only the fields that actually
+        changed are written, with a single bulk_update, inside one transaction. If nothing
+        changed, nothing is written and updated_at stays untouched. The number of queries
+        does not depend on the number of details sent. Details without an id are created
+        and must be complete, like the details of a new offer.
+
         Returns:
-            - 400 response if no pk is provided.
-            - 404 response if the offer does not exist.
+            - 400 response if no pk is provided, a detail value is invalid or an offer type
+              would occur twice.
+            - 404 response if the offer or a referenced detail does not exist.
             - 403 response if the user is not authorized to update the offer.
             - 200 response with a success message if the offer is successfully updated.
         """
@@ -290,83 +467,404 @@ class OfferAPIView(APIView):
             )
 
         try:
-            offer = Offer.objects.get(pk=pk)
+            offer = Offer.objects.defer('search_vector').get(pk=pk)
         except Offer.DoesNotExist:
             return Response(
                 {'error': 'Angebot nicht gefunden.'},
                 status=status.HTTP_404_NOT_FOUND
             )
 
-        if offer.user != request.user:
+        if offer.user_id != request.user.id:
             return Response(
                 {'error': 'Nicht autorisiert, dieses Angebot zu bearbeiten.'},
                 status=status.HTTP_403_FORBIDDEN
             )
 
-        offer.title = request.data.get('title', offer.title)
-        offer.description = request.data.get('description', offer.description)
+        changed_fields = []
+        for field in ('title', 'description'):
+            if field in request.data and request.data[field] != getattr(offer, field):
+                setattr(offer, field, request.data[field])
+                changed_fields.append(field)
 
         if 'image' in request.data:
             offer.image = request.data.get('image')
+            changed_fields.append('image')
 
-        offer.save()
-
-        details = request.data.get('details', [])
-        if details:
-            for detail_data in details:
-                detail_id = detail_data.get('id')
-
-                try:
-                    if detail_id:
-                        detail = OfferDetail.objects.get(pk=detail_id, offer=offer)
-                    else:
-                        detail = OfferDetail(offer=offer)
-
-                    detail.title = detail_data.get('title', detail.title)
-                    detail.revisions = int(detail_data.get('revisions', detail.revisions))
-                    detail.delivery_time_in_days = int(detail_data.get('delivery_time_in_days', detail.delivery_time_in_days))
-                    detail.price = detail_data.get('price', detail.price)
-                    detail.features = detail_data.get('features', detail.features)
-                    detail.offer_type = detail_data.get('offer_type', detail.offer_type)
+        details = request.data.get('details') or []
+        existing_details = offer.details.in_bulk() if details else {}
 
-                    detail.save()
-
-                except OfferDetail.DoesNotExist:
+        updated_details, created_details, detail_fields = [], [], set()
+        for detail_data in details:
+            detail_id = detail_data.get('id')
+            if detail_id:
+                detail = existing_details.get(self._parse_id(detail_id))
+                if detail is None:
                     return Response(
                         {'error': f'Angebotsdetail mit ID {detail_id} nicht gefunden.'},
                         status=status.HTTP_404_NOT_FOUND
                     )
-                except ValueError as e:
-                    return Response(
-                        {'error': f'Fehler beim Aktualisieren der Details: {str(e)}'},
-                        status=status.HTTP_400_BAD_REQUEST
-                    )
+            else:
+                detail = OfferDetail(offer=offer)
+
+            changes, error = self._apply_detail_changes(detail, detail_data, partial=bool(detail_id))
+            if error:
+                return Response(
+                    {'error': f'Fehler beim Aktualisieren der Details: {error}'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+            if not detail_id:
+                created_details.append(detail)
+            elif changes:
+                updated_details.append(detail)
+                detail_fields.update(changes)
+
+        offer_types = [detail.offer_type for detail in [*existing_details.values(), *created_details]]
+        if len(offer_types) != len(set(offer_types)):
+            return Response(
+                {'error': 'Jeder Angebotstyp darf nur einmal vorkommen.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        if changed_fields or updated_details or created_details:
+            with transaction.atomic():
+                if updated_details:
+                    OfferDetail.objects.bulk_update(updated_details, sorted(detail_fields))
+                if created_details:
+                    OfferDetail.objects.bulk_create(created_details)
+                if updated_details or created_details:
+                    offer.update_summary(save=False)
+                    changed_fields.extend(Offer.SUMMARY_FIELDS)
+                offer.updated_at = timezone.now()
+                offer.save(update_fields=[*changed_fields, 'updated_at'])
 
         return Response(
             {'message': f'Angebot mit ID {pk} wurde erfolgreich aktualisiert.'},
             status=status.HTTP_200_OK
         )
 
+    @staticmethod
+    def _parse_id(value):
+        """
+        Converts a detail id from the request body to an int (None if it is not numeric).
+        """
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def _apply_detail_changes(detail, detail_data, partial=True):
+        """
+        Validates a detail payload like the offer creation and applies its values to an
+        OfferDetail in memory.
+
+        Args:
+            detail (OfferDetail): The detail to change.
+            detail_data (dict): The detail payload.
+            partial (bool): Whether only the fields present in the payload are validated,
+                as for an existing detail.
+
+        Returns:
+            tuple: (changes, error). changes lists the names of the fields whose value
+                changed; error is a message string if a value is invalid, else None.
+        """
+        cleaned, error = clean_detail_data(detail_data, partial=partial)
+        if error:
+            return None, error
+        changes = []
+        for field, value in cleaned.items():
+            if value != getattr(detail, field):
+                setattr(detail, field, value)
+                changes.append(field)
+        return changes, None
+
+
+class OfferBulkCreateView(APIView):
+    """
+    API endpoint to create many offers at once, e.g. for catalog migrations.
+
+    The whole batch is validated before anything is written; offers and their details
+    are then inserted with bulk_create inside a single transaction.
+    """
+    authentication_classes = [TokenAuthentication]
+    permission_classes = [IsAuthenticated]
+    max_items = 1000
+    batch_size = 500
+
+    def post(self, request):
+        """
+        POST /offers/bulk/
+
+        Accepts a list of offer payloads (same format as POST /offers/, without images),
+        either directly or as {"offers": [...]}. Unlike there, titles and descriptions must
+        not be empty.
+
+        Returns:
+            - 201 response with the ids of the created offers, in request order.
+            - 400 response with per-item errors ({"index": i, "error": ...}); nothing is created.
+            - 403 response if the user is not a business user.
+        """
+        if request.user.type != 'business':
+            return Response(
+                {'error': 'Nur Business-Benutzer dürfen Angebote erstellen.'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+        items = request.data.get('offers') if isinstance(request.data, dict) else request.data
+        if not isinstance(items, list) or not items:
+            return Response(
+                {'error': 'Es muss eine nicht leere Liste von Angeboten angegeben werden.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(items) > self.max_items:
+            return Response(
+                {'error': f'Es dürfen höchstens {self.max_items} Angebote auf einmal erstellt werden.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        cleaned, errors = [], []
+        for index, item in enumerate(items):
+            if not isinstance(item, dict):
+                errors.append({'index': index, 'error': 'Jedes Angebot muss ein Objekt sein.'})
+                continue
+            offer_data, details_data, error = clean_offer_data(item)
+            if not error and not (offer_data['title'] and offer_data['description']):
+                error = 'Titel und Beschreibung dürfen nicht leer sein.'
+            if error:
+                errors.append({'index': index, 'error': error})
+            else:
+                cleaned.append((offer_data, details_data))
+        if errors:
+            return Response({'errors': errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        now = timezone.now()
+        offers = [
+            Offer(
+                user=request.user,
+                created_at=now,
+                updated_at=now,
+                min_price=min(detail['price'] for detail in details_data),
+                max_price=max(detail['price'] for detail in details_data),
+                min_delivery_time=min(detail['delivery_time_in_days'] for detail in details_data),
+                **offer_data,
+            )
+            for offer_data, details_data in cleaned
+        ]
+        with transaction.atomic():
+            Offer.objects.bulk_create(offers, batch_size=self.batch_size)
+            OfferDetail.objects.bulk_create(
+                [
+                    OfferDetail(offer=offer, **detail_data)
+                    for offer, (offer_data, details_data) in zip(offers, cleaned)
+                    for detail_data in details_data
+                ],
+                batch_size=self.batch_size,
+            )
+            offer_ids = [offer.pk for offer in offers]
+            get_offer_search().refresh(Offer.objects.filter(pk__in=offer_ids))
+            bump_catalog_version()
+
+        return Response({'created': len(offer_ids), 'ids': offer_ids}, status=status.HTTP_201_CREATED)
+
+
+class OfferSuggestView(APIView):
+    """
+    API endpoint for offer title autocompletion.
+
+    Returns only the ids and titles of offers whose title starts with the query,
+    served by a prefix index instead of the full offer list query.
+    """
+    authentication_classes = [TokenAuthentication]
+    permission_classes = [IsAuthenticated]
+    default_limit = 10
+    max_limit = 25
+
+    def get(self, request):
+        """
+        GET /offers/suggest/?q=<prefix>&limit=<n>
+
+        Returns up to `limit` offers whose title starts with `q` (case-insensitive),
+        ordered by title. An empty query returns an empty list.
+        """
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response([], status=status.HTTP_200_OK)
+
+        try:
+            limit = int(request.query_params.get('limit', self.default_limit))
+        except ValueError:
+            return Response({'error': 'limit muss eine ganze Zahl sein.'}, status=status.HTTP_400_BAD_REQUEST)
+        limit = max(1, min(limit, self.max_limit))
+
+        suggestions = Offer.objects.filter(title__istartswith=query).order_by('title', 'id').values('id', 'title')[:limit]
+        return Response(list(suggestions), status=status.HTTP_200_OK)
+
+
+class OfferFacetView(APIView):
+    """
+    API endpoint returning facet counts for the offer filter UI.
+
+    Attributes:
+        filter_params (tuple): The query parameters that affect the facets.
+        price_edges (tuple): The lower bounds of the min_price buckets.
+        delivery_edges (tuple): The lower bounds of the min_delivery_time buckets.
+        default_creator_limit (int): The number of creators listed without `limit`.
+        max_creator_limit (int): The largest accepted `limit`.
+    """
+    authentication_classes = [TokenAuthentication]
+    permission_classes = [IsAuthenticated]
+    filter_params = ('creator_id', 'min_price', 'max_price', 'max_delivery_time', 'search')
+    price_edges = (0, 50, 100, 250, 500, 1000)
+    delivery_edges = (1, 3, 7, 14, 30)
+    default_creator_limit = 10
+    max_creator_limit = 100
+
+    def get(self, request):
+        """
+        GET /offers/facets/
+
+        Takes the same filters as the offer list and returns bucketed counts of min_price
+        and min_delivery_time, the overall price and delivery time range, the number of
+        creators and the offer counts of the `limit` creators with the most offers
+        (default 10, at most 100). Buckets are half-open ranges [from, to); the last one has
+        no upper bound. Offers without details fall into no bucket.
+
+        The buckets and ranges come from one aggregate query, the creators from one grouped
+        query limited to the top creators. Results are cached per filter combination and
+        limit until the next offer write.
+
+        Returns:
+            - 400 response if a filter parameter or the limit is invalid.
+            - 200 response with the facets.
+        """
+        limit, error = self._parse_limit(request.query_params.get('limit'))
+        if error:
+            return Response({'error': error}, status=status.HTTP_400_BAD_REQUEST)
+
+        params = {name: request.query_params.get(name) for name in self.filter_params}
+        params['limit'] = str(limit)
+        cache_key = offer_list_cache.make_key('facets', canonical_query(params))
+        not_modified = not_modified_response(request, cache_key)
+        if not_modified is not None:
+            return not_modified
+
+        cached = offer_list_cache.get(cache_key)
+        if cached is not None:
+            response = Response(cached, status=status.HTTP_200_OK, headers={'X-Cache': 'HIT'})
+            return add_validators(response, cache_key)
+
+        offers, error = filter_offers(Offer.objects.all(), request.query_params)
+        if error:
+            return Response({'error': error}, status=status.HTTP_400_BAD_REQUEST)
+
+        price_buckets = self._buckets('min_price', self.price_edges)
+        delivery_buckets = self._buckets('min_delivery_time', self.delivery_edges)
+        totals = offers.order_by().aggregate(
+            offer_count=Count('id'),
+            creator_count=Count('user_id', distinct=True),
+            lowest_price=Min('min_price'),
+            highest_price=Max('max_price'),
+            fastest_delivery=Min('min_delivery_time'),
+            slowest_delivery=Max('min_delivery_time'),
+            **{alias: Count('id', filter=condition) for alias, _, condition in price_buckets + delivery_buckets},
+        )
+        creators = offers.order_by().values('user_id').annotate(offer_count=Count('id')).order_by(
+            '-offer_count', 'user_id'
+        )[:limit]
+
+        data = self._build_facets(totals, list(creators), price_buckets, delivery_buckets)
+        offer_list_cache.set(cache_key, data)
+        response = Response(data, status=status.HTTP_200_OK, headers={'X-Cache': 'MISS'})
+        return add_validators(response, cache_key)
+
+    def _parse_limit(self, value):
+        """
+        Parses the number of creators to list.
+
+        Returns:
+            tuple: (limit, error). error is a message string if the value is invalid, else None.
+        """
+        if not value:
+            return self.default_creator_limit, None
+        try:
+            limit = int(value)
+        except ValueError:
+            return None, 'limit muss eine Ganzzahl sein.'
+        if not 1 <= limit <= self.max_creator_limit:
+            return None, f'limit muss zwischen 1 und {self.max_creator_limit} liegen.'
+        return limit, None
+
+    @staticmethod
+    def _buckets(field, edges):
+        """
+        Returns (alias, (from, to), condition) for each bucket of a field.
+        """
+        buckets = []
+        for index, lower in enumerate(edges):
+            upper = edges[index + 1] if index + 1 < len(edges) else None
+            condition = Q(**{f'{field}__gte': lower})
+            if upper is not None:
+                condition &= Q(**{f'{field}__lt': upper})
+            buckets.append((f'{field}_bucket_{index}', (lower, upper), condition))
+        return buckets
+
+    @staticmethod
+    def _build_facets(totals, creators, price_buckets, delivery_buckets):
+        """
+        Shapes the aggregate totals and the top creators into the facet response.
+        """
+        def bucket_counts(buckets):
+            return [
+                {'from': lower, 'to': upper, 'count': totals[alias]}
+                for alias, (lower, upper), _ in buckets
+            ]
+
+        lowest_price = totals['lowest_price']
+        highest_price = totals['highest_price']
+        return {
+            'count': totals['offer_count'],
+            'min_price': bucket_counts(price_buckets),
+            'min_delivery_time': bucket_counts(delivery_buckets),
+            'creator_count': totals['creator_count'],
+            'creators': [{'creator_id': row['user_id'], 'count': row['offer_count']} for row in creators],
+            'range': {
+                'min_price': f'{lowest_price:.2f}' if lowest_price is not None else None,
+                'max_price': f'{highest_price:.2f}' if highest_price is not None else None,
+                'min_delivery_time': totals['fastest_delivery'],
+                'max_delivery_time': totals['slowest_delivery'],
+            },
+        }
+
 
 class OfferDetailView(APIView):
     """
     API endpoint to manage offer details.
 
-    Supports retrieving a single offer detail or a list of all offer details.
+    Supports retrieving a single offer detail or a paginated list of all offer details.
+
+    Attributes:
+        pagination_class (type): The paginator used for the list.
+        stream_chunk_size (int): Rows fetched per round trip when streaming the list.
     """
 
     authentication_classes = [TokenAuthentication]
     permission_classes = [IsAuthenticated]
+    pagination_class = CustomPageNumberPagination
+    stream_chunk_size = 500
 
     def get(self, request, pk=None):
         """
         GET /offers/<int:pk>/
 
-        Returns a single offer detail with the given ID.
+        Returns a single offer detail with the given ID. Answers conditional requests with 304
+        while the parent offer's updated_at is unchanged.
 
-        GET /offers/
+        GET /offerdetails/
 
-        Returns a list of all offer details.
+        Returns a paginated list of all offer details, ordered by ID. With `?stream=json` or
+        `?stream=ndjson` the whole table is streamed instead, read through a server-side
+        cursor in chunks, so exports run in constant memory.
 
         Parameters:
         pk (int): The ID of the offer detail to retrieve.
@@ -375,13 +873,38 @@ class OfferDetailView(APIView):
         Response: A JSON response containing the serialized offer detail or a list of offer details.
         """
         if pk:
+            updated_at = OfferDetail.objects.filter(pk=pk).values_list('offer__updated_at', flat=True).first()
+            if updated_at is None:
+                return Response({'error': 'Angebotsdetail nicht gefunden'}, status=status.HTTP_404_NOT_FOUND)
+            etag = f'offerdetail-{pk}-{updated_at.timestamp()}'
+            not_modified = not_modified_response(request, etag, updated_at)
+            if not_modified is not None:
+                return not_modified
+
             try:
                 detail = OfferDetail.objects.get(pk=pk)
                 serializer = OfferDetailSerializer(detail)
-                return Response(serializer.data, status=status.HTTP_200_OK)
+                return add_validators(Response(serializer.data, status=status.HTTP_200_OK), etag, updated_at)
             except OfferDetail.DoesNotExist:
                 return Response({'error': 'Angebotsdetail nicht gefunden'}, status=status.HTTP_404_NOT_FOUND)
         else:
-            details = OfferDetail.objects.all()
-            serializer = OfferDetailSerializer(details, many=True)
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            stream_format, error = get_stream_format(request.query_params)
+            if error:
+                return Response({'error': error}, status=status.HTTP_400_BAD_REQUEST)
+
+            details = OfferDetail.objects.order_by('id')
+            if stream_format:
+                return streaming_response(
+                    details,
+                    lambda rows: OfferDetailSerializer(rows, many=True).data,
+                    stream_format,
+                    self.stream_chunk_size,
+                )
+
+            paginator = self.pagination_class()
+            result_page = paginator.paginate_queryset(details, request)
+            if paginator.page is None:
+                return paginator.get_paginated_response([])
+
+            serializer = OfferDetailSerializer(result_page, many=True)
+            return paginator.get_paginated_response(serializer.data)
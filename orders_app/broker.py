@@ -0,0 +1,213 @@
+import asyncio
+import json
+import logging
+import select
+import threading
+import time
+from collections import defaultdict
+from django.conf import settings
+from django.db import connection, connections, transaction
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+class Subscription:
+    """
+    The events delivered to one connected client.
+
+    Events are put from any thread and read on the event loop that created the
+    subscription. If the client falls behind by more than `max_pending` events, the
+    subscription is marked as overflowed and further events are dropped; the stream then
+    ends and the client reconnects with its last event ID, replaying from the outbox.
+
+    Attributes:
+        user_id (int): The user the events are for.
+        overflowed (bool): Whether events were dropped.
+    """
+    max_pending = 1000
+
+    def __init__(self, user_id):
+        self.user_id = user_id
+        self.overflowed = False
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(maxsize=self.max_pending)
+
+    def put(self, event):
+        """
+        Queues an event for the client. Safe to call from any thread.
+        """
+        try:
+            self._loop.call_soon_threadsafe(self._put, event)
+        except RuntimeError:
+            # The event loop of the stream has already been closed.
+            pass
+
+    async def get(self):
+        """
+        Waits for the next event.
+        """
+        return await self._queue.get()
+
+    def _put(self, event):
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+
+class LocalBroker:
+    """
+    In-process publish/subscribe of order events.
+
+    Every published event is delivered to the subscriptions of its customer and its business
+    user in this process. Suitable for a single worker and for tests; with several workers
+    use a broker that shares events between processes, such as PostgresBroker.
+    """
+
+    def __init__(self):
+        self._subscriptions = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def subscribe(self, user_id):
+        """
+        Starts receiving the events of a user. Must be called on the event loop of the stream.
+
+        Returns:
+            Subscription: The subscription to read the events from.
+        """
+        subscription = Subscription(user_id)
+        with self._lock:
+            self._subscriptions[user_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        """
+        Stops delivering events to a subscription.
+        """
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.user_id)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[subscription.user_id]
+
+    def publish(self, event):
+        """
+        Publishes a serialized order event.
+
+        Args:
+            event (dict): The event as returned by OrderEventSerializer.
+        """
+        self.deliver(event)
+
+    def deliver(self, event):
+        """
+        Delivers an event to the subscriptions of its users in this process.
+        """
+        with self._lock:
+            subscriptions = [
+                subscription
+                for user_id in {event['customer_user'], event['business_user']}
+                for subscription in self._subscriptions.get(user_id, ())
+            ]
+        for subscription in subscriptions:
+            subscription.put(event)
+
+
+class PostgresBroker(LocalBroker):
+    """
+    Broker that shares order events between workers through Postgres LISTEN/NOTIFY.
+
+    Events are published with pg_notify on the channel `ORDER_EVENT_CHANNEL`. Each process
+    runs one listener thread on its own connection, started with the first subscription,
+    which delivers the notifications to the local subscriptions.
+    """
+    channel = 'order_events'
+    reconnect_delay = 5
+
+    def __init__(self):
+        super().__init__()
+        self.channel = getattr(settings, 'ORDER_EVENT_CHANNEL', self.channel)
+        self._listener = None
+
+    def subscribe(self, user_id):
+        """
+        Starts receiving the events of a user, starting the listener thread if needed.
+        """
+        with self._lock:
+            if self._listener is None:
+                self._listener = threading.Thread(target=self._listen, name='order-events-listener', daemon=True)
+                self._listener.start()
+        return super().subscribe(user_id)
+
+    def publish(self, event):
+        """
+        Sends an event to the listeners of all workers, including this one.
+        """
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT pg_notify(%s, %s)', [self.channel, json.dumps(event)])
+
+    def _listen(self):
+        while True:
+            try:
+                self._listen_once()
+            except Exception:
+                logger.exception('LISTEN %s unterbrochen, neuer Versuch.', self.channel)
+                time.sleep(self.reconnect_delay)
+
+    def _listen_once(self):
+        database = connections['default']
+        listener = database.get_new_connection(database.get_connection_params())
+        try:
+            listener.autocommit = True
+            with listener.cursor() as cursor:
+                cursor.execute(f'LISTEN "{self.channel}"')
+            while True:
+                if select.select([listener], [], [], self.reconnect_delay) == ([], [], []):
+                    continue
+                listener.poll()
+                while listener.notifies:
+                    notification = listener.notifies.pop(0)
+                    self.deliver(json.loads(notification.payload))
+        finally:
+            listener.close()
+
+
+def get_broker():
+    """
+    Returns the broker configured by `ORDER_EVENT_BROKER`, creating it on first use.
+    """
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                _broker = import_string(getattr(settings, 'ORDER_EVENT_BROKER', 'orders_app.broker.LocalBroker'))()
+    return _broker
+
+
+def publish_on_commit(events):
+    """
+    Publishes order events to the broker once the current transaction commits.
+
+    Events of a rolled-back transaction are never published.
+
+    Args:
+        events (list): The OrderEvent instances.
+    """
+    from .serializers import OrderEventSerializer
+
+    payloads = [dict(payload) for payload in OrderEventSerializer(events, many=True).data]
+
+    def publish():
+        broker = get_broker()
+        for payload in payloads:
+            try:
+                broker.publish(payload)
+            except Exception:
+                logger.exception('Bestellereignis %s nicht veröffentlicht.', payload['id'])
+
+    transaction.on_commit(publish)
@@ -0,0 +1,38 @@
+from coderr_app.cache import VersionedResponseCache, bump_cache_version, get_cache_versions
+
+
+ORDER_STATS = 'order_stats'
+
+order_stats_cache = VersionedResponseCache(ORDER_STATS)
+
+
+def stats_group(business_user_id):
+    """
+    Returns the name of the cache group holding the order statistics of one business user.
+    """
+    return f'{ORDER_STATS}:{business_user_id}'
+
+
+def stats_cache_keys(business_user_ids):
+    """
+    Returns the cache key of the order statistics of each business user.
+
+    Every business user has its own cache version, so an order write only invalidates
+    the statistics of the business it belongs to. All versions are read with one query.
+
+    Args:
+        business_user_ids (list): The IDs of the business users.
+
+    Returns:
+        dict: Maps each business user ID to its cache key.
+    """
+    versions = get_cache_versions(stats_group(pk) for pk in business_user_ids)
+    return {pk: f'{stats_group(pk)}:{versions[stats_group(pk)]}' for pk in business_user_ids}
+
+
+def bump_order_stats_version(*business_user_ids):
+    """
+    Invalidates the cached order statistics of the given business users.
+    Called on every order write and by bulk updates that bypass the Order signals.
+    """
+    bump_cache_version(*(stats_group(pk) for pk in business_user_ids))
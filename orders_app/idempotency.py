@@ -0,0 +1,115 @@
+import hashlib
+import json
+from datetime import timedelta
+from django.conf import settings
+from django.core.cache import caches
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+from .models import IdempotencyKey
+
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+MAX_KEY_LENGTH = 255
+
+
+def idempotent_response(request, handler):
+    """
+    Runs a request handler at most once per user and `Idempotency-Key` header.
+
+    Requests without the header are handled normally. The first request with a key claims
+    it by inserting an IdempotencyKey row in the transaction that runs the handler, and
+    stores the response there. A concurrent request with the same key blocks on the unique
+    constraint until the first one commits, then replays the stored response; if the first
+    one fails, the key is released and the waiting request runs the handler itself.
+
+    Stored responses are kept in the default cache for IDEMPOTENCY_KEY_TTL seconds, so
+    replays are usually answered without a database query.
+
+    Args:
+        request (Request): The request sent by the client.
+        handler (callable): Returns the response of the request.
+
+    Returns:
+        Response: The response of the handler, a replay of the stored response, a 400 error
+            response for an invalid key or a 422 error response if the key was used for
+            another request.
+    """
+    key = request.headers.get(IDEMPOTENCY_HEADER)
+    if key is None:
+        return handler()
+    if not key or len(key) > MAX_KEY_LENGTH:
+        return Response(
+            {'error': f'{IDEMPOTENCY_HEADER} muss zwischen 1 und {MAX_KEY_LENGTH} Zeichen lang sein.'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    fingerprint = request_fingerprint(request)
+    cache_key = _cache_key(request.user.pk, key)
+    stored = _store().get(cache_key)
+    if stored is None:
+        with transaction.atomic():
+            record = _claim(request.user, key, fingerprint)
+            if record.status_code is None:
+                response = handler()
+                record.status_code = response.status_code
+                record.response_body = response.data
+                record.save(update_fields=['status_code', 'response_body'])
+                stored = (fingerprint, response.status_code, response.data)
+                transaction.on_commit(lambda: _store().set(cache_key, stored, _ttl()))
+                return response
+        stored = (record.fingerprint, record.status_code, record.response_body)
+        _store().set(cache_key, stored, _ttl())
+
+    return _replay(stored, fingerprint)
+
+
+def request_fingerprint(request):
+    """
+    Returns a hash of the method, path and body of a request.
+    """
+    body = json.dumps(request.data, sort_keys=True, default=str)
+    return hashlib.sha256(f'{request.method} {request.path} {body}'.encode('utf-8')).hexdigest()
+
+
+def _claim(user, key, fingerprint):
+    """
+    Inserts the IdempotencyKey row of a request, or returns the row already stored for the key.
+
+    An expired row is deleted and claimed again.
+    """
+    cutoff = timezone.now() - timedelta(seconds=_ttl())
+    while True:
+        try:
+            with transaction.atomic():
+                return IdempotencyKey.objects.create(user=user, key=key, fingerprint=fingerprint)
+        except IntegrityError:
+            record = IdempotencyKey.objects.filter(user=user, key=key).first()
+            if record is None:
+                continue
+            if record.created_at < cutoff:
+                record.delete()
+                continue
+            return record
+
+
+def _replay(stored, fingerprint):
+    stored_fingerprint, status_code, data = stored
+    if stored_fingerprint != fingerprint:
+        return Response(
+            {'error': f'Der {IDEMPOTENCY_HEADER} wurde bereits für eine andere Anfrage verwendet.'},
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY
+        )
+    return Response(data, status=status_code, headers={'Idempotent-Replayed': 'true'})
+
+
+def _cache_key(user_id, key):
+    return f"idempotency:{user_id}:{hashlib.sha256(key.encode('utf-8')).hexdigest()}"
+
+
+def _store():
+    return caches['default']
+
+
+def _ttl():
+    return settings.IDEMPOTENCY_KEY_TTL
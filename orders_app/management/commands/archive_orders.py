@@ -0,0 +1,44 @@
+from datetime import timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from orders_app.models import ArchivedOrder, Order
+
+
+class Command(BaseCommand):
+    """
+    Management command to move finished orders into the ArchivedOrder table.
+
+    Completed and cancelled orders not updated for `--older-than-days` are moved in batches.
+    Each batch copies and deletes its orders in one short transaction, locking only the rows
+    of the batch and skipping rows locked by running requests. The delete bypasses the Order
+    signals on purpose: archived orders keep counting in the status counters and statistics,
+    and archiving does not create order events.
+    """
+    help = 'Moves finished orders older than the given age into the archive table.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--older-than-days', type=int, default=settings.ORDER_ARCHIVE_AFTER_DAYS,
+            help='Minimum number of days since the last update of an order.'
+        )
+        parser.add_argument('--batch-size', type=int, default=500, help='Number of orders moved per transaction.')
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options['older_than_days'])
+        archived = 0
+        while True:
+            with transaction.atomic():
+                orders = list(
+                    Order.objects.select_for_update(skip_locked=True)
+                    .filter(status__in=ArchivedOrder.FINISHED_STATUSES, updated_at__lt=cutoff)
+                    .order_by('updated_at', 'id')[:options['batch_size']]
+                )
+                if not orders:
+                    break
+                ArchivedOrder.objects.bulk_create([ArchivedOrder.from_order(order) for order in orders])
+                batch = Order.objects.filter(pk__in=[order.pk for order in orders])
+                batch._raw_delete(batch.db)
+                archived += len(orders)
+        self.stdout.write(self.style.SUCCESS(f'{archived} Bestellungen archiviert.'))
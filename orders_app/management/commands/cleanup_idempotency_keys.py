@@ -0,0 +1,31 @@
+from datetime import timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from orders_app.models import IdempotencyKey
+
+
+class Command(BaseCommand):
+    """
+    Management command to delete idempotency keys older than IDEMPOTENCY_KEY_TTL.
+
+    Deletes in batches so the table is never locked for long.
+    """
+    help = 'Deletes expired idempotency keys.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Number of keys deleted per query.')
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL)
+        removed = 0
+        while True:
+            batch = list(
+                IdempotencyKey.objects.filter(created_at__lt=cutoff)
+                .order_by('created_at')
+                .values_list('pk', flat=True)[:options['batch_size']]
+            )
+            if not batch:
+                break
+            removed += IdempotencyKey.objects.filter(pk__in=batch).delete()[0]
+        self.stdout.write(self.style.SUCCESS(f'{removed} Idempotency-Keys gelöscht.'))
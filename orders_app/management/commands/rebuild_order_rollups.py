@@ -0,0 +1,110 @@
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Count, Min, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from orders_app.models import ArchivedOrder, Order, OrderDailyRollup
+
+
+class Command(BaseCommand):
+    """
+    Management command to recompute the daily order rollups of a range of days from the orders.
+
+    Days are rebuilt in chunks, each in one transaction. On PostgreSQL the rollup table is
+    locked against writes first (SHARE ROW EXCLUSIVE): order writes that already changed a
+    rollup are waited for, so their orders are counted, and those that come later wait and
+    apply their change on top of the rebuilt values, including to rows the rebuild creates.
+    Readers are not blocked. Orders and archived orders are aggregated with one query per chunk.
+    """
+    help = 'Recomputes the OrderDailyRollup rows of a range of days from the orders.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--from', dest='start', help='First day (YYYY-MM-DD). Defaults to the day of the oldest order.')
+        parser.add_argument('--to', dest='end', help='Last day (YYYY-MM-DD). Defaults to today.')
+        parser.add_argument('--days-per-batch', type=int, default=31, help='Number of days rebuilt per transaction.')
+
+    def handle(self, *args, **options):
+        start, end = self._range(options)
+        if start is None:
+            self.stdout.write(self.style.SUCCESS('Keine Bestellungen vorhanden.'))
+            return
+
+        changed = 0
+        chunk_start = start
+        while chunk_start <= end:
+            chunk_end = min(chunk_start + timedelta(days=options['days_per_batch'] - 1), end)
+            with transaction.atomic():
+                changed += self._rebuild(chunk_start, chunk_end)
+            chunk_start = chunk_end + timedelta(days=1)
+        self.stdout.write(self.style.SUCCESS(f'{changed} Tageswerte von {start} bis {end} neu berechnet.'))
+
+    def _range(self, options):
+        try:
+            start = parse_date(options['start']) if options['start'] else None
+            end = parse_date(options['end']) if options['end'] else timezone.localdate()
+        except ValueError:
+            start = end = None
+        if (options['start'] and start is None) or end is None:
+            raise CommandError('--from und --to müssen Daten im Format YYYY-MM-DD sein.')
+        if start is None:
+            oldest = [model.objects.aggregate(oldest=Min('created_at'))['oldest'] for model in (Order, ArchivedOrder)]
+            oldest = [moment for moment in oldest if moment is not None]
+            if not oldest:
+                return None, end
+            start = timezone.localdate(min(oldest))
+        if start > end:
+            raise CommandError('--from darf nicht nach --to liegen.')
+        return start, end
+
+    def _rebuild(self, start, end):
+        """
+        Rebuilds the rollups of the days from start to end and returns the number of rows written or removed.
+        """
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f'LOCK TABLE {connection.ops.quote_name(OrderDailyRollup._meta.db_table)} IN SHARE ROW EXCLUSIVE MODE'
+                )
+        existing = {
+            (rollup.business_user_id, rollup.day, rollup.status): rollup
+            for rollup in OrderDailyRollup.objects.select_for_update().filter(day__range=(start, end))
+        }
+
+        lower = timezone.make_aware(datetime.combine(start, time.min))
+        upper = timezone.make_aware(datetime.combine(end + timedelta(days=1), time.min))
+        live, archived = (
+            model.objects.filter(created_at__gte=lower, created_at__lt=upper)
+            .annotate(day=TruncDate('created_at', tzinfo=timezone.get_current_timezone()))
+            .order_by()
+            .values('business_user_id', 'day', 'status')
+            .annotate(order_count=Count('id'), revenue=Sum('price'), delivery_days=Sum('delivery_time_in_days'))
+            for model in (Order, ArchivedOrder)
+        )
+        totals = defaultdict(lambda: {'order_count': 0, 'revenue': 0, 'delivery_days': 0})
+        for row in live.union(archived, all=True):
+            total = totals[(row['business_user_id'], row['day'], row['status'])]
+            for name in total:
+                total[name] += row[name]
+
+        rebuilt = [
+            OrderDailyRollup(business_user_id=business_user_id, day=day, status=order_status, **total)
+            for (business_user_id, day, order_status), total in totals.items()
+        ]
+        changed = [
+            rollup for rollup in rebuilt
+            if (rollup.business_user_id, rollup.day, rollup.status) not in existing
+            or any(
+                getattr(existing[(rollup.business_user_id, rollup.day, rollup.status)], name) != getattr(rollup, name)
+                for name in ('order_count', 'revenue', 'delivery_days')
+            )
+        ]
+        OrderDailyRollup.objects.bulk_create(
+            changed, update_conflicts=True,
+            unique_fields=['business_user', 'day', 'status'], update_fields=['order_count', 'revenue', 'delivery_days'],
+        )
+        stale = [rollup.pk for key, rollup in existing.items() if key not in totals]
+        OrderDailyRollup.objects.filter(pk__in=stale).delete()
+        return len(changed) + len(stale)
@@ -0,0 +1,54 @@
+from collections import Counter
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+from orders_app.models import ArchivedOrder, Order, OrderStatusCount
+
+
+class Command(BaseCommand):
+    """
+    Management command to compare the order status counters with the orders and repair drift.
+
+    Archived orders are counted along with the orders in the Order table.
+
+    Each business user is reconciled in its own transaction with its counter rows locked, so
+    order writes running concurrently wait for the repair instead of being overwritten by it.
+    """
+    help = 'Compares the OrderStatusCount counters with the orders and repairs differences.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Only report differences.')
+
+    def handle(self, *args, **options):
+        business_user_ids = sorted(
+            set(Order.objects.values_list('business_user_id', flat=True).distinct())
+            | set(ArchivedOrder.objects.values_list('business_user_id', flat=True).distinct())
+            | set(OrderStatusCount.objects.values_list('business_user_id', flat=True).distinct())
+        )
+        drifted = 0
+        for business_user_id in business_user_ids:
+            with transaction.atomic():
+                counters = {
+                    counter.status: counter
+                    for counter in OrderStatusCount.objects.select_for_update().filter(business_user_id=business_user_id)
+                }
+                actual = Counter()
+                for model in (Order, ArchivedOrder):
+                    actual.update(dict(
+                        model.objects.filter(business_user_id=business_user_id).order_by()
+                        .values_list('status').annotate(total=Count('id'))
+                    ))
+                for order_status in set(counters) | set(actual):
+                    stored = counters[order_status].count if order_status in counters else 0
+                    expected = actual.get(order_status, 0)
+                    if stored == expected:
+                        continue
+                    drifted += 1
+                    self.stdout.write(f'Benutzer {business_user_id}, {order_status}: {stored} gespeichert, {expected} tatsächlich.')
+                    if not options['dry_run']:
+                        OrderStatusCount.objects.update_or_create(
+                            business_user_id=business_user_id, status=order_status, defaults={'count': expected}
+                        )
+
+        action = 'gefunden' if options['dry_run'] else 'korrigiert'
+        self.stdout.write(self.style.SUCCESS(f'{drifted} Abweichungen {action}.'))
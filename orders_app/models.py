@@ -1,5 +1,80 @@
-from django.db import models
+import logging
+from collections import Counter, defaultdict
+from decimal import Decimal
+from django.db import IntegrityError, connections, models, transaction
+from django.db.models import F, Q, Sum
+from django.utils import timezone
 from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from .broker import publish_on_commit
+from .cache import bump_order_stats_version
+
+logger = logging.getLogger(__name__)
+
+class OrderQuerySet(models.QuerySet):
+    """
+    QuerySet for orders.
+    """
+
+    def transition_status(self, new_status, versions):
+        """
+        Moves orders to a new status with one UPDATE, if they still have the expected versions.
+
+        The orders of this queryset whose (id, version) match are locked in id order; all of
+        them are then updated by a single `UPDATE ... WHERE id IN (...)` that also increments
+        their versions. Orders that changed in the meantime are left alone. QuerySet.update()
+        bypasses the Order signals, so the order events, the status counters, the daily rollups
+        and the cached order statistics are written here, in the same order as the signals do.
+        Must run in a transaction.
+
+        Args:
+            new_status (str): The new order status.
+            versions (dict): Maps order IDs to the versions the client last saw.
+
+        Returns:
+            list: The IDs of the updated orders.
+        """
+        if not versions:
+            return []
+        condition = Q()
+        for pk, version in versions.items():
+            condition |= Q(pk=pk, version=version)
+        matched = list(
+            self.select_for_update().filter(condition).order_by('pk')
+            .values('pk', 'customer_user_id', 'business_user_id', 'status', 'version',
+                    'created_at', 'price', 'delivery_time_in_days')
+        )
+        if not matched:
+            return []
+
+        updated_ids = [row['pk'] for row in matched]
+        self.model.objects.filter(pk__in=updated_ids).update(
+            status=new_status, version=F('version') + 1, updated_at=timezone.now()
+        )
+
+        changed = [row for row in matched if row['status'] != new_status]
+        publish_on_commit(OrderEvent.objects.append([
+            OrderEvent(
+                order_id=row['pk'], customer_user_id=row['customer_user_id'],
+                business_user_id=row['business_user_id'], event_type=OrderEvent.STATUS_CHANGED,
+                status=new_status, previous_status=row['status'], version=row['version'] + 1,
+            )
+            for row in changed
+        ]))
+
+        deltas = Counter()
+        for row in changed:
+            deltas[(row['business_user_id'], row['status'])] -= 1
+            deltas[(row['business_user_id'], new_status)] += 1
+        OrderStatusCount.objects.adjust_many(deltas)
+        OrderDailyRollup.objects.add_many(
+            (row['business_user_id'], row['created_at'], order_status,
+             row['price'], row['delivery_time_in_days'], sign)
+            for row in changed
+            for order_status, sign in ((row['status'], -1), (new_status, 1))
+        )
+        bump_order_stats_version(*{row['business_user_id'] for row in matched})
+        return updated_ids
 
 
 class Order(models.Model):
@@ -18,6 +93,7 @@ class Order(models.Model):
         status (str): The current status of the order ('in_progress', 'completed', 'cancelled').
         created_at (datetime): The timestamp when the order was created.
         updated_at (datetime): The timestamp when the order was last updated.
+        version (int): Incremented on every update, for optimistic concurrency control.
     """
 
     STATUS_CHOICES = [
@@ -41,6 +117,29 @@ class Order(models.Model):
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='in_progress')
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    version = models.PositiveIntegerField(default=1)
+
+    objects = OrderQuerySet.as_manager()
+
+    class Meta:
+        """
+        Metadata for the Order model.
+
+        The order list is a union of the customer side and the business side, each filtered
+        by its user and ordered by created_at or updated_at with the id as tie-breaker. Every
+        combination has its own composite index, so both branches are index range scans.
+        A partial index on finished orders lets `archive_orders` find its batches.
+        """
+        indexes = [
+            models.Index(fields=['customer_user', 'created_at', 'id'], name='order_customer_created_idx'),
+            models.Index(fields=['business_user', 'created_at', 'id'], name='order_business_created_idx'),
+            models.Index(fields=['customer_user', 'updated_at', 'id'], name='order_customer_updated_idx'),
+            models.Index(fields=['business_user', 'updated_at', 'id'], name='order_business_updated_idx'),
+            models.Index(
+                fields=['updated_at', 'id'], name='order_finished_updated_idx',
+                condition=Q(status__in=['completed', 'cancelled']),
+            ),
+        ]
 
     def __str__(self):
         """
@@ -50,3 +149,484 @@ class Order(models.Model):
             str: The title of the order.
         """
         return self.title
+
+    def save(self, *args, **kwargs):
+        """
+        Saves the order and increments its version.
+
+        Updating an existing order locks its row and writes the version after the one stored,
+        so every write is seen by clients holding an older version, and the status counters
+        move the order from the status stored in the row. Saves are last-write-wins, as in the
+        admin or in management commands; the order API checks the version the client saw with
+        `transition_status` instead. With `update_fields`, the version is written along with
+        the given fields.
+        """
+        if self._state.adding:
+            return super().save(*args, **kwargs)
+
+        if kwargs.get('update_fields') is not None:
+            kwargs['update_fields'] = {*kwargs['update_fields'], 'version'}
+        with transaction.atomic(using=kwargs.get('using')):
+            stored = (
+                type(self)._base_manager.select_for_update().filter(pk=self.pk)
+                .values('version', 'business_user_id', 'status').first()
+            )
+            if stored is not None:
+                self.version = stored['version'] + 1
+                if getattr(self, '_counted_state', None) is not None:
+                    self._counted_state = (stored['business_user_id'], stored['status'])
+            super().save(*args, **kwargs)
+
+
+class ArchivedOrder(models.Model):
+    """
+    A finished order moved out of the Order table by the `archive_orders` command.
+
+    Keeps the hot Order table and its indexes limited to recent and open orders. The
+    columns mirror Order in the same order, so an archived queryset restricted to the
+    Order columns can be combined with an Order queryset by UNION; reads that include
+    the archive get Order instances either way. Archived orders keep their IDs and still
+    count in the order status counters and statistics.
+
+    Attributes:
+        archived_at (datetime): The timestamp when the order was archived.
+        The other attributes are those of Order.
+    """
+    FINISHED_STATUSES = ('completed', 'cancelled')
+
+    id = models.BigIntegerField(primary_key=True)
+    customer_user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, related_name='archived_customer_orders', on_delete=models.CASCADE
+    )
+    business_user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, related_name='archived_business_orders', on_delete=models.CASCADE
+    )
+    title = models.CharField(max_length=255)
+    revisions = models.PositiveIntegerField(default=0)
+    delivery_time_in_days = models.PositiveIntegerField()
+    price = models.DecimalField(max_digits=10, decimal_places=2)
+    features = models.JSONField(default=list)
+    offer_type = models.CharField(max_length=50)
+    status = models.CharField(max_length=20, choices=Order.STATUS_CHOICES)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    version = models.PositiveIntegerField(default=1)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        """
+        Metadata for the ArchivedOrder model.
+
+        Mirrors the per-user indexes of Order, so the archived branches of an order list
+        that includes the archive are index range scans as well.
+        """
+        indexes = [
+            models.Index(fields=['customer_user', 'created_at', 'id'], name='archorder_customer_created_idx'),
+            models.Index(fields=['business_user', 'created_at', 'id'], name='archorder_business_created_idx'),
+            models.Index(fields=['customer_user', 'updated_at', 'id'], name='archorder_customer_updated_idx'),
+            models.Index(fields=['business_user', 'updated_at', 'id'], name='archorder_business_updated_idx'),
+        ]
+
+    def __str__(self):
+        """
+        Returns the string representation of the archived order.
+
+        Returns:
+            str: The title of the order.
+        """
+        return self.title
+
+    @classmethod
+    def order_columns(cls):
+        """
+        Returns the names of the columns shared with Order, in Order's column order.
+        """
+        return [field.name for field in Order._meta.concrete_fields]
+
+    @classmethod
+    def from_order(cls, order):
+        """
+        Returns an unsaved archived copy of an order.
+        """
+        return cls(**{field.attname: getattr(order, field.attname) for field in Order._meta.concrete_fields})
+
+
+class OrderStatusCountQuerySet(models.QuerySet):
+    """
+    QuerySet for the per-business order status counters.
+    """
+
+    def adjust(self, business_user_id, status, delta):
+        """
+        Adds delta to the counter of a business user and status, creating it if needed.
+
+        The increment is a single UPDATE with an F() expression, so concurrent adjustments
+        never lose updates. Must run in the transaction of the order write it accounts for.
+        A decrement of a missing counter is not applied but logged, since the counters are
+        out of sync; `reconcile_order_counts` recomputes them.
+
+        Args:
+            business_user_id (int): The ID of the business user.
+            status (str): The order status.
+            delta (int): The change of the count.
+        """
+        while not self.filter(business_user_id=business_user_id, status=status).update(count=F('count') + delta):
+            if delta < 0:
+                logger.warning(
+                    'Bestellzähler %s/%s fehlt, reconcile_order_counts ausführen.', business_user_id, status
+                )
+                return
+            try:
+                with transaction.atomic():
+                    self.create(business_user_id=business_user_id, status=status, count=delta)
+                return
+            except IntegrityError:
+                continue
+
+    def adjust_many(self, deltas):
+        """
+        Applies several counter changes in (business_user_id, status) order.
+
+        Writes that move orders between counters lock the counters in the same order, so
+        two transactions moving orders in opposite directions cannot deadlock.
+
+        Args:
+            deltas (dict): Maps (business_user_id, status) to the change of the count.
+        """
+        for (business_user_id, status), delta in sorted(deltas.items()):
+            if delta:
+                self.adjust(business_user_id, status, delta)
+
+    def count_for(self, business_user_id, status=None):
+        """
+        Returns the number of orders of a business user, optionally only those with one status.
+
+        Args:
+            business_user_id (int): The ID of the business user.
+            status (str, optional): The order status.
+
+        Returns:
+            int: The number of orders.
+        """
+        counters = self.filter(business_user_id=business_user_id)
+        if status is not None:
+            counters = counters.filter(status=status)
+        return counters.aggregate(total=Sum('count'))['total'] or 0
+
+
+class OrderStatusCount(models.Model):
+    """
+    Number of orders per business user and status.
+
+    Maintained by the Order signals in the same transaction as every order write, so the
+    order count endpoints read a single row instead of counting orders. Archived orders
+    stay counted. The `reconcile_order_counts` command detects and repairs drift.
+
+    Attributes:
+        business_user (ForeignKey): The business user fulfilling the orders.
+        status (str): The order status.
+        count (int): The number of orders of the business user with this status.
+    """
+    business_user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, related_name='order_status_counts', on_delete=models.CASCADE
+    )
+    status = models.CharField(max_length=20, choices=Order.STATUS_CHOICES)
+    count = models.IntegerField(default=0)
+
+    objects = OrderStatusCountQuerySet.as_manager()
+
+    class Meta:
+        """
+        Metadata for the OrderStatusCount model.
+
+        Attributes:
+            unique_together (tuple): One counter per business user and status.
+        """
+        unique_together = ('business_user', 'status')
+
+    def __str__(self):
+        """
+        Returns the string representation of the counter.
+
+        Returns:
+            str: The business user, status and count.
+        """
+        return f'{self.business_user_id} {self.status}: {self.count}'
+
+
+class OrderDailyRollupQuerySet(models.QuerySet):
+    """
+    QuerySet for the daily order rollups.
+    """
+
+    def add(self, business_user_id, created_at, status, price, delivery_time_in_days, sign=1):
+        """
+        Adds an order to the rollup of its creation day and status, or removes it with sign=-1.
+
+        Like the status counters, the rollup is adjusted with a single F() UPDATE and created
+        on first use. Must run in the transaction of the order write it accounts for.
+
+        Args:
+            business_user_id (int): The ID of the business user.
+            created_at (datetime): The creation time of the order; its local date is the day.
+            status (str): The order status.
+            price (Decimal): The price of the order.
+            delivery_time_in_days (int): The delivery time of the order.
+            sign (int, optional): 1 to add the order, -1 to remove it.
+        """
+        self.add_many([(business_user_id, created_at, status, price, delivery_time_in_days, sign)])
+
+    def add_many(self, changes):
+        """
+        Applies several order additions and removals, one UPDATE per affected rollup.
+
+        The changes are summed per (business_user_id, day, status) and applied in that order,
+        so concurrent writes lock the rollups they share in the same order and cannot deadlock.
+
+        Args:
+            changes (iterable): Tuples of the arguments of `add`.
+        """
+        totals = defaultdict(lambda: {'order_count': 0, 'revenue': Decimal('0'), 'delivery_days': 0})
+        for business_user_id, created_at, status, price, delivery_time_in_days, sign in changes:
+            total = totals[(business_user_id, timezone.localdate(created_at), status)]
+            total['order_count'] += sign
+            total['revenue'] += sign * Decimal(str(price))
+            total['delivery_days'] += sign * int(delivery_time_in_days)
+
+        for (business_user_id, day, status), deltas in sorted(totals.items()):
+            if not any(deltas.values()):
+                continue
+            updates = {name: F(name) + delta for name, delta in deltas.items()}
+            rollups = self.filter(business_user_id=business_user_id, day=day, status=status)
+            while not rollups.update(**updates):
+                try:
+                    with transaction.atomic():
+                        self.create(business_user_id=business_user_id, day=day, status=status, **deltas)
+                    break
+                except IntegrityError:
+                    continue
+
+
+class OrderDailyRollup(models.Model):
+    """
+    Orders, revenue and delivery days per business user, creation day and status.
+
+    Maintained incrementally next to the status counters: a new order is added to the row
+    of its creation day and status, a status change moves it between the rows of that day,
+    and a delete removes it. Archived orders stay included. The `rebuild_order_rollups`
+    command recomputes any range of days from the orders.
+
+    Attributes:
+        business_user (ForeignKey): The business user fulfilling the orders.
+        day (date): The local date the orders were created on.
+        status (str): The current status of the orders.
+        order_count (int): The number of orders.
+        revenue (Decimal): The sum of the order prices.
+        delivery_days (int): The sum of the delivery times in days.
+    """
+    business_user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, related_name='order_daily_rollups', on_delete=models.CASCADE
+    )
+    day = models.DateField()
+    status = models.CharField(max_length=20, choices=Order.STATUS_CHOICES)
+    order_count = models.IntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    delivery_days = models.IntegerField(default=0)
+
+    objects = OrderDailyRollupQuerySet.as_manager()
+
+    class Meta:
+        """
+        Metadata for the OrderDailyRollup model.
+
+        Attributes:
+            unique_together (tuple): One row per business user, day and status; its index
+                also serves the range scans of the analytics endpoint.
+        """
+        unique_together = ('business_user', 'day', 'status')
+
+    def __str__(self):
+        """
+        Returns the string representation of the rollup.
+
+        Returns:
+            str: The business user, day, status and order count.
+        """
+        return f'{self.business_user_id} {self.day} {self.status}: {self.order_count}'
+
+
+class IdempotencyKey(models.Model):
+    """
+    Stores the response to a request sent with an `Idempotency-Key` header.
+
+    The row is inserted before the request is processed, in the same transaction, so the
+    unique constraint makes a concurrent request with the same key wait until the first one
+    commits and then replay its response. Rows older than IDEMPOTENCY_KEY_TTL are removed
+    by the `cleanup_idempotency_keys` command.
+
+    Attributes:
+        user (ForeignKey): The user who sent the request.
+        key (str): The value of the Idempotency-Key header.
+        fingerprint (str): A hash of the request body, to detect a key reused for another request.
+        status_code (int): The status code of the stored response.
+        response_body (JSONField): The data of the stored response.
+        created_at (datetime): The timestamp when the key was first used.
+    """
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, related_name='idempotency_keys', on_delete=models.CASCADE
+    )
+    key = models.CharField(max_length=255)
+    fingerprint = models.CharField(max_length=64)
+    status_code = models.PositiveSmallIntegerField(null=True)
+    response_body = models.JSONField(null=True, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        """
+        Metadata for the IdempotencyKey model.
+
+        Attributes:
+            unique_together (tuple): A key can only be used once per user.
+        """
+        unique_together = ('user', 'key')
+
+    def __str__(self):
+        """
+        Returns the string representation of the idempotency key.
+
+        Returns:
+            str: The user and the key.
+        """
+        return f'{self.user_id}: {self.key}'
+
+
+class OrderEventQuerySet(models.QuerySet):
+    """
+    QuerySet for order events.
+
+    Attributes:
+        feed_lock_namespace (int): The first key of the advisory locks on the feeds of users.
+    """
+    feed_lock_namespace = 4021
+
+    def append(self, events):
+        """
+        Inserts the events with one query after locking the feeds of their users.
+
+        On PostgreSQL, a transaction-level advisory lock is taken on the feed of every customer
+        and business user of the events, in user ID order, and held until the transaction ends.
+        The events take their IDs while the locks are held, so writes of events of the same user
+        are serialized and each user's events become visible in ID order, while order writes
+        of unrelated users do not wait for each other. Other databases, such as SQLite, already
+        serialize write transactions. Must run in the transaction of the order writes the events
+        describe, after the orders were locked or written and before the counters and rollups
+        are adjusted. A transaction should append all its events with one call, so that its
+        feed locks are taken in one sorted pass.
+
+        Args:
+            events (list): The unsaved OrderEvent instances.
+
+        Returns:
+            list: The inserted events.
+        """
+        if not events:
+            return []
+        connection = connections[self.db]
+        if connection.vendor == 'postgresql':
+            user_ids = sorted({user_id for event in events for user_id in (event.customer_user_id, event.business_user_id)})
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    'SELECT pg_advisory_xact_lock(%s, user_id) FROM unnest(%s::integer[]) AS user_id',
+                    [self.feed_lock_namespace, user_ids],
+                )
+        return self.bulk_create(events)
+
+
+class OrderEvent(models.Model):
+    """
+    Append-only record of an order being created or changing its status.
+
+    Events are written in the transaction of the order write they describe (transactional
+    outbox), so the change feed never shows a change that was rolled back. Events are appended
+    while the feeds of their users are locked until commit (see OrderEventQuerySet.append): an
+    event only becomes visible once all events of the same users with lower IDs are, so clients
+    that ask for their events after the last ID they saw never skip one that commits later.
+    The order is referenced without a database constraint, so events outlive their orders.
+
+    Attributes:
+        id (int): The position of the event in the change feed.
+        order (ForeignKey): The order the event belongs to.
+        customer_user (ForeignKey): The customer of the order.
+        business_user (ForeignKey): The business user of the order.
+        event_type (str): 'created' or 'status_changed'.
+        status (str): The status of the order after the event.
+        previous_status (str): The status before a status change, empty for created orders.
+        version (int): The version of the order after the event.
+        created_at (datetime): The timestamp when the event was recorded.
+    """
+    CREATED = 'created'
+    STATUS_CHANGED = 'status_changed'
+    EVENT_TYPES = [
+        (CREATED, 'Created'),
+        (STATUS_CHANGED, 'Status changed'),
+    ]
+
+    id = models.BigAutoField(primary_key=True)
+    order = models.ForeignKey(
+        Order, related_name='events', on_delete=models.DO_NOTHING, db_constraint=False
+    )
+    customer_user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, related_name='+', on_delete=models.CASCADE
+    )
+    business_user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, related_name='+', on_delete=models.CASCADE
+    )
+    event_type = models.CharField(max_length=20, choices=EVENT_TYPES)
+    status = models.CharField(max_length=20, choices=Order.STATUS_CHOICES)
+    previous_status = models.CharField(max_length=20, choices=Order.STATUS_CHOICES, blank=True)
+    version = models.PositiveIntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = OrderEventQuerySet.as_manager()
+
+    class Meta:
+        """
+        Metadata for the OrderEvent model.
+
+        The change feed reads the events of a user on the customer side and on the business
+        side after a given ID; each side is a range scan on its (user, id) index.
+        """
+        indexes = [
+            models.Index(fields=['customer_user', 'id'], name='orderevent_customer_id_idx'),
+            models.Index(fields=['business_user', 'id'], name='orderevent_business_id_idx'),
+        ]
+
+    def __str__(self):
+        """
+        Returns the string representation of the event.
+
+        Returns:
+            str: The event ID, order ID and event type.
+        """
+        return f'{self.pk}: {self.order_id} {self.event_type}'
+
+    @classmethod
+    def record(cls, order, event_type, previous_status=''):
+        """
+        Appends an event for an order that was just saved and publishes it to the order event
+        broker once the transaction commits.
+
+        Args:
+            order (Order): The order.
+            event_type (str): OrderEvent.CREATED or OrderEvent.STATUS_CHANGED.
+            previous_status (str, optional): The status before a status change.
+
+        Returns:
+            OrderEvent: The created event.
+        """
+        events = cls.objects.append([cls(
+            order_id=order.pk, customer_user_id=order.customer_user_id, business_user_id=order.business_user_id,
+            event_type=event_type, status=order.status, previous_status=previous_status, version=order.version,
+        )])
+        publish_on_commit(events)
+        return events[0]
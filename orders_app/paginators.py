@@ -0,0 +1,62 @@
+from django.db import connections
+from offers_app.paginators import OfferCursorPagination
+
+
+def union_of_heads(branches, order_by, limit):
+    """
+    Returns up to `limit` rows of the union of the given querysets, in the given order.
+
+    Where the database allows LIMIT in compound statements, each branch is ordered and
+    limited on its own first, so it is a range scan on its index and only the heads are
+    sorted. Other databases, such as SQLite, get the union of the unlimited branches.
+
+    Args:
+        branches (list): The querysets to combine.
+        order_by (list): The ordering of the result.
+        limit (int): The maximum number of rows.
+
+    Returns:
+        list: The rows.
+    """
+    if connections[branches[0].db].features.supports_slicing_ordering_in_compound:
+        branches = [branch.order_by(*order_by)[:limit] for branch in branches]
+    else:
+        branches = [branch.order_by() for branch in branches]
+    return list(branches[0].union(*branches[1:], all=True).order_by(*order_by)[:limit])
+
+
+class OrderCursorPagination(OfferCursorPagination):
+    """
+    Keyset paginator for the order list.
+
+    The order list is the union of the orders a user placed and the orders a user fulfils.
+    Instead of one queryset it takes both sides as separate querysets: each is positioned
+    by the cursor and, where the database allows it, limited to one page on its own, so each
+    is a range scan on its (user, ordering field, id) index, and only the union of the two
+    heads is sorted.
+
+    Attributes:
+        page_size (int): The number of orders per page.
+    """
+    page_size = 10
+
+    def get_model(self, queryset):
+        """
+        Returns the model of the first of the given querysets.
+        """
+        return queryset[0].model
+
+    def fetch_rows(self, queryset, cursor):
+        """
+        Fetches up to one row more than a page from the union of the given querysets.
+
+        Args:
+            queryset (list): The querysets of the customer and the business side.
+            cursor (dict): The decoded cursor, or None for the first page.
+
+        Returns:
+            list: The rows in page order.
+        """
+        if cursor is not None:
+            queryset = [branch.filter(self._position_filter(cursor['v'], cursor['i'])) for branch in queryset]
+        return union_of_heads(queryset, self._order_by(), self.page_size + 1)
@@ -1,13 +1,14 @@
 from rest_framework import serializers
-from .models import Order
+from coderr_app.serializers import SparseFieldsetMixin
+from .models import Order, OrderEvent
 
 
-class OrderSerializer(serializers.ModelSerializer):
+class OrderSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """
     Serializer for the Order model.
 
     Serializes all fields of the Order model and ensures that certain fields
-    are read-only (e.g., `id`, `created_at`, `updated_at`).
+    are read-only (e.g., `id`, `created_at`, `updated_at`, `version`). Supports sparse fieldsets.
     """
 
     class Meta:
@@ -21,7 +22,7 @@ class OrderSerializer(serializers.ModelSerializer):
         """
         model = Order
         fields = '__all__'
-        read_only_fields = ('id', 'created_at', 'updated_at')
+        read_only_fields = ('id', 'created_at', 'updated_at', 'version')
 
 
 class OrderStatusUpdateSerializer(serializers.ModelSerializer):
@@ -42,3 +43,23 @@ class OrderStatusUpdateSerializer(serializers.ModelSerializer):
         """
         model = Order
         fields = ('status',)
+
+
+class OrderEventSerializer(serializers.ModelSerializer):
+    """
+    Serializer for the events of the order change feed.
+    """
+
+    class Meta:
+        """
+        Meta configuration for the OrderEventSerializer.
+
+        Attributes:
+            model (Model): The model class to serialize (OrderEvent).
+            fields (tuple): The serialized event fields.
+        """
+        model = OrderEvent
+        fields = (
+            'id', 'order', 'event_type', 'status', 'previous_status', 'version',
+            'customer_user', 'business_user', 'created_at',
+        )
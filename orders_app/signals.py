@@ -0,0 +1,106 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+from .cache import bump_order_stats_version
+from .models import Order, OrderDailyRollup, OrderEvent, OrderStatusCount
+
+
+def counted_state(instance):
+    """
+    Returns the (business_user_id, status) an order is counted under, or None if either
+    field was not loaded.
+    """
+    business_user_id = instance.__dict__.get('business_user_id')
+    status = instance.__dict__.get('status')
+    if business_user_id is None or status is None:
+        return None
+    return business_user_id, status
+
+
+@receiver(post_init, sender=Order)
+def remember_counted_state(sender, instance, **kwargs):
+    """
+    Signal receiver to remember the business user and status an order was loaded with,
+    so a later save can move it between counters.
+    """
+    instance._counted_state = counted_state(instance) if instance.pk else None
+
+
+@receiver(post_save, sender=Order)
+def record_order_event(sender, instance, created, raw=False, **kwargs):
+    """
+    Signal receiver to append an OrderEvent when an order is created or changes its status.
+
+    Runs in the transaction of the save, before the counters update the remembered state.
+
+    Args:
+        sender (Order): The Order model class.
+        instance (Order): The Order instance being saved.
+        created (bool): Whether the order was created.
+        raw (bool): Whether the order is being loaded from a fixture.
+    """
+    if raw:
+        return
+    if created:
+        OrderEvent.record(instance, OrderEvent.CREATED)
+        return
+    previous = instance._counted_state
+    current = counted_state(instance)
+    if previous is not None and current is not None and previous[1] != current[1]:
+        OrderEvent.record(instance, OrderEvent.STATUS_CHANGED, previous_status=previous[1])
+
+
+@receiver(post_save, sender=Order)
+def count_order_status(sender, instance, created, raw=False, **kwargs):
+    """
+    Signal receiver to keep the OrderStatusCount counters and the OrderDailyRollup rows in
+    sync with order writes.
+
+    A new order increments its counter and rollup; a status or business user change moves
+    the order from the old ones to the new ones. Both run in the transaction of the save, which
+    also invalidates the cached order statistics of the affected business users.
+    QuerySet.update() bypasses this receiver and must adjust the counters and rollups itself.
+
+    Args:
+        sender (Order): The Order model class.
+        instance (Order): The Order instance being saved.
+        created (bool): Whether the order was created.
+        raw (bool): Whether the order is being loaded from a fixture.
+    """
+    if raw:
+        return
+    current = counted_state(instance)
+    previous = None if created else instance._counted_state
+    instance._counted_state = current
+    bump_order_stats_version(*{state[0] for state in (previous, current) if state is not None})
+    if current is None or previous == current or (previous is None and not created):
+        return
+
+    with transaction.atomic():
+        deltas = {current: 1}
+        if previous is not None:
+            deltas[previous] = -1
+        OrderStatusCount.objects.adjust_many(deltas)
+        OrderDailyRollup.objects.add_many(
+            (business_user_id, instance.created_at, status, instance.price, instance.delivery_time_in_days, sign)
+            for (business_user_id, status), sign in deltas.items()
+        )
+
+
+@receiver(post_delete, sender=Order)
+def uncount_order_status(sender, instance, **kwargs):
+    """
+    Signal receiver to remove a deleted order from its counter and rollup and invalidate the
+    cached order statistics of its business user.
+
+    Args:
+        sender (Order): The Order model class.
+        instance (Order): The Order instance being deleted.
+    """
+    state = instance._counted_state or counted_state(instance)
+    if state is not None:
+        OrderStatusCount.objects.adjust(*state, -1)
+        OrderDailyRollup.objects.add(
+            state[0], instance.created_at, state[1], instance.price, instance.delivery_time_in_days, -1
+        )
+        bump_order_stats_version(state[0])
@@ -1,9 +1,26 @@
-from django.test import TestCase
+import asyncio
+import json
+import threading
+from io import StringIO
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.management import call_command
+from datetime import timedelta
+from django.utils import timezone
+from django.db import connection, transaction
+from django.test import AsyncClient, TestCase, TransactionTestCase
+from rest_framework.authtoken.models import Token
 from rest_framework.test import APIClient
 from rest_framework import status
 from auth_app.models import CustomUser
+from coderr_app.asgi import DISCONNECT_AWARE_SCOPE_KEY
+from coderr_app.models import CacheVersion
 from offers_app.models import Offer, OfferDetail
-from orders_app.models import Order
+from orders_app.broker import get_broker
+from orders_app.models import ArchivedOrder, Order, OrderDailyRollup, OrderEvent, OrderStatusCount
+from orders_app.serializers import OrderEventSerializer
+from orders_app.views import OrderChangesAPIView
 
 class OrderAPITests(TestCase):
     def setUp(self):
@@ -11,6 +28,7 @@ class OrderAPITests(TestCase):
         Set up test data for orders, offers, and users.
         """
         self.client = APIClient()
+        caches[settings.RESPONSE_CACHE_ALIAS].clear()
 
         self.business_user = CustomUser.objects.create_user(
             username="business_user",
@@ -68,7 +86,339 @@ class OrderAPITests(TestCase):
         self.authenticate_user(self.customer_user)
         response = self.client.get('/api/orders/')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertGreaterEqual(len(response.data), 1)
+        self.assertEqual(response.data['count'], 1)
+        self.assertEqual(response.data['results'][0]['id'], self.order.id)
+
+    def test_get_orders_sparse_fieldset(self):
+        """
+        Test that the order list returns only the requested fields.
+        """
+        self.authenticate_user(self.customer_user)
+        response = self.client.get('/api/orders/?fields=id,title,status')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'], [{'id': self.order.id, 'title': "Test Order", 'status': "in_progress"}])
+
+        response = self.client.get('/api/orders/?exclude=features')
+        self.assertNotIn('features', response.data['results'][0])
+
+        response = self.client.get('/api/orders/?fields=unknown')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_get_orders_streamed(self):
+        """
+        Test that the streamed order list matches the regular list in both formats.
+        """
+        self.authenticate_user(self.customer_user)
+        expected = self.client.get('/api/orders/').json()['results']
+
+        response = self.client.get('/api/orders/?stream=json')
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(json.loads(b''.join(response.streaming_content)), expected)
+
+        response = self.client.get('/api/orders/?stream=ndjson&fields=id,status')
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual([json.loads(line) for line in lines], [{'id': self.order.id, 'status': "in_progress"}])
+
+        response = self.client.get('/api/orders/?stream=xml')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def create_orders(self, count):
+        """
+        Creates additional in-progress orders with distinct creation times.
+        """
+        base = timezone.now()
+        for index in range(count):
+            order = Order.objects.create(
+                customer_user=self.customer_user,
+                business_user=self.business_user,
+                title=f"Order {index}",
+                delivery_time_in_days=3,
+                price=50,
+                offer_type="standard",
+                status="completed" if index % 2 else "in_progress",
+            )
+            Order.objects.filter(pk=order.pk).update(created_at=base - timedelta(days=index + 1))
+
+    def test_get_orders_filtered_and_ordered(self):
+        """
+        Test filtering the order list by status, offer type and creation date, newest first.
+        """
+        self.create_orders(4)
+        self.authenticate_user(self.business_user)
+        response = self.client.get('/api/orders/')
+        self.assertEqual([order['title'] for order in response.data['results']], ["Test Order", "Order 0", "Order 1", "Order 2", "Order 3"])
+
+        response = self.client.get('/api/orders/?status=completed&ordering=created_at')
+        self.assertEqual([order['title'] for order in response.data['results']], ["Order 3", "Order 1"])
+
+        response = self.client.get('/api/orders/?offer_type=standard')
+        self.assertEqual(response.data['count'], 4)
+
+        since = (timezone.now() - timedelta(days=2, hours=12)).isoformat()
+        response = self.client.get('/api/orders/', {'created_after': since, 'offer_type': 'standard'})
+        self.assertEqual([order['title'] for order in response.data['results']], ["Order 0", "Order 1"])
+
+        for query in ('status=unknown', 'created_before=yesterday', 'ordering=price'):
+            response = self.client.get(f'/api/orders/?{query}')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_get_orders_paginated(self):
+        """
+        Test that page and cursor pagination walk the order list without gaps or duplicates.
+        """
+        self.create_orders(12)
+        self.authenticate_user(self.customer_user)
+        response = self.client.get('/api/orders/')
+        self.assertEqual(response.data['count'], 13)
+        self.assertEqual(len(response.data['results']), 10)
+        self.assertIsNotNone(response.data['next'])
+
+        response = self.client.get('/api/orders/?page=2')
+        self.assertEqual(response.data['count'], 13)
+        self.assertEqual(len(response.data['results']), 3)
+
+        response = self.client.get('/api/orders/?stream=ndjson')
+        self.assertEqual(len(b''.join(response.streaming_content).splitlines()), 13)
+
+        titles = []
+        url = '/api/orders/?cursor=&fields=id,title,created_at'
+        while url:
+            with self.assertNumQueries(1):
+                response = self.client.get(url)
+            titles.extend(order['title'] for order in response.data['results'])
+            url = response.data['next']
+        self.assertEqual(titles, ["Test Order"] + [f"Order {index}" for index in range(12)])
+
+    def test_order_status_counters_follow_writes(self):
+        """
+        Test that creating, updating and deleting orders keeps the status counters in sync.
+        """
+        self.authenticate_user(self.customer_user)
+        self.client.post('/api/orders/', {"offer_detail_id": self.offer_detail.id}, format='json')
+        self.assertEqual(OrderStatusCount.objects.count_for(self.business_user.id, 'in_progress'), 2)
+
+        self.authenticate_user(self.business_user)
+        self.client.patch(f'/api/orders/{self.order.id}/', {"status": "completed"}, format='json')
+        self.assertEqual(OrderStatusCount.objects.count_for(self.business_user.id, 'in_progress'), 1)
+        self.assertEqual(OrderStatusCount.objects.count_for(self.business_user.id, 'completed'), 1)
+
+        with self.assertNumQueries(1):
+            response = self.client.get(f'/api/orders/completed-order-count/{self.business_user.id}/')
+        self.assertEqual(response.data['completed_order_count'], 1)
+
+        self.order.delete()
+        self.assertEqual(OrderStatusCount.objects.count_for(self.business_user.id), 1)
+
+    def test_reconcile_order_counts(self):
+        """
+        Test that the reconcile command repairs counters changed behind the signals' back.
+        """
+        Order.objects.filter(pk=self.order.pk).update(status="cancelled")
+        out = StringIO()
+        call_command('reconcile_order_counts', stdout=out)
+        self.assertIn('2 Abweichungen korrigiert', out.getvalue())
+        self.assertEqual(OrderStatusCount.objects.count_for(self.business_user.id, 'in_progress'), 0)
+        self.assertEqual(OrderStatusCount.objects.count_for(self.business_user.id, 'cancelled'), 1)
+
+    def test_missing_counter_is_not_decremented_below_zero(self):
+        """
+        Test that moving an order out of a missing counter logs it instead of creating a negative count.
+        """
+        OrderStatusCount.objects.all().delete()
+        self.order.status = "completed"
+        with self.assertLogs('orders_app.models', level='WARNING'):
+            self.order.save()
+        self.assertEqual(
+            dict(OrderStatusCount.objects.values_list('status', 'count')), {'completed': 1}
+        )
+
+    def test_get_order_stats(self):
+        """
+        Test that the stats endpoint aggregates all statuses and is invalidated by order writes.
+        """
+        self.authenticate_user(self.customer_user)
+        Order.objects.create(
+            customer_user=self.customer_user, business_user=self.business_user, title="Done",
+            delivery_time_in_days=5, price=50, offer_type="basic", status="completed",
+        )
+        url = f'/api/orders/stats/{self.business_user.id}/'
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['total_order_count'], 2)
+        self.assertEqual(response.data['order_counts'], {'in_progress': 1, 'completed': 1, 'cancelled': 0})
+        self.assertNotIn('revenue', response.data)
+        self.assertEqual(response.data['average_delivery_time_in_days'], 4)
+        self.assertFalse(CacheVersion.objects.exists())
+
+        self.authenticate_user(self.business_user)
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+        self.assertEqual(response['X-Cache'], 'HIT')
+        self.assertEqual(response.data['revenue']['completed'], '50.00')
+
+        self.order.status = "cancelled"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.order.save()
+        response = self.client.get(url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['order_counts']['cancelled'], 1)
+
+    def test_get_order_stats_for_several_business_users(self):
+        """
+        Test loading the stats of several business users in one request.
+        """
+        self.authenticate_user(self.business_user)
+        other = CustomUser.objects.create_user(username="other_business", password="pw", type="business")
+        response = self.client.get('/api/orders/stats/', {'business_user_ids': f'{other.id},{self.business_user.id}'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([stats['business_user_id'] for stats in response.data], [other.id, self.business_user.id])
+        self.assertEqual(response.data[0]['total_order_count'], 0)
+        self.assertIsNone(response.data[0]['average_delivery_time_in_days'])
+        self.assertNotIn('revenue', response.data[0])
+        self.assertEqual(response.data[1]['revenue']['in_progress'], '100.00')
+
+        response = self.client.get('/api/orders/stats/', {'business_user_ids': 'a,b'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_order_changes_feed(self):
+        """
+        Test that order creation and status changes appear in the change feed after `since`.
+        """
+        self.authenticate_user(self.business_user)
+        response = self.client.get('/api/orders/changes/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([event['event_type'] for event in response.data['events']], ['created'])
+        since = response.data['next_since']
+
+        self.client.patch(f'/api/orders/{self.order.id}/', {"status": "completed"}, format='json')
+        self.client.post('/api/orders/bulk-status/', {"status": "cancelled", "orders": [{"id": self.order.id, "version": 2}]}, format='json')
+
+        response = self.client.get('/api/orders/changes/', {'since': since, 'limit': 1})
+        self.assertEqual(len(response.data['events']), 1)
+        self.assertTrue(response.data['has_more'])
+        self.assertEqual(response.data['events'][0]['previous_status'], 'in_progress')
+
+        response = self.client.get('/api/orders/changes/', {'since': response.data['next_since'], 'wait': 0.1})
+        self.assertEqual(response.data['events'][0]['status'], 'cancelled')
+        self.assertEqual(response.data['events'][0]['version'], 3)
+        self.assertFalse(response.data['has_more'])
+
+        response = self.client.get('/api/orders/changes/', {'since': response.data['next_since'], 'wait': 0.1})
+        self.assertEqual(response.data['events'], [])
+
+        self.assertEqual(self.client.get('/api/orders/changes/', {'wait': 10}).status_code, status.HTTP_400_BAD_REQUEST)
+
+    async def test_order_event_stream(self):
+        """
+        Test that the SSE stream replays missed events and then pushes new ones, including
+        events whose notification arrives late or not at all.
+        """
+        token, _ = await Token.objects.aget_or_create(user=self.business_user)
+        client = AsyncClient(**{DISCONNECT_AWARE_SCOPE_KEY: True})
+        response = await client.get('/api/orders/events/', {'since': 0}, headers={'Authorization': f'Token {token.key}'})
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        stream = response.streaming_content
+        self.assertEqual(await anext(stream), b'retry: 3000\n\n')
+        replayed = await anext(stream)
+        self.assertIn(b'"event_type":"created"', replayed)
+
+        message = asyncio.ensure_future(anext(stream))
+        await asyncio.sleep(0)
+        for new_status in ("completed", "cancelled"):
+            self.order.status = new_status
+            await sync_to_async(self.order.save)()
+        latest = await OrderEvent.objects.alatest('pk')
+        get_broker().publish(dict(OrderEventSerializer(latest).data))
+        self.assertIn(b'"status":"completed"', await asyncio.wait_for(message, 5))
+        self.assertIn(b'"status":"cancelled"', await asyncio.wait_for(anext(stream), 5))
+        await stream.aclose()
+
+        response = await client.get('/api/orders/events/')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        response = await AsyncClient().get('/api/orders/events/', headers={'Authorization': f'Token {token.key}'})
+        self.assertEqual(response.status_code, status.HTTP_501_NOT_IMPLEMENTED)
+
+    def test_order_event_stream_is_not_served_under_wsgi(self):
+        """
+        Test that the SSE stream answers 501 instead of holding a sync worker.
+        """
+        token, _ = Token.objects.get_or_create(user=self.business_user)
+        response = self.client.get('/api/orders/events/', HTTP_AUTHORIZATION=f'Token {token.key}')
+        self.assertEqual(response.status_code, status.HTTP_501_NOT_IMPLEMENTED)
+
+    def test_archive_orders(self):
+        """
+        Test that old finished orders move to the archive and stay readable and counted.
+        """
+        self.order.status = "completed"
+        self.order.save()
+        Order.objects.filter(pk=self.order.pk).update(updated_at=timezone.now() - timedelta(days=400))
+        recent = Order.objects.create(
+            customer_user=self.customer_user, business_user=self.business_user, title="Recent",
+            delivery_time_in_days=3, price=100, offer_type="basic", status="completed",
+        )
+
+        out = StringIO()
+        call_command('archive_orders', '--batch-size', '1', stdout=out)
+        self.assertIn('1 Bestellungen archiviert', out.getvalue())
+        self.assertFalse(Order.objects.filter(pk=self.order.pk).exists())
+        self.assertTrue(ArchivedOrder.objects.filter(pk=self.order.pk, status="completed").exists())
+        self.assertEqual(OrderStatusCount.objects.count_for(self.business_user.id, 'completed'), 2)
+
+        self.authenticate_user(self.customer_user)
+        response = self.client.get('/api/orders/')
+        self.assertEqual([order['id'] for order in response.data['results']], [recent.id])
+        response = self.client.get('/api/orders/', {'include_archived': '1'})
+        self.assertEqual([order['id'] for order in response.data['results']], [recent.id, self.order.id])
+        self.assertEqual(response.data['results'][1]['title'], "Test Order")
+        response = self.client.get('/api/orders/', {'include_archived': '1', 'fields': 'id,status', 'cursor': ''})
+        self.assertEqual(response.data['results'], [{'id': recent.id, 'status': 'completed'}, {'id': self.order.id, 'status': 'completed'}])
+
+        self.assertEqual(self.client.get(f'/api/orders/{self.order.id}/').data['title'], "Test Order")
+        stats = self.client.get(f'/api/orders/stats/{self.business_user.id}/').data
+        self.assertEqual(stats['order_counts']['completed'], 2)
+
+        call_command('reconcile_order_counts', stdout=out)
+        self.assertIn('0 Abweichungen korrigiert', out.getvalue())
+
+    def test_order_analytics_from_rollups(self):
+        """
+        Test that the daily rollups follow order writes and serve the analytics time series.
+        """
+        self.authenticate_user(self.business_user)
+        self.client.patch(f'/api/orders/{self.order.id}/', {"status": "completed"}, format='json')
+        today = timezone.localdate()
+        rollup = OrderDailyRollup.objects.get(business_user=self.business_user, day=today, status="completed")
+        self.assertEqual((rollup.order_count, rollup.revenue, rollup.delivery_days), (1, 100, 3))
+        self.assertEqual(OrderDailyRollup.objects.get(day=today, status="in_progress").order_count, 0)
+
+        params = {'from': (today - timedelta(days=6)).isoformat(), 'to': today.isoformat()}
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/orders/analytics/', params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['series']), 7)
+        self.assertEqual(response.data['series'][-1]['order_count'], 1)
+        self.assertEqual(response.data['series'][-1]['revenue'], '100.00')
+        self.assertEqual(response.data['series'][-1]['by_status']['completed']['order_count'], 1)
+        self.assertEqual(response.data['series'][0]['order_count'], 0)
+
+        response = self.client.get('/api/orders/analytics/', {**params, 'interval': 'month'})
+        self.assertEqual(response.data['series'][-1]['period'], today.replace(day=1).isoformat())
+        self.assertEqual(self.client.get('/api/orders/analytics/', {'interval': 'year'}).status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_rebuild_order_rollups(self):
+        """
+        Test that the rebuild command recomputes rollups changed behind the signals' back.
+        """
+        OrderDailyRollup.objects.all().delete()
+        Order.objects.filter(pk=self.order.pk).update(status="cancelled")
+        out = StringIO()
+        call_command('rebuild_order_rollups', stdout=out)
+        self.assertIn('1 Tageswerte', out.getvalue())
+        rollup = OrderDailyRollup.objects.get(business_user=self.business_user)
+        self.assertEqual((rollup.status, rollup.order_count), ("cancelled", 1))
 
     def test_get_single_order(self):
         """
@@ -92,6 +442,31 @@ class OrderAPITests(TestCase):
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertEqual(Order.objects.count(), 2)
 
+    def test_create_order_idempotent(self):
+        """
+        Test that a retried order creation with the same Idempotency-Key replays the first response.
+        """
+        self.authenticate_user(self.customer_user)
+        data = {"offer_detail_id": self.offer_detail.id}
+        with self.captureOnCommitCallbacks(execute=True):
+            first = self.client.post('/api/orders/', data, format='json', HTTP_IDEMPOTENCY_KEY='retry-1')
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+
+        with self.assertNumQueries(0):
+            retry = self.client.post('/api/orders/', data, format='json', HTTP_IDEMPOTENCY_KEY='retry-1')
+        self.assertEqual(retry.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+        self.assertEqual(retry.data['id'], first.data['id'])
+        self.assertEqual(Order.objects.count(), 2)
+
+        cache.clear()
+        retry = self.client.post('/api/orders/', data, format='json', HTTP_IDEMPOTENCY_KEY='retry-1')
+        self.assertEqual(retry.data['id'], first.data['id'])
+        self.assertEqual(Order.objects.count(), 2)
+
+        other = self.client.post('/api/orders/', {"offer_id": self.offer.id}, format='json', HTTP_IDEMPOTENCY_KEY='retry-1')
+        self.assertEqual(other.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+
     def test_create_order_invalid_user(self):
         """
         Test that a business user cannot create an order.
@@ -115,6 +490,67 @@ class OrderAPITests(TestCase):
         self.order.refresh_from_db()
         self.assertEqual(self.order.status, "completed")
 
+    def test_update_order_status_version_conflict(self):
+        """
+        Test that an update based on an outdated version is rejected instead of overwriting.
+        """
+        self.authenticate_user(self.business_user)
+        response = self.client.patch(f'/api/orders/{self.order.id}/', {"status": "completed", "version": 1}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['version'], 2)
+
+        self.authenticate_user(self.customer_user)
+        response = self.client.patch(f'/api/orders/{self.order.id}/', {"status": "cancelled", "version": 1}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response.data['current_version'], 2)
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.status, "completed")
+
+    def test_stale_order_save_overwrites_and_bumps_version(self):
+        """
+        Test that saving an order loaded before another change, as the admin or a management
+        command does, succeeds with the next version and counts the order from its stored status.
+        """
+        stale = Order.objects.get(pk=self.order.pk)
+        self.authenticate_user(self.business_user)
+        response = self.client.post('/api/orders/bulk-status/', {"status": "completed", "orders": [{"id": self.order.id, "version": 1}]}, format='json')
+        self.assertEqual(response.data['updated'], [{'id': self.order.id, 'version': 2}])
+
+        stale.status = "cancelled"
+        stale.save()
+        self.assertEqual(stale.version, 3)
+        self.assertEqual(OrderStatusCount.objects.count_for(self.business_user.id, 'completed'), 0)
+        self.assertEqual(OrderStatusCount.objects.count_for(self.business_user.id, 'cancelled'), 1)
+        self.assertEqual(OrderStatusCount.objects.count_for(self.business_user.id, 'in_progress'), 0)
+
+        response = self.client.patch(f'/api/orders/{self.order.id}/', {"status": "completed", "version": 2}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response.data['current_version'], 3)
+
+    def test_bulk_update_order_status(self):
+        """
+        Test moving several orders at once, reporting the ones changed in the meantime.
+        """
+        second = Order.objects.create(
+            customer_user=self.customer_user, business_user=self.business_user, title="Second",
+            delivery_time_in_days=3, price=100, offer_type="basic",
+        )
+        Order.objects.filter(pk=second.pk).update(version=5)
+        self.authenticate_user(self.business_user)
+        data = {"status": "completed", "orders": [
+            {"id": self.order.id, "version": 1}, {"id": second.id, "version": 4}, {"id": 999999, "version": 1},
+        ]}
+        response = self.client.post('/api/orders/bulk-status/', data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['updated'], [{'id': self.order.id, 'version': 2}])
+        self.assertEqual(response.data['conflicts'][0]['current_version'], 5)
+        self.assertEqual(response.data['conflicts'][1]['id'], 999999)
+        self.assertEqual(OrderStatusCount.objects.count_for(self.business_user.id, 'completed'), 1)
+        self.assertEqual(OrderStatusCount.objects.count_for(self.business_user.id, 'in_progress'), 1)
+
+        response = self.client.post('/api/orders/bulk-status/', {"status": "completed", "orders": [{"id": "x"}]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
     def test_update_order_status_invalid(self):
         """
         Test updating an order with an invalid status.
@@ -141,3 +577,124 @@ class OrderAPITests(TestCase):
         response = self.client.get(f'/api/orders/completed-order-count/{self.business_user.id}/')  # Angepasste URL
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data['completed_order_count'], 0)
+
+
+class ConcurrentOrderWriteTests(TransactionTestCase):
+    def setUp(self):
+        """
+        Create the users of the concurrently written orders.
+        """
+        if connection.vendor != 'postgresql':
+            self.skipTest('Relies on PostgreSQL row locks.')
+        self.customer_user = CustomUser.objects.create_user(
+            username="customer_user", email="customer@example.com", password="pw", type="customer"
+        )
+        self.business_users = [
+            CustomUser.objects.create_user(
+                username=f"business_user_{index}", email=f"business{index}@example.com", password="pw", type="business"
+            )
+            for index in range(2)
+        ]
+
+    def create_order(self, title, business_user, recorded=None, release=None, customer_user=None):
+        """
+        Create an order in its own transaction and connection, optionally holding the
+        transaction open after the order, its event, counter and rollup were written until
+        `release` is set.
+        """
+        try:
+            with transaction.atomic():
+                Order.objects.create(
+                    customer_user=customer_user or self.customer_user, business_user=business_user, title=title,
+                    delivery_time_in_days=3, price=100, offer_type="basic",
+                )
+                if recorded is not None:
+                    recorded.set()
+                    release.wait(5)
+        finally:
+            connection.close()
+
+    def test_change_feed_does_not_skip_events_committed_late(self):
+        """
+        Test that an event written first but committed last is still returned after the
+        `since` a client got while the writes were interleaved. The orders belong to different
+        business users, so only the event IDs can order the two transactions.
+        """
+        recorded, release, done = threading.Event(), threading.Event(), threading.Event()
+        first = threading.Thread(target=self.create_order, args=("First", self.business_users[0], recorded, release))
+        first.start()
+        self.assertTrue(recorded.wait(5))
+
+        def create_second():
+            self.create_order("Second", self.business_users[1])
+            done.set()
+
+        second = threading.Thread(target=create_second)
+        second.start()
+        self.assertFalse(done.wait(0.5))
+
+        events = OrderChangesAPIView.fetch_events(self.customer_user, 0, 10)
+        since = events[-1].pk if events else 0
+
+        release.set()
+        first.join(5)
+        second.join(5)
+        events = OrderChangesAPIView.fetch_events(self.customer_user, since, 10)
+        self.assertEqual(
+            [event.order.title for event in events], ["First", "Second"]
+        )
+
+    def test_orders_of_unrelated_users_do_not_wait_for_each_other(self):
+        """
+        Test that an open order write only holds up event writes that share one of its users.
+        """
+        other_customer = CustomUser.objects.create_user(
+            username="other_customer", email="other@example.com", password="pw", type="customer"
+        )
+        recorded, release, done = threading.Event(), threading.Event(), threading.Event()
+        first = threading.Thread(target=self.create_order, args=("First", self.business_users[0], recorded, release))
+        first.start()
+        self.assertTrue(recorded.wait(5))
+
+        def create_unrelated():
+            self.create_order("Unrelated", self.business_users[1], customer_user=other_customer)
+            done.set()
+
+        unrelated = threading.Thread(target=create_unrelated)
+        unrelated.start()
+        try:
+            self.assertTrue(done.wait(5))
+        finally:
+            release.set()
+            first.join(5)
+            unrelated.join(5)
+        self.assertEqual(OrderEvent.objects.count(), 2)
+
+    def test_rebuild_order_rollups_waits_for_open_order_writes(self):
+        """
+        Test that a rollup rebuild running next to an uncommitted order write counts that order
+        instead of overwriting the rollup row the write created.
+        """
+        business_user = self.business_users[0]
+        self.create_order("Committed", business_user)
+        OrderDailyRollup.objects.all().delete()
+
+        recorded, release, rebuilt = threading.Event(), threading.Event(), threading.Event()
+        writer = threading.Thread(target=self.create_order, args=("Open", business_user, recorded, release))
+        writer.start()
+        self.assertTrue(recorded.wait(5))
+
+        def rebuild():
+            try:
+                call_command('rebuild_order_rollups', stdout=StringIO())
+            finally:
+                connection.close()
+                rebuilt.set()
+
+        rebuilder = threading.Thread(target=rebuild)
+        rebuilder.start()
+        self.assertFalse(rebuilt.wait(0.5))
+        release.set()
+        writer.join(5)
+        rebuilder.join(5)
+        self.assertEqual(OrderDailyRollup.objects.get(business_user=business_user).order_count, 2)
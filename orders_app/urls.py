@@ -1,10 +1,16 @@
 from django.urls import path
-from .views import OrderAPIView, OrderCountAPIView, CompletedOrderCountAPIView
+from .views import OrderAPIView, OrderAnalyticsAPIView, OrderBulkStatusAPIView, OrderChangesAPIView, OrderEventStreamView, OrderCountAPIView, CompletedOrderCountAPIView, OrderStatsAPIView
 
 urlpatterns = [
     path('', OrderAPIView.as_view(), name='order-list-create'),
     path('<int:pk>/', OrderAPIView.as_view(), name='order-detail'),
+    path('bulk-status/', OrderBulkStatusAPIView.as_view(), name='order-bulk-status'),
+    path('changes/', OrderChangesAPIView.as_view(), name='order-changes'),
+    path('events/', OrderEventStreamView.as_view(), name='order-events'),
     path('order-count/<int:pk>/', OrderCountAPIView.as_view(), name='order-count'),
     path('completed-order-count/<int:pk>/', CompletedOrderCountAPIView.as_view(), name='completed-order-count'),
+    path('stats/', OrderStatsAPIView.as_view(), name='order-stats-list'),
+    path('analytics/', OrderAnalyticsAPIView.as_view(), name='order-analytics'),
+    path('stats/<int:business_user_id>/', OrderStatsAPIView.as_view(), name='order-stats'),
 ]
 
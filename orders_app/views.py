@@ -1,14 +1,34 @@
 from urllib import request
+import asyncio
+import json
+from asgiref.sync import sync_to_async
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.authentication import TokenAuthentication
+from rest_framework.exceptions import AuthenticationFailed
+from django.http import JsonResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.views import View
 from rest_framework import status
-from django.db.models import Q
-from .serializers import OrderSerializer
+from datetime import datetime, time, timedelta
+from time import monotonic, sleep
+from django.db import transaction
+from django.db.models import Count, Max, Q, Sum
+from django.db.models.functions import TruncDay, TruncMonth, TruncWeek
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from .broker import get_broker
+from .cache import order_stats_cache, stats_cache_keys
+from .idempotency import idempotent_response
+from .paginators import OrderCursorPagination, union_of_heads
+from .serializers import OrderEventSerializer, OrderSerializer
+from coderr_app.asgi import is_disconnect_aware
+from coderr_app.paginations import CustomPageNumberPagination
+from coderr_app.serializers import parse_fieldset
+from coderr_app.streaming import get_stream_format, streaming_response
 from offers_app.models import Offer, OfferDetail
-from .models import Order
+from .models import ArchivedOrder, Order, OrderDailyRollup, OrderEvent, OrderStatusCount
 
 
 class OrderAPIView(APIView):
@@ -23,6 +43,7 @@ class OrderAPIView(APIView):
 
     authentication_classes = [TokenAuthentication]
     permission_classes = [IsAuthenticated]
+    pagination_class = CustomPageNumberPagination
 
     def get(self, request, pk=None):
         """
@@ -32,12 +53,33 @@ class OrderAPIView(APIView):
         pk (int, optional): The primary key of the order to retrieve. If not provided, retrieves all orders
                             associated with the authenticated user.
 
+        Query Parameters:
+        status (str, optional): Only orders with this status.
+        offer_type (str, optional): Only orders of this offer type.
+        created_after / created_before (str, optional): ISO date or datetime bounds (inclusive) on created_at.
+        ordering (str, optional): 'created_at', 'updated_at' or the same prefixed with '-'. Defaults to '-created_at'.
+        page (int, optional): The page of the page-number paginated list. Defaults to 1; `page_size`
+                            sets the orders per page, at most 500.
+        cursor (str, optional): Returns a keyset paginated response instead; pass it empty for the first page.
+        fields / exclude (str, optional): Comma-separated field names selecting a sparse fieldset
+                            for the order list. Only the columns these fields read are loaded.
+        stream (str, optional): 'json' or 'ndjson' streams the whole order list chunk by chunk
+                            instead of one page.
+        include_archived (str, optional): '1' or 'true' also lists orders moved to the archive.
+
+        The list is the UNION ALL of the orders the user placed and the orders the user fulfils
+        (excluding those already on the customer side), so each side is answered by its own
+        (user, ordering field, id) index instead of one scan over an OR condition. With
+        include_archived, the same two sides of the ArchivedOrder table join the union.
+        A single order is looked up in the archive if it is no longer in the Order table.
+
         Returns:
         Response: A JSON response containing the serialized order data. If a specific order is requested 
                 and the user is neither the customer nor the business user, returns a 403 error response.
+                Unknown fieldset names or invalid filters return a 400 error response.
         """
         if pk:
-            order = get_object_or_404(Order, pk=pk)
+            order = Order.objects.filter(pk=pk).first() or get_object_or_404(ArchivedOrder, pk=pk)
             if order.customer_user != request.user and order.business_user != request.user:
                 return Response({'error': 'Keine Berechtigung für diese Bestellung.'}, status=status.HTTP_403_FORBIDDEN)
 
@@ -45,11 +87,90 @@ class OrderAPIView(APIView):
             return Response(serializer.data, status=status.HTTP_200_OK)
 
         else:
-            orders = Order.objects.filter(
-                Q(customer_user=request.user) | Q(business_user=request.user)
-            )
-            serializer = OrderSerializer(orders, many=True)
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            fields, error = parse_fieldset(request.query_params, OrderSerializer)
+            if error:
+                return Response({'error': error}, status=status.HTTP_400_BAD_REQUEST)
+            stream_format, error = get_stream_format(request.query_params)
+            if error:
+                return Response({'error': error}, status=status.HTTP_400_BAD_REQUEST)
+            filters, ordering, error = self._list_options(request.query_params)
+            if error:
+                return Response({'error': error}, status=status.HTTP_400_BAD_REQUEST)
+
+            tables = [Order]
+            if request.query_params.get('include_archived') in ('1', 'true'):
+                tables.append(ArchivedOrder)
+            if fields is not None:
+                columns = OrderSerializer.model_columns(fields) + [ordering.lstrip('-')]
+            else:
+                columns = ArchivedOrder.order_columns()
+
+            branches = []
+            for model in tables:
+                customer_side = model.objects.filter(filters, customer_user=request.user)
+                business_side = model.objects.filter(filters, business_user=request.user).exclude(customer_user=request.user)
+                if fields is not None or model is ArchivedOrder:
+                    customer_side, business_side = customer_side.only(*columns), business_side.only(*columns)
+                branches += [customer_side, business_side]
+
+            def serialize(rows):
+                return OrderSerializer(rows, many=True, fields=fields).data
+
+            if 'cursor' in request.query_params:
+                paginator = OrderCursorPagination()
+                result_page = paginator.paginate_queryset(branches, request, ordering)
+                return paginator.get_paginated_response(serialize(result_page))
+
+            orders = branches[0].union(*branches[1:], all=True).order_by(ordering, '-id' if ordering.startswith('-') else 'id')
+            if stream_format:
+                return streaming_response(orders, serialize, stream_format)
+
+            paginator = self.pagination_class()
+            result_page = paginator.paginate_queryset(orders, request, view=self)
+            return paginator.get_paginated_response(serialize(result_page))
+
+    @staticmethod
+    def _list_options(params):
+        """
+        Reads the filters and the ordering of the order list.
+
+        Returns:
+            tuple: (filters, ordering, error). error is a message string if a parameter is invalid, else None.
+        """
+        filters = Q()
+
+        order_status = params.get('status')
+        if order_status:
+            if order_status not in dict(Order.STATUS_CHOICES):
+                return None, None, 'Ungültiger Status. Gültige Werte sind: ' + ', '.join(dict(Order.STATUS_CHOICES))
+            filters &= Q(status=order_status)
+
+        offer_type = params.get('offer_type')
+        if offer_type:
+            filters &= Q(offer_type=offer_type)
+
+        for param, lookup in (('created_after', 'gte'), ('created_before', 'lte')):
+            value = params.get(param)
+            if not value:
+                continue
+            try:
+                moment = parse_datetime(value)
+                if moment is None:
+                    day = parse_date(value)
+                    if day is None:
+                        raise ValueError
+                    moment = datetime.combine(day, time.max if lookup == 'lte' else time.min)
+            except ValueError:
+                return None, None, f'{param} muss ein gültiges Datum sein.'
+            if timezone.is_naive(moment):
+                moment = timezone.make_aware(moment)
+            filters &= Q(**{f'created_at__{lookup}': moment})
+
+        ordering = params.get('ordering', '-created_at')
+        if ordering not in ('created_at', '-created_at', 'updated_at', '-updated_at'):
+            return None, None, f'Ungültiges Sortierfeld: {ordering}'
+
+        return filters, ordering, None
 
     def post(self, request):
         """
@@ -70,6 +191,14 @@ class OrderAPIView(APIView):
         - If the request body contains 'offer_detail_id', the offer's details are used.
         - If the request body contains 'offer_id', the offer's details must be provided in the request 
         body.
+        - With an 'Idempotency-Key' header, a retried request replays the response of the first one
+        instead of creating another order.
+        """
+        return idempotent_response(request, lambda: self._create_order(request))
+
+    def _create_order(self, request):
+        """
+        Creates the order described by the request body. See `post`.
         """
         data = request.data
         if request.user.type != 'customer':
@@ -92,17 +221,18 @@ class OrderAPIView(APIView):
 
         offer = get_object_or_404(Offer, pk=offer_id)
 
-        order = Order.objects.create(
-            customer_user=request.user,
-            business_user=offer.user,
-            title=data.get("title", offer.title),
-            revisions=data.get("revisions", revisions),
-            delivery_time_in_days=data.get("delivery_time_in_days", delivery_time_in_days),
-            price=data.get("price", price),
-            features=data.get("features", features),
-            offer_type=data.get("offer_type", offer_type),
-            status="in_progress",
-        )
+        with transaction.atomic():
+            order = Order.objects.create(
+                customer_user=request.user,
+                business_user=offer.user,
+                title=data.get("title", offer.title),
+                revisions=data.get("revisions", revisions),
+                delivery_time_in_days=data.get("delivery_time_in_days", delivery_time_in_days),
+                price=data.get("price", price),
+                features=data.get("features", features),
+                offer_type=data.get("offer_type", offer_type),
+                status="in_progress",
+            )
 
         serializer = OrderSerializer(order)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
@@ -116,14 +246,19 @@ class OrderAPIView(APIView):
 
         Parameters:
         pk (int): The id of the order to be updated.
-        request (Request): A request object containing the new status in the request body.
+        request (Request): A request object containing the new status and, optionally, the
+                        `version` of the order the client last saw in the request body.
 
         Returns:
         Response: A response object containing the updated order data with status 200.
 
         If the user is not the customer or the business user of the order, a 403 response is returned.
 
-        If the request body does not contain a valid status, a 400 response is returned.
+        If the request body does not contain a valid status or version, a 400 response is returned.
+
+        If the order was changed since the given version (or since it was loaded), a 409 response
+        with the current version is returned instead of overwriting the other change. The version
+        check and the update are one `transition_status` UPDATE, like the bulk status change.
         """
         order = get_object_or_404(Order, pk=pk)
 
@@ -137,12 +272,338 @@ class OrderAPIView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        order.status = new_status
-        order.save()
+        version = order.version
+        if 'version' in request.data:
+            version, error = _parse_positive_int(request.data.get('version'), 'version')
+            if error:
+                return Response({'error': error}, status=status.HTTP_400_BAD_REQUEST)
 
+        with transaction.atomic():
+            updated = Order.objects.filter(pk=order.pk).transition_status(new_status, {order.pk: version})
+        if not updated:
+            current_version = Order.objects.filter(pk=order.pk).values_list('version', flat=True).first()
+            return Response(
+                {'error': 'Die Bestellung wurde zwischenzeitlich geändert.', 'current_version': current_version},
+                status=status.HTTP_409_CONFLICT
+            )
+
+        order.refresh_from_db()
         serializer = OrderSerializer(order)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
+class OrderBulkStatusAPIView(APIView):
+    """
+    API endpoint to move many orders to a new status at once.
+    """
+
+    authentication_classes = [TokenAuthentication]
+    permission_classes = [IsAuthenticated]
+    max_orders = 100
+
+    def post(self, request):
+        """
+        Moves the given orders of the authenticated user to a new status with one UPDATE.
+
+        Each order is only updated if it still has the version the client sent, so concurrent
+        changes are reported as conflicts instead of being overwritten.
+
+        Parameters:
+        request (Request): The request body contains `status` and `orders`, a list of
+                        {"id": ..., "version": ...} objects.
+
+        Returns:
+        Response: A response with status 200 listing the updated orders with their new versions
+                and the conflicts: orders that were changed since the given version (with their
+                current version) or that are not orders of the user. Returns a 400 error response
+                if the status or the order list is invalid.
+        """
+        new_status = request.data.get('status')
+        if not new_status or new_status not in dict(Order.STATUS_CHOICES):
+            return Response(
+                {'error': 'Ungültiger oder fehlender Status. Gültige Werte sind: ' + ', '.join(dict(Order.STATUS_CHOICES))},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        versions, error = self._parse_orders(request.data.get('orders'))
+        if error:
+            return Response({'error': error}, status=status.HTTP_400_BAD_REQUEST)
+
+        orders = Order.objects.filter(Q(customer_user=request.user) | Q(business_user=request.user))
+        with transaction.atomic():
+            updated_ids = set(orders.transition_status(new_status, versions))
+        stale = [pk for pk in versions if pk not in updated_ids]
+        current_versions = dict(orders.filter(pk__in=stale).values_list('pk', 'version'))
+
+        conflicts = []
+        for pk in stale:
+            if pk in current_versions:
+                conflicts.append({'id': pk, 'error': 'Die Bestellung wurde zwischenzeitlich geändert.', 'current_version': current_versions[pk]})
+            else:
+                conflicts.append({'id': pk, 'error': 'Bestellung nicht gefunden.'})
+
+        return Response({
+            'updated': [{'id': pk, 'version': versions[pk] + 1} for pk in versions if pk in updated_ids],
+            'conflicts': conflicts,
+        }, status=status.HTTP_200_OK)
+
+    def _parse_orders(self, orders):
+        """
+        Reads the list of orders and the versions the client expects them to have.
+
+        Returns:
+            tuple: (versions, error). versions maps order IDs to versions, error is a message
+                string if the list is invalid, else None.
+        """
+        if not isinstance(orders, list) or not orders:
+            return None, 'orders muss eine nicht leere Liste sein.'
+        if len(orders) > self.max_orders:
+            return None, f'Höchstens {self.max_orders} Bestellungen pro Anfrage.'
+
+        versions = {}
+        for entry in orders:
+            if not isinstance(entry, dict):
+                return None, 'Jede Bestellung braucht eine id und eine version.'
+            pk, pk_error = _parse_positive_int(entry.get('id'), 'id')
+            version, version_error = _parse_positive_int(entry.get('version'), 'version')
+            if pk_error or version_error:
+                return None, 'Jede Bestellung braucht eine id und eine version.'
+            if pk in versions:
+                return None, f'Bestellung {pk} ist mehrfach angegeben.'
+            versions[pk] = version
+        return versions, None
+
+
+def _parse_positive_int(value, name):
+    """
+    Parses a positive integer such as an order id or version.
+
+    Returns:
+        tuple: (number, error). error is a message string if the value is invalid, else None.
+    """
+    error = f'{name} muss eine positive ganze Zahl sein.'
+    if isinstance(value, bool):
+        return None, error
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        return None, error
+    if number < 1:
+        return None, error
+    return number, None
+
+
+class OrderChangesAPIView(APIView):
+    """
+    API endpoint for the change feed of the orders of the authenticated user.
+
+    Clients remember the ID of the last event they saw and ask for the events after it,
+    instead of polling the order list and the count endpoints.
+
+    A sync view: while a request waits for events, it holds a worker (under WSGI) or a thread
+    (under ASGI). The wait is therefore capped at `max_wait` seconds; clients that want to be
+    told about changes as they happen use the event stream, which is served under ASGI only.
+    """
+
+    authentication_classes = [TokenAuthentication]
+    permission_classes = [IsAuthenticated]
+    default_limit = 100
+    max_limit = 500
+    max_wait = 5
+    poll_interval = 0.5
+
+    def get(self, request):
+        """
+        Returns the order events of the user after a given event ID, oldest first.
+
+        Query Parameters:
+        since (int, optional): The ID of the last event the client has seen. Defaults to 0.
+        limit (int, optional): The maximum number of events. Defaults to 100, at most 500.
+        wait (float, optional): Seconds to wait for new events if there are none yet (short
+                            long polling, re-checked every half second), at most 5. Defaults to 0.
+
+        Returns:
+        Response: The events, `next_since` (the ID to pass as `since` next time) and `has_more`
+                (whether more events are already available). Returns a 400 error response if a
+                parameter is invalid.
+        """
+        since, limit, wait, error = self._feed_options(request.query_params)
+        if error:
+            return Response({'error': error}, status=status.HTTP_400_BAD_REQUEST)
+
+        deadline = monotonic() + wait
+        while True:
+            events = self.fetch_events(request.user, since, limit + 1)
+            remaining = deadline - monotonic()
+            if events or remaining <= 0:
+                break
+            sleep(min(self.poll_interval, remaining))
+
+        has_more = len(events) > limit
+        events = events[:limit]
+        return Response({
+            'events': OrderEventSerializer(events, many=True).data,
+            'next_since': events[-1].pk if events else since,
+            'has_more': has_more,
+        }, status=status.HTTP_200_OK)
+
+    @staticmethod
+    def fetch_events(user, since, limit):
+        """
+        Returns up to `limit` events of a user's orders after the given event ID.
+
+        The customer side and the business side (excluding orders on the customer side) are
+        each limited on their own where the database allows it, so each is a range scan on
+        its (user, id) index.
+        """
+        branches = [
+            OrderEvent.objects.filter(customer_user=user, pk__gt=since),
+            OrderEvent.objects.filter(business_user=user, pk__gt=since).exclude(customer_user=user),
+        ]
+        return union_of_heads(branches, ['pk'], limit)
+
+    def _feed_options(self, params):
+        """
+        Reads the `since`, `limit` and `wait` query parameters.
+
+        Returns:
+            tuple: (since, limit, wait, error). error is a message string if a parameter is invalid, else None.
+        """
+        try:
+            since = int(params.get('since', 0))
+            limit = int(params.get('limit', self.default_limit))
+            wait = float(params.get('wait', 0))
+        except ValueError:
+            return None, None, None, 'since, limit und wait müssen Zahlen sein.'
+        if since < 0:
+            return None, None, None, 'since darf nicht negativ sein.'
+        if not 1 <= limit <= self.max_limit:
+            return None, None, None, f'limit muss zwischen 1 und {self.max_limit} liegen.'
+        if not 0 <= wait <= self.max_wait:
+            return None, None, None, f'wait muss zwischen 0 und {self.max_wait} Sekunden liegen.'
+        return since, limit, wait, None
+
+
+class OrderEventStreamView(View):
+    """
+    Server-Sent Events stream of the order events of the authenticated user.
+
+    An async view: under ASGI an idle connection is a suspended coroutine waiting on its
+    broker subscription, not a thread, so one worker holds many connections. It is only
+    served under DisconnectAwareASGIHandler; under WSGI every connection would hold a worker
+    for its whole life, so other deployments answer 501. Authenticates
+    with the `Authorization: Token <key>` header or, for EventSource clients that cannot set
+    headers, the `token` query parameter.
+    """
+
+    heartbeat_interval = 15
+    replay_batch_size = OrderChangesAPIView.max_limit
+
+    async def get(self, request):
+        """
+        Streams the order events of the user as they are committed.
+
+        Each event is sent as an SSE message whose id is the event ID and whose data is the
+        event as returned by the change feed. With a `Last-Event-ID` header (sent by EventSource
+        on reconnect) or a `since` query parameter, the events after that ID are replayed from
+        the outbox first. A comment line is sent every 15 seconds to keep the connection open.
+
+        Returns:
+            StreamingHttpResponse: The text/event-stream response, or a 501 error response
+                when not served by DisconnectAwareASGIHandler, a 401 error response without
+                a valid token, or a 400 error response for an invalid event ID.
+        """
+        if not is_disconnect_aware(request):
+            return JsonResponse(
+                {'error': 'Der Ereignisstream ist nur unter ASGI verfügbar.'},
+                status=status.HTTP_501_NOT_IMPLEMENTED,
+            )
+
+        user = await sync_to_async(_token_user)(request)
+        if user is None:
+            return JsonResponse({'error': 'Ungültiger oder fehlender Token.'}, status=status.HTTP_401_UNAUTHORIZED)
+
+        since = request.headers.get('Last-Event-ID') or request.GET.get('since')
+        if since is not None:
+            try:
+                since = int(since)
+            except ValueError:
+                return JsonResponse({'error': 'Last-Event-ID muss eine Zahl sein.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        response = StreamingHttpResponse(self.stream(user, since), content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+    async def stream(self, user, since):
+        """
+        Yields the encoded SSE messages of a user's order events.
+
+        Events are always read from the outbox, in ID order: a notification of the broker
+        only wakes the stream up to read the events after the last one sent. Notifications
+        may arrive out of order, but event IDs are visible in commit order, so no event is
+        skipped. The subscription is opened before the first read, so no event committed in
+        between is lost. If the client falls too far behind, the stream ends and the client
+        resumes from its last event ID. When the client disconnects, the ASGI handler cancels
+        the stream, which ends the subscription.
+        """
+        broker = get_broker()
+        subscription = broker.subscribe(user.pk)
+        try:
+            yield b'retry: 3000\n\n'
+            catch_up = since is not None
+            if since is None:
+                since = await sync_to_async(self._last_event_id)(user)
+
+            while not subscription.overflowed:
+                if catch_up:
+                    events = await sync_to_async(self._replay)(user, since)
+                    for event in events:
+                        yield _sse_message(event)
+                        since = event['id']
+                    catch_up = len(events) == self.replay_batch_size
+                    continue
+                try:
+                    event = await asyncio.wait_for(subscription.get(), self.heartbeat_interval)
+                except asyncio.TimeoutError:
+                    yield b': heartbeat\n\n'
+                    continue
+                catch_up = event['id'] > since
+        finally:
+            broker.unsubscribe(subscription)
+
+    @staticmethod
+    def _last_event_id(user):
+        # Events of the user still being written take their IDs after all committed ones.
+        last_ids = [
+            OrderEvent.objects.filter(**{field: user}).aggregate(last_id=Max('pk'))['last_id'] or 0
+            for field in ('customer_user', 'business_user')
+        ]
+        return max(last_ids)
+
+    def _replay(self, user, since):
+        events = OrderChangesAPIView.fetch_events(user, since, self.replay_batch_size)
+        return OrderEventSerializer(events, many=True).data
+
+
+def _token_user(request):
+    """
+    Returns the user of the token in the Authorization header or the `token` query parameter,
+    or None if there is no valid token.
+    """
+    header = request.headers.get('Authorization', '')
+    key = header[len('Token '):].strip() if header.startswith('Token ') else request.GET.get('token')
+    if not key:
+        return None
+    try:
+        user, _ = TokenAuthentication().authenticate_credentials(key)
+    except AuthenticationFailed:
+        return None
+    return user
+
+
+def _sse_message(event):
+    return f"id: {event['id']}\ndata: {json.dumps(event, separators=(',', ':'))}\n\n".encode('utf-8')
+
+
 class OrderCountAPIView(APIView):
     """
     API endpoint to retrieve the count of orders in progress for a specific business user.
@@ -154,6 +615,7 @@ class OrderCountAPIView(APIView):
     def get(self, request, pk):
         """
         Returns the count of orders that are in progress for a given business user.
+        The count is read from the OrderStatusCount counter instead of counting orders.
 
         Parameters:
         pk (int): The id of the business user.
@@ -165,7 +627,7 @@ class OrderCountAPIView(APIView):
         """
         try:
 
-            order_count = Order.objects.filter(business_user_id=pk, status="in_progress").count()
+            order_count = OrderStatusCount.objects.count_for(pk, 'in_progress')
             return Response({'order_count': order_count}, status=status.HTTP_200_OK)
         except Exception as e:
             return Response({'error': f'Ein Fehler ist aufgetreten: {str(e)}'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -181,6 +643,7 @@ class CompletedOrderCountAPIView(APIView):
     def get(self, request, pk):
         """
         Returns the count of completed orders for a given business user.
+        The count is read from the OrderStatusCount counter instead of counting orders.
 
         Parameters:
         pk (int): The id of the business user.
@@ -192,7 +655,251 @@ class CompletedOrderCountAPIView(APIView):
         """
         try:
 
-            completed_order_count = Order.objects.filter(business_user_id=pk, status="completed").count()
+            completed_order_count = OrderStatusCount.objects.count_for(pk, 'completed')
             return Response({'completed_order_count': completed_order_count}, status=status.HTTP_200_OK)
         except Exception as e:
-            return Response({'error': f'Ein Fehler ist aufgetreten: {str(e)}'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
+            return Response({'error': f'Ein Fehler ist aufgetreten: {str(e)}'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class OrderStatsAPIView(APIView):
+    """
+    API endpoint to retrieve the order statistics of one or several business users.
+
+    Replaces separate calls to the order count endpoints: counts, revenue and the average
+    delivery time of all statuses come from one aggregate query, cached per business user
+    until the next write to one of its orders. The revenue is only returned to the business
+    user it belongs to. Reading the statistics never writes to the database.
+    """
+
+    authentication_classes = [TokenAuthentication]
+    permission_classes = [IsAuthenticated]
+    max_business_users = 100
+
+    def get(self, request, business_user_id=None):
+        """
+        Returns the order statistics of a business user, or of every business user listed
+        in the `business_user_ids` query parameter.
+
+        Parameters:
+        business_user_id (int, optional): The id of the business user.
+
+        Query Parameters:
+        business_user_ids (str): Comma-separated ids of business users, used when no id is
+                            given in the URL, e.g. for a page of the business directory.
+
+        Returns:
+        Response: The statistics of the business user, or a list of statistics in the order of the
+                requested ids; the revenue only for the authenticated user's own statistics.
+                Returns a 400 error response if the ids are missing or invalid.
+        """
+        if business_user_id is not None:
+            business_user_ids = [business_user_id]
+        else:
+            business_user_ids, error = self._business_user_ids(request.query_params)
+            if error:
+                return Response({'error': error}, status=status.HTTP_400_BAD_REQUEST)
+
+        cache_keys = stats_cache_keys(business_user_ids)
+        cached = order_stats_cache.get_many(list(cache_keys.values()))
+        stats = {pk: cached[key] for pk, key in cache_keys.items() if cached.get(key) is not None}
+
+        missing = [pk for pk in business_user_ids if pk not in stats]
+        if missing:
+            computed = self.compute_stats(missing)
+            order_stats_cache.set_many({cache_keys[pk]: computed[pk] for pk in missing})
+            stats.update(computed)
+
+        headers = {'X-Cache': 'MISS' if missing else 'HIT'}
+        if business_user_id is not None:
+            return Response(self._visible(stats[business_user_id], request.user), status=status.HTTP_200_OK, headers=headers)
+        return Response(
+            [self._visible(stats[pk], request.user) for pk in business_user_ids],
+            status=status.HTTP_200_OK, headers=headers
+        )
+
+    @staticmethod
+    def _visible(stats, user):
+        """
+        Returns the statistics without the revenue unless they belong to the given user.
+        """
+        if stats['business_user_id'] == user.pk:
+            return stats
+        return {name: value for name, value in stats.items() if name != 'revenue'}
+
+    def _business_user_ids(self, params):
+        """
+        Reads the `business_user_ids` query parameter.
+
+        Returns:
+            tuple: (ids, error). ids keeps the requested order without duplicates, error is a
+                message string if the parameter is missing or invalid, else None.
+        """
+        value = params.get('business_user_ids', '')
+        try:
+            business_user_ids = list(dict.fromkeys(int(part) for part in value.split(',') if part.strip()))
+        except ValueError:
+            return None, 'business_user_ids muss eine kommagetrennte Liste von IDs sein.'
+        if not business_user_ids:
+            return None, 'business_user_ids muss angegeben werden.'
+        if len(business_user_ids) > self.max_business_users:
+            return None, f'Höchstens {self.max_business_users} Geschäftskunden pro Anfrage.'
+        return business_user_ids, None
+
+    @staticmethod
+    def compute_stats(business_user_ids):
+        """
+        Computes the order statistics of business users with a single query grouped by
+        business user and status, over the Order table and the archive.
+
+        Args:
+            business_user_ids (list): The IDs of the business users.
+
+        Returns:
+            dict: Maps each business user ID to its statistics: the number of orders and the
+                revenue per status, the total number of orders and the average delivery time
+                in days (None without orders).
+        """
+        statuses = dict(Order.STATUS_CHOICES)
+        totals = {
+            pk: {'counts': dict.fromkeys(statuses, 0), 'revenue': dict.fromkeys(statuses, 0), 'delivery_days': 0}
+            for pk in business_user_ids
+        }
+        live, archived = (
+            model.objects.filter(business_user_id__in=business_user_ids)
+            .order_by()
+            .values('business_user_id', 'status')
+            .annotate(order_count=Count('id'), revenue=Sum('price'), delivery_days=Sum('delivery_time_in_days'))
+            for model in (Order, ArchivedOrder)
+        )
+        for row in live.union(archived, all=True):
+            total = totals[row['business_user_id']]
+            total['counts'][row['status']] = total['counts'].get(row['status'], 0) + row['order_count']
+            total['revenue'][row['status']] = total['revenue'].get(row['status'], 0) + row['revenue']
+            total['delivery_days'] += row['delivery_days']
+
+        stats = {}
+        for pk, total in totals.items():
+            order_count = sum(total['counts'].values())
+            stats[pk] = {
+                'business_user_id': pk,
+                'total_order_count': order_count,
+                'order_counts': total['counts'],
+                'revenue': {name: f'{value:.2f}' for name, value in total['revenue'].items()},
+                'average_delivery_time_in_days': round(total['delivery_days'] / order_count, 2) if order_count else None,
+            }
+        return stats
+
+
+class OrderAnalyticsAPIView(APIView):
+    """
+    API endpoint serving order time series of the authenticated business user.
+
+    Reads the OrderDailyRollup rows instead of the orders: a range of days is a range scan
+    on the (business_user, day, status) index, whatever the number of orders.
+    """
+
+    authentication_classes = [TokenAuthentication]
+    permission_classes = [IsAuthenticated]
+    intervals = {'day': TruncDay, 'week': TruncWeek, 'month': TruncMonth}
+    default_days = 30
+    max_periods = 1000
+
+    def get(self, request):
+        """
+        Returns the number of orders, the revenue and the average delivery time per period.
+
+        Query Parameters:
+        from / to (str, optional): The first and last day (YYYY-MM-DD), by order creation date.
+                            Defaults to the last 30 days.
+        interval (str, optional): 'day', 'week' or 'month'. Defaults to 'day'.
+        status (str, optional): Only orders that currently have this status.
+
+        Returns:
+        Response: One entry per period, including periods without orders, with the totals and
+                the number of orders and revenue per status. Returns a 403 error response for
+                users that are not business users and a 400 error response for invalid parameters.
+        """
+        if request.user.type != 'business':
+            return Response({'error': 'Nur Anbieter haben Auswertungen.'}, status=status.HTTP_403_FORBIDDEN)
+        start, end, interval, order_status, error = self._options(request.query_params)
+        if error:
+            return Response({'error': error}, status=status.HTTP_400_BAD_REQUEST)
+
+        rollups = OrderDailyRollup.objects.filter(business_user=request.user, day__range=(start, end))
+        if order_status:
+            rollups = rollups.filter(status=order_status)
+        rows = (
+            rollups.annotate(period=self.intervals[interval]('day'))
+            .order_by()
+            .values('period', 'status')
+            .annotate(order_count=Sum('order_count'), revenue=Sum('revenue'), delivery_days=Sum('delivery_days'))
+        )
+
+        periods = {period: {'order_count': 0, 'revenue': 0, 'delivery_days': 0, 'by_status': {}} for period in self._periods(start, end, interval)}
+        for row in rows:
+            period = periods[row['period']]
+            period['order_count'] += row['order_count']
+            period['revenue'] += row['revenue']
+            period['delivery_days'] += row['delivery_days']
+            period['by_status'][row['status']] = {'order_count': row['order_count'], 'revenue': f"{row['revenue']:.2f}"}
+
+        series = [
+            {
+                'period': period.isoformat(),
+                'order_count': total['order_count'],
+                'revenue': f"{total['revenue']:.2f}",
+                'average_delivery_time_in_days': round(total['delivery_days'] / total['order_count'], 2) if total['order_count'] else None,
+                'by_status': total['by_status'],
+            }
+            for period, total in periods.items()
+        ]
+        return Response({'from': start, 'to': end, 'interval': interval, 'series': series}, status=status.HTTP_200_OK)
+
+    def _options(self, params):
+        """
+        Reads the range, interval and status of the time series.
+
+        Returns:
+            tuple: (start, end, interval, status, error). error is a message string if a parameter is invalid, else None.
+        """
+        try:
+            end = parse_date(params['to']) if params.get('to') else timezone.localdate()
+            start = parse_date(params['from']) if params.get('from') else end - timedelta(days=self.default_days - 1)
+        except ValueError:
+            start = end = None
+        if start is None or end is None:
+            return None, None, None, None, 'from und to müssen Daten im Format YYYY-MM-DD sein.'
+        if start > end:
+            return None, None, None, None, 'from darf nicht nach to liegen.'
+
+        interval = params.get('interval', 'day')
+        if interval not in self.intervals:
+            return None, None, None, None, f"Ungültiges Intervall. Gültige Werte sind: {', '.join(self.intervals)}"
+        if len(self._periods(start, end, interval, limit=self.max_periods + 1)) > self.max_periods:
+            return None, None, None, None, f'Höchstens {self.max_periods} Zeiträume pro Anfrage.'
+
+        order_status = params.get('status')
+        if order_status and order_status not in dict(Order.STATUS_CHOICES):
+            return None, None, None, None, 'Ungültiger Status. Gültige Werte sind: ' + ', '.join(dict(Order.STATUS_CHOICES))
+        return start, end, interval, order_status, None
+
+    @staticmethod
+    def _periods(start, end, interval, limit=None):
+        """
+        Returns the first day of every period from start to end, as the database truncates them,
+        stopping after `limit` periods if given.
+        """
+        if interval == 'week':
+            period = start - timedelta(days=start.weekday())
+        elif interval == 'month':
+            period = start.replace(day=1)
+        else:
+            period = start
+        periods = []
+        while period <= end and (limit is None or len(periods) < limit):
+            periods.append(period)
+            if interval == 'month':
+                period = (period.replace(day=28) + timedelta(days=4)).replace(day=1)
+            else:
+                period += timedelta(days=7 if interval == 'week' else 1)
+        return periods
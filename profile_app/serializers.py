@@ -1,8 +1,10 @@
 from rest_framework import serializers
 from auth_app.models import CustomUser
+from coderr_app.images import variant_urls
+from coderr_app.serializers import SparseFieldsetMixin
 
 
-class UserProfileSerializer(serializers.ModelSerializer):
+class UserProfileSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """
     Serializer for detailed user profiles.
 
@@ -10,8 +12,11 @@ class UserProfileSerializer(serializers.ModelSerializer):
 
     Attributes:
         user (int): The ID of the user (mapped from the `id` field in the model).
+        file_variants (dict): URLs of the resized variants of the profile image.
     """
     user = serializers.IntegerField(source='id')
+    file_variants = serializers.SerializerMethodField()
+    sparse_sources = {'file_variants': ('file_variants',)}
 
     class Meta:
         """
@@ -26,9 +31,15 @@ class UserProfileSerializer(serializers.ModelSerializer):
             'id', 'username', 'first_name', 'last_name',
             'file', 'location', 'tel', 'description',
             'working_hours', 'type', 'email', 'created_at',
-            'user',  
+            'user', 'file_variants',
         ]
 
+    def get_file_variants(self, obj):
+        """
+        Returns the URLs of the resized variants of the profile image, keyed by format and width.
+        """
+        return variant_urls(obj.file_variants)
+
 
 class UserProfileUpdateSerializer(serializers.ModelSerializer):
     """
@@ -76,7 +87,7 @@ class BusinessUserSerializer(serializers.ModelSerializer):
         fields = ['pk', 'username', 'first_name', 'last_name', 'file']
 
 
-class BusinessProfileSerializer(serializers.ModelSerializer):
+class BusinessProfileSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """
     Serializer for detailed business profiles.
 
@@ -85,8 +96,14 @@ class BusinessProfileSerializer(serializers.ModelSerializer):
 
     Attributes:
         user (BusinessUserSerializer): A nested serializer to include basic user information.
+        file_variants (dict): URLs of the resized variants of the profile image.
     """
     user = BusinessUserSerializer(source='*')
+    file_variants = serializers.SerializerMethodField()
+    sparse_sources = {
+        'user': ('id', 'username', 'first_name', 'last_name', 'file'),
+        'file_variants': ('file_variants',),
+    }
 
     class Meta:
         """
@@ -98,10 +115,16 @@ class BusinessProfileSerializer(serializers.ModelSerializer):
         """
         model = CustomUser
         fields = [
-            'username', 'user', 'file', 'location', 'tel',
+            'username', 'user', 'file', 'file_variants', 'location', 'tel',
             'description', 'working_hours', 'type',
         ]
 
+    def get_file_variants(self, obj):
+        """
+        Returns the URLs of the resized variants of the profile image, keyed by format and width.
+        """
+        return variant_urls(obj.file_variants)
+
 
 class CustomUserSerializer(serializers.ModelSerializer):
     """
@@ -94,6 +94,17 @@ class ProfileAPITests(TestCase):
         usernames = [profile['username'] for profile in response.data]
         self.assertIn("business_user", usernames)
 
+    def test_get_business_profiles_sparse_fieldset(self):
+        """Test that the business profile list returns only the requested fields."""
+        url = reverse('business-profile')
+        response = self.client.get(url, {'fields': 'username,user'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(response.data[0]), {'username', 'user'})
+        self.assertIn('first_name', response.data[0]['user'])
+
+        response = self.client.get(url, {'exclude': 'description,tel'})
+        self.assertNotIn('tel', response.data[0])
+
     def test_get_authenticated_user_profile(self):
         """Test retrieving the authenticated user's profile."""
         self.authenticate_user(self.customer_user)
@@ -101,3 +112,16 @@ class ProfileAPITests(TestCase):
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data['username'], "testuser")
+
+    def test_get_user_profile_not_modified(self):
+        """Test that a profile request with a matching ETag returns 304 until the profile changes."""
+        self.authenticate_user(self.customer_user)
+        url = reverse('profile-detail', kwargs={'pk': self.customer_user.id})
+        etag = self.client.get(url)['ETag']
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.client.patch(url, {"location": "Elsewhere"}, format='json')
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['location'], "Elsewhere")
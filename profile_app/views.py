@@ -1,4 +1,4 @@
-from django.http import JsonResponse
+from django.http import Http404, JsonResponse
 from django.views import View
 from rest_framework.views import APIView
 from rest_framework.response import Response
@@ -9,6 +9,9 @@ from django.shortcuts import get_object_or_404
 from auth_app.models import CustomUser
 from .serializers import UserProfileSerializer, UserProfileUpdateSerializer, BusinessProfileSerializer, CustomProfileSerializer
 from rest_framework.exceptions import PermissionDenied
+from coderr_app.conditional import add_validators, not_modified_response
+from coderr_app.serializers import parse_fieldset
+from coderr_app.streaming import get_stream_format, streaming_response
 
 class ProfileView(APIView):
     """
@@ -24,15 +27,26 @@ class ProfileView(APIView):
     def get(self, request, pk):
         """
         Retrieves the profile of a user with the given pk.
+
+        Conditional requests are answered with 304 based on the user's updated_at,
+        before the profile itself is loaded.
         Args:
             request: The request object.
             pk: The primary key of the user to retrieve.
         Returns:
             A Response object with the serialized user data and a status code of 200.
         """
+        updated_at = CustomUser.objects.filter(pk=pk).values_list('updated_at', flat=True).first()
+        if updated_at is None:
+            raise Http404
+        etag = f'profile-{pk}-{updated_at.timestamp()}'
+        not_modified = not_modified_response(request, etag, updated_at)
+        if not_modified is not None:
+            return not_modified
+
         user = get_object_or_404(CustomUser, pk=pk)
         serializer = UserProfileSerializer(user)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return add_validators(Response(serializer.data, status=status.HTTP_200_OK), etag, updated_at)
 
 
     def patch(self, request, pk):
@@ -67,14 +81,32 @@ class BusinessProfileView(APIView):
         """
         Retrieve all business user profiles.
 
+        The `fields` / `exclude` query parameters select a sparse fieldset; only the
+        columns the selected fields read are loaded. `stream=json` or `stream=ndjson`
+        streams the list chunk by chunk.
+
         Args:
             request (Request): The HTTP request object.
 
         Returns:
             Response: A JSON response containing a list of serialized business user profiles.
+            Response: A 400 response if unknown fields or an unknown stream format are requested.
         """
+        fields, error = parse_fieldset(request.query_params, BusinessProfileSerializer)
+        if error:
+            return Response({'error': error}, status=status.HTTP_400_BAD_REQUEST)
+        stream_format, error = get_stream_format(request.query_params)
+        if error:
+            return Response({'error': error}, status=status.HTTP_400_BAD_REQUEST)
+
         users = CustomUser.objects.all()
-        serializer = BusinessProfileSerializer(users, many=True)
+        if fields is not None:
+            users = users.only(*BusinessProfileSerializer.model_columns(fields))
+        if stream_format:
+            return streaming_response(
+                users, lambda rows: BusinessProfileSerializer(rows, many=True, fields=fields).data, stream_format
+            )
+        serializer = BusinessProfileSerializer(users, many=True, fields=fields)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
@@ -32,11 +32,19 @@ class Review(models.Model):
         Meta configuration for the Review model.
 
         Ensures that each reviewer can leave only one review for a specific business user.
+        The composite indexes back the review list: by business user ordered by updated_at
+        or rating, and by reviewer ordered by updated_at, each with the ID as tie-breaker.
 
         Attributes:
             unique_together (tuple): Specifies that a combination of business_user and reviewer must be unique.
+            indexes (list): The composite indexes of the review list.
         """
         unique_together = ('business_user', 'reviewer')
+        indexes = [
+            models.Index(fields=['business_user', 'updated_at', 'id'], name='review_business_updated_idx'),
+            models.Index(fields=['business_user', 'rating', 'id'], name='review_business_rating_idx'),
+            models.Index(fields=['reviewer', 'updated_at', 'id'], name='review_reviewer_updated_idx'),
+        ]
 
     def __str__(self):
         """
@@ -1,9 +1,12 @@
+import json
+from unittest.mock import patch
 from django.urls import reverse
 from django.test import TestCase
 from rest_framework.test import APIClient
 from rest_framework import status
 from auth_app.models import CustomUser
 from review_app.models import Review
+from review_app.views import ReviewView
 
 
 class ReviewAPITests(TestCase):
@@ -55,6 +58,64 @@ class ReviewAPITests(TestCase):
         self.assertEqual(len(response.data), 1)
         self.assertEqual(response.data[0]['rating'], 5)
 
+    def test_get_reviews_paginated_without_per_review_queries(self):
+        """Test that the review list needs no query per review and can be paginated."""
+        for index in range(12):
+            reviewer = CustomUser.objects.create_user(username=f"reviewer_{index}", email=f"reviewer_{index}@example.com", password="pw", type="customer")
+            Review.objects.create(business_user=self.business_user, reviewer=reviewer, rating=index % 5 + 1, description=f"Review {index}")
+        url = reverse('review-list-create')
+
+        with self.assertNumQueries(2):
+            response = self.client.get(url, {'business_user_id': self.business_user.id})
+        self.assertEqual(len(response.data), 13)
+        self.assertEqual(response.data[0]['description'], "Review 11")
+
+        response = self.client.get(url, {'business_user_id': self.business_user.id, 'ordering': '-rating', 'page': 2})
+        self.assertEqual(response.data['count'], 13)
+        self.assertEqual(len(response.data['results']), 3)
+        self.assertEqual(response.data['results'][-1]['rating'], 1)
+
+    def test_get_reviews_with_equal_values_ordered_by_id(self):
+        """Test that reviews with the same rating are ordered by ID and no page repeats a review."""
+        for index in range(12):
+            reviewer = CustomUser.objects.create_user(username=f"reviewer_{index}", email=f"reviewer_{index}@example.com", password="pw", type="customer")
+            Review.objects.create(business_user=self.business_user, reviewer=reviewer, rating=3, description=f"Review {index}", updated_at=self.review.updated_at)
+        url = reverse('review-list-create')
+
+        for ordering in ('rating', '-rating', '-updated_at'):
+            ids = []
+            for page in (1, 2):
+                response = self.client.get(url, {'business_user_id': self.business_user.id, 'ordering': ordering, 'page': page})
+                ids += [review['id'] for review in response.data['results']]
+            expected = Review.objects.filter(business_user=self.business_user).order_by(ordering, ('-' if ordering.startswith('-') else '') + 'id')
+            self.assertEqual(ids, [review.id for review in expected])
+
+    def test_get_reviews_unpaginated_list_is_capped(self):
+        """Test that a review list longer than max_list_size is answered with its first page and a next link."""
+        for index in range(3):
+            reviewer = CustomUser.objects.create_user(username=f"reviewer_{index}", email=f"reviewer_{index}@example.com", password="pw", type="customer")
+            Review.objects.create(business_user=self.business_user, reviewer=reviewer, rating=4, description=f"Review {index}")
+        url = reverse('review-list-create')
+
+        with patch.object(ReviewView, 'max_list_size', 4):
+            response = self.client.get(url, {'business_user_id': self.business_user.id})
+        self.assertEqual(len(response.data), 4)
+
+        with patch.object(ReviewView, 'max_list_size', 3):
+            response = self.client.get(url, {'business_user_id': self.business_user.id})
+        self.assertEqual(response.data['count'], 4)
+        self.assertEqual(len(response.data['results']), 3)
+        next_page = self.client.get(response.data['next'])
+        self.assertEqual([review['id'] for review in next_page.data['results']], [self.review.id])
+        self.assertIsNone(next_page.data['next'])
+
+    def test_get_reviews_streamed(self):
+        """Test that the streamed review list matches the regular list."""
+        url = reverse('review-list-create') + f'?business_user_id={self.business_user.id}'
+        expected = self.client.get(url).json()
+        response = self.client.get(url + '&stream=json')
+        self.assertEqual(json.loads(b''.join(response.streaming_content)), expected)
+
     def test_get_reviews_for_current_user(self):
         """Test retrieving reviews created by the current user."""
         url = reverse('review-list-create')
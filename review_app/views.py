@@ -6,7 +6,10 @@ from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.generics import ListAPIView
 from rest_framework import filters
+from rest_framework.utils.urls import replace_query_param
 from django_filters.rest_framework import DjangoFilterBackend
+from coderr_app.paginations import CustomPageNumberPagination
+from coderr_app.streaming import get_stream_format, streaming_response
 
 
 class ReviewView(ListAPIView):
@@ -26,6 +29,9 @@ class ReviewView(ListAPIView):
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
     filterset_fields = ['business_user_id']
     ordering_fields = ['updated_at', 'rating']
+    ordering = ['-updated_at', '-id']
+    pagination_class = CustomPageNumberPagination
+    max_list_size = CustomPageNumberPagination.max_page_size
 
     def get(self, request, *args, **kwargs):
         """
@@ -36,41 +42,92 @@ class ReviewView(ListAPIView):
 
         Query Parameters:
             business_user_id (int, optional): The ID of the business user to filter reviews by.
+            reviewer_id (int, optional): The ID of the reviewer, used without `business_user_id`.
+                Defaults to the current user.
+            ordering (str, optional): 'updated_at', 'rating' or the same prefixed with '-'.
+                Defaults to '-updated_at'.
+            page (int, optional): Returns a page-number paginated response instead of a plain list.
+            stream (str, optional): 'json' or 'ndjson' streams the reviews chunk by chunk.
+
+        Reviews with the same ordering value are ordered by ID, so pages never overlap or skip
+        a review. Each supported filter and ordering is backed by a composite index on Review,
+        and the list is built from the foreign key IDs without loading the related users. The
+        plain list holds at most `max_list_size` reviews. A longer list is answered with the
+        paginated response of its first `max_list_size` reviews instead, whose `count` and
+        `next` link show that more follow.
 
         Returns:
             Response: A JSON response containing a list of reviews.
-                    If `business_user_id` is invalid, a 400 BAD REQUEST response is returned.
+                    If `business_user_id`, `reviewer_id` or `stream` is invalid, a 400 BAD REQUEST response is returned.
         """
-        current_user = request.query_params.get('reviewer_id', None)
         business_user_id = request.query_params.get('business_user_id', None)
+        reviewer_id = request.query_params.get('reviewer_id', None)
 
-        if business_user_id:
-            try:
+        try:
+            if business_user_id:
                 reviews = Review.objects.filter(business_user_id=business_user_id)
-            except ValueError:
-                return Response(
-                    {'error': 'Ungültiger Wert für "business_user_id".'},
-                    status=status.HTTP_400_BAD_REQUEST,
-                )
-        else:
-            reviews = Review.objects.filter(reviewer=current_user)
-
-        reviews = self.filter_queryset(reviews)
-
-        response_data = [
-            {
-                'id': review.id,
-                'business_user': review.business_user.id,
-                'reviewer': review.reviewer.id,
-                'rating': review.rating,
-                'description': review.description,
-                'created_at': review.created_at,
-                'updated_at': review.updated_at,
-            }
-            for review in reviews
-        ]
+            elif reviewer_id:
+                reviews = Review.objects.filter(reviewer_id=reviewer_id)
+            else:
+                reviews = Review.objects.filter(reviewer=request.user)
+        except ValueError:
+            return Response(
+                {'error': 'Ungültiger Wert für "business_user_id" oder "reviewer_id".'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        stream_format, error = get_stream_format(request.query_params)
+        if error:
+            return Response({'error': error}, status=status.HTTP_400_BAD_REQUEST)
+
+        reviews = self.with_tie_breaker(self.filter_queryset(reviews))
+        if stream_format:
+            return streaming_response(
+                reviews, lambda rows: [self.review_data(review) for review in rows], stream_format
+            )
+
+        if 'page' in request.query_params:
+            page = self.paginate_queryset(reviews)
+            return self.get_paginated_response([self.review_data(review) for review in page])
+
+        response_data = [self.review_data(review) for review in reviews[:self.max_list_size + 1]]
+        if len(response_data) > self.max_list_size:
+            url = replace_query_param(request.build_absolute_uri(), 'page_size', self.max_list_size)
+            return Response({
+                'count': reviews.count(),
+                'next': replace_query_param(url, 'page', 2),
+                'previous': None,
+                'results': response_data[:self.max_list_size],
+            }, status=status.HTTP_200_OK)
         return Response(response_data, status=status.HTTP_200_OK)
 
+    @staticmethod
+    def with_tie_breaker(reviews):
+        """
+        Appends the ID to the ordering of the reviews, in the direction of the first ordering
+        field so the composite indexes can still be read in one direction.
+        """
+        ordering = list(reviews.query.order_by)
+        if not ordering or any(field.lstrip('-') == 'id' for field in ordering):
+            return reviews
+        return reviews.order_by(*ordering, '-id' if ordering[0].startswith('-') else 'id')
+
+    @staticmethod
+    def review_data(review):
+        """
+        Returns the representation of a review used by the list. Reads the foreign key IDs,
+        so no related user is loaded.
+        """
+        return {
+            'id': review.id,
+            'business_user': review.business_user_id,
+            'reviewer': review.reviewer_id,
+            'rating': review.rating,
+            'description': review.description,
+            'created_at': review.created_at,
+            'updated_at': review.updated_at,
+        }
+
     def post(self, request):
         """
         Create a new review for the given business user.
@@ -107,8 +164,8 @@ class ReviewView(ListAPIView):
                 return Response({'error': 'Review already exists for this business user'}, status=status.HTTP_400_BAD_REQUEST)
             response_data = {
                 'id': review.id,
-                'business_user': review.business_user.id,
-                'reviewer': review.reviewer.id,
+                'business_user': review.business_user_id,
+                'reviewer': review.reviewer_id,
                 'rating': review.rating,
                 'description': review.description,
                 'created_at': review.created_at,
@@ -147,8 +204,8 @@ class ReviewView(ListAPIView):
             review.save()
             response_data = {
                 'id': review.id,
-                'business_user': review.business_user.id,
-                'reviewer': review.reviewer.id,
+                'business_user': review.business_user_id,
+                'reviewer': review.reviewer_id,
                 'rating': review.rating,
                 'description': review.description,
                 'created_at': review.created_at,